@@ -1,4 +1,6 @@
 from .ups import upsAPC, upsCyberPower
 from .sensors import HWgSTE
 from .networking import ifaceMetrics
-from .hostDefaults import host
\ No newline at end of file
+from .hostDefaults import host
+from .fleet import FleetPoller
+from .scheduler import pollScheduler
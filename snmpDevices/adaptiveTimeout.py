@@ -0,0 +1,70 @@
+"""
+Adaptive request timeout from the observed round trip times of a device
+
+The retransmission timeout of RFC 6298: a smoothed RTT (SRTT) and RTT
+variation (RTTVAR) are updated with every response, the timeout is
+SRTT + 4 x RTTVAR, doubled for every retry and kept within
+[min_timeout, max_timeout]. Until a device has answered once, its
+timeout stays the configured one. snmpRead sends every retry as a new request,
+so each response is an unambiguous sample of the round trip time.
+"""
+
+import math
+
+# RFC 6298 gains and variance multiplier
+ALPHA = 1 / 8
+BETA = 1 / 4
+K = 4
+
+# pysnmp checks timeouts on a 0.1 s timer and keeps one target entry per distinct timeout,
+# so timeouts are rounded up to a geometric grid of whole ticks
+TIMER_TICK = 0.1
+TIMEOUT_STEP = 1.25
+
+
+class adaptiveTimeout:
+    """
+    Request timeout of one device, learned from its response times
+
+    initial         timeout until the first response is seen
+    min_timeout     lower bound, keeps fast LAN agents from timing out on a scheduling hiccup
+    max_timeout     upper bound of the timeout, retries included
+    """
+
+    __slots__ = ('initial', 'min_timeout', 'max_timeout', 'srtt', 'rttvar', 'samples')
+
+    def __init__(self, initial: float = 1.0, min_timeout: float = 0.2, max_timeout: float = 10.0):
+        self.initial = initial
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.srtt = None
+        self.rttvar = None
+        self.samples = 0
+
+    def observe(self, rtt: float) -> None:
+        """
+        Update the estimate with the round trip time of one response
+        """
+        if self.srtt == None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - BETA) * self.rttvar + BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - ALPHA) * self.srtt + ALPHA * rtt
+        self.samples += 1
+
+    def timeout(self, attempt: int = 1) -> float:
+        """
+        Timeout of the given attempt (1 for the first PDU), in seconds
+        """
+        # Nothing learned yet (or a dead device): the configured timeout, without backoff so failing stays as fast as before
+        if self.srtt == None:
+            return min(self.max_timeout, self.initial)
+
+        base = self.srtt + max(TIMER_TICK, K * self.rttvar)
+        timeout = min(self.max_timeout, max(self.min_timeout, base * 2 ** (attempt - 1)))
+
+        # Round up to the grid: min_timeout x TIMEOUT_STEP^n, then to a whole timer tick
+        steps = math.ceil(math.log(timeout / self.min_timeout, TIMEOUT_STEP) - 1e-9)
+        timeout = self.min_timeout * TIMEOUT_STEP ** max(0, steps)
+        return min(self.max_timeout, round(math.ceil(timeout / TIMER_TICK - 1e-9) * TIMER_TICK, 1))
@@ -0,0 +1,247 @@
+"""
+Benchmark of every device class property against simulated agents
+
+For each property of each benchmarked class, a FleetPoller polls a fleet of
+simulated agents (simulator.start_agents, run in a child process so their
+CPU is not counted) and the harness records:
+
+    pdus                request PDUs sent, by type (get / getnext / getbulk)
+    bytes               bytes on the wire, requests plus responses
+    wall_seconds        duration of the poll
+    cpu_seconds         CPU time of this process during the poll
+    peak_memory_bytes   peak Python allocations during a separate traced poll
+
+The first poll of a fleet is reported as phase 'cold' (index caches empty)
+and the second as 'warm'. Results are written as JSON.
+
+    python3 -m snmpDevices.benchmark --sizes 1,100,1000,10000 --output bench.json
+    python3 -m snmpDevices.benchmark --classes host --properties storage,diskIO --sizes 1,100
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import pysnmp
+
+from .fleet import DEVICE_CLASSES, FleetPoller, device_metrics
+from .simulator import start_agents, total_stats, _raise_open_files_limit
+
+WALKS_DIR = os.path.join(os.path.dirname(__file__), 'walks')
+
+# Walk replayed for every benchmarked device class
+CLASS_WALKS = {
+    'host': os.path.join(WALKS_DIR, 'net-snmp-host.snmprec'),
+    'ifaceMetrics': os.path.join(WALKS_DIR, 'net-snmp-host.snmprec'),
+    'upsCyberPower': os.path.join(WALKS_DIR, 'cyberpower-ups.snmprec'),
+}
+
+DEFAULT_SIZES = (1, 100, 1000, 10000)
+
+
+def _agent_worker(conn, walk: str, count: int, port: int, host: str) -> None:
+    """
+    Child process serving count agents; answers 'stats' with the totals since the last 'stats'
+    """
+    _raise_open_files_limit()
+
+    async def serve():
+        agents = await start_agents(walk, count, port, host, live_uptime=False)
+        loop = asyncio.get_running_loop()
+        conn.send('ready')
+        try:
+            while (await loop.run_in_executor(None, conn.recv)) == 'stats':
+                conn.send(total_stats(agents))
+                for agent in agents:
+                    agent.stats = dict.fromkeys(agent.stats, 0)
+        finally:
+            for agent in agents:
+                agent.close()
+
+    try:
+        asyncio.run(serve())
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        conn.close()
+
+
+class agentProcess:
+    """
+    Simulated agents on ports port .. port + count - 1 in a child process
+    """
+
+    def __init__(self, walk: str, count: int, port: int = 20000, host: str = '127.0.0.1'):
+        context = multiprocessing.get_context('spawn')
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_agent_worker, args=(child_conn, walk, count, port, host), name='benchmark-agents', daemon=True)
+        self.process.start()
+        child_conn.close()
+
+        if self.conn.recv() != 'ready':
+            raise RuntimeError("simulated agents failed to start")
+
+    def stats(self) -> dict:
+        """
+        Agent counters since the previous call
+        """
+        self.conn.send('stats')
+        return self.conn.recv()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send('stop')
+        except (BrokenPipeError, OSError):
+            pass
+        self.conn.close()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+
+
+async def _measure(poller: FleetPoller, agents: agentProcess, traced: bool = False) -> dict:
+    """
+    Poll once and return the costs of that poll
+    """
+    agents.stats()
+    if traced:
+        tracemalloc.start()
+
+    started, cpu_started = time.perf_counter(), time.process_time()
+    results = await poller.collect()
+    wall, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+
+    peak = None
+    if traced:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    stats = agents.stats()
+    return {
+        'pdus': stats['requests'],
+        'pdu_types': { kind: stats[kind] for kind in ('get', 'getnext', 'getbulk') },
+        'bytes': stats['bytes_in'] + stats['bytes_out'],
+        'wall_seconds': wall,
+        'cpu_seconds': cpu,
+        'peak_memory_bytes': peak,
+        'errors': sum(len(result['errors']) for result in results),
+    }
+
+
+async def benchmark_property(cls_name: str, metrics: list, size: int, agents: agentProcess, port: int, snmpv: int = 2, memory: bool = True, in_flight: int = 64) -> list[dict]:
+    """
+    Cold and warm poll of metrics on size devices, one record per phase
+    """
+    inventory = [
+        { 'type': cls_name, 'ip': '127.0.0.1', 'port': port + i, 'community': 'public', 'snmpv': snmpv, 'metrics': metrics }
+        for i in range(size)
+    ]
+    poller = FleetPoller(inventory, max_in_flight=in_flight)
+
+    records = []
+    try:
+        for phase in ('cold', 'warm'):
+            record = await _measure(poller, agents)
+            # Peak memory of the warm poll, from a separate traced poll so tracing does not skew the timings
+            if phase == 'warm' and memory:
+                record['peak_memory_bytes'] = (await _measure(poller, agents, traced=True))['peak_memory_bytes']
+
+            records.append({ 'class': cls_name, 'property': metrics[0] if len(metrics) == 1 else '*', 'devices': size, 'phase': phase, **record })
+    finally:
+        await poller.close()
+
+    return records
+
+
+async def run_benchmark(classes: list = None, properties: list = None, sizes: list = DEFAULT_SIZES, snmpv: int = 2, port: int = 20000, memory: bool = True, fleet: bool = True, in_flight: int = 64, report=None) -> dict:
+    """
+    Benchmark every property (or properties) of classes at every fleet size
+    in_flight is the FleetPoller max_in_flight; the agents share the machine, keep it low enough that they answer within the SNMP timeout
+    With fleet, every size is also polled with all properties of the class at once ('*')
+    report(record) is called as records complete
+    """
+    records = []
+    for cls_name in classes or list(CLASS_WALKS):
+        names = [name for name in device_metrics(DEVICE_CLASSES[cls_name]) if properties == None or name in properties]
+        runs = [[name] for name in names]
+        if fleet and len(names) > 1:
+            runs.append(names)
+
+        agents = agentProcess(CLASS_WALKS[cls_name], max(sizes), port)
+        try:
+            for size in sizes:
+                for metrics in runs:
+                    for record in await benchmark_property(cls_name, metrics, size, agents, port, snmpv, memory, in_flight):
+                        records.append(record)
+                        if report != None:
+                            report(record)
+        finally:
+            agents.stop()
+
+    return {
+        'meta': {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'pysnmp': pysnmp.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'snmpv': snmpv,
+            'sizes': list(sizes),
+            'in_flight': in_flight,
+        },
+        'results': records,
+    }
+
+
+def _print_record(record: dict) -> None:
+    memory = f"{record['peak_memory_bytes'] / 1024:.0f} KiB" if record['peak_memory_bytes'] != None else '-'
+    print(
+        f"{record['class']:>14} {record['property']:<24} {record['devices']:>6} {record['phase']:<4} "
+        f"{record['pdus']:>8} PDUs {record['bytes']:>11} B {record['wall_seconds']:>9.4f} s {record['cpu_seconds']:>9.4f} s CPU {memory:>10} "
+        f"{record['errors']} errors",
+        file=sys.stderr, flush=True,
+    )
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(prog='python3 -m snmpDevices.benchmark', description="Benchmark device class properties against simulated agents")
+    parser.add_argument('--classes', default=','.join(CLASS_WALKS), help=f"comma separated, from {', '.join(CLASS_WALKS)}")
+    parser.add_argument('--properties', default=None, help="comma separated property names, all if not set")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help="comma separated fleet sizes")
+    parser.add_argument('--snmpv', type=int, default=2, choices=(1, 2))
+    parser.add_argument('--port', type=int, default=20000, help="port of the first simulated agent")
+    parser.add_argument('--in-flight', type=int, default=64, help="SNMP requests in flight across the fleet")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced poll measuring peak memory")
+    parser.add_argument('--no-fleet', action='store_true', help="skip the polls of every property at once")
+    parser.add_argument('--output', default='-', help="JSON results file, - for stdout")
+    args = parser.parse_args(argv)
+
+    classes = args.classes.split(',')
+    for cls_name in classes:
+        if cls_name not in CLASS_WALKS:
+            parser.error(f"no walk to benchmark {cls_name!r} against")
+
+    _raise_open_files_limit()
+    results = asyncio.run(run_benchmark(
+        classes,
+        args.properties.split(',') if args.properties else None,
+        [int(size) for size in args.sizes.split(',')],
+        args.snmpv, args.port, not args.no_memory, not args.no_fleet, args.in_flight, _print_record,
+    ))
+
+    if args.output == '-':
+        json.dump(results, sys.stdout, indent=1)
+        print()
+    else:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=1)
+
+
+if __name__ == '__main__':
+    main()
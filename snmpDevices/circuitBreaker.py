@@ -0,0 +1,119 @@
+"""
+Per-device circuit breaker for unreachable agents
+
+After failure_threshold consecutive requests time out the circuit opens:
+requests to the device fail at once with the circuitOpen error indication
+instead of waiting for their timeouts. Once the backoff delay has passed, a
+single probe request goes through (half open); a response closes the
+circuit, another timeout opens it again with the delay doubled, up to
+max_delay. A probe cancelled before its answer leaves the circuit open for
+the next request to probe.
+"""
+
+import time
+
+from pysnmp.proto import errind
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpen(errind.ErrorIndication):
+    """
+    Error indication of a request not sent because the circuit of its device is open
+    """
+
+
+circuitOpen = CircuitOpen("Circuit open, device not polled")
+
+
+class circuitBreaker:
+    """
+    Health of one device
+
+    failure_threshold   consecutive timed out requests that open the circuit
+    base_delay          seconds before the first probe of an open circuit
+    max_delay           longest delay between probes, reached by doubling base_delay
+
+    state               CLOSED, OPEN or HALF_OPEN (a probe is in flight)
+    failures            consecutive timed out requests
+    delay               current delay between probes
+    retry_at            time.monotonic() after which the next probe may go
+    """
+
+    __slots__ = ('failure_threshold', 'base_delay', 'max_delay', 'state', 'failures', 'delay', 'retry_at', 'opened')
+
+    def __init__(self, failure_threshold: int = 3, base_delay: float = 5.0, max_delay: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.state = CLOSED
+        self.failures = 0
+        self.delay = base_delay
+        self.retry_at = 0.0
+        # Circuit openings since the breaker was created
+        self.opened = 0
+
+    def blocked(self) -> bool:
+        """
+        True if a request would be refused now, without claiming the probe
+        """
+        return self.state == HALF_OPEN or (self.state == OPEN and time.monotonic() < self.retry_at)
+
+    def allow(self) -> bool:
+        """
+        True if a request may be sent; the first request past retry_at becomes the probe
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() >= self.retry_at:
+            self.state = HALF_OPEN
+            return True
+        return False
+
+    def success(self) -> str:
+        """
+        Record a response, returns the new state if it changed
+        """
+        self.failures = 0
+        if self.state == CLOSED:
+            return None
+
+        self.state = CLOSED
+        self.delay = self.base_delay
+        return CLOSED
+
+    def failure(self) -> str:
+        """
+        Record a request without response, returns the new state if it changed
+        """
+        self.failures += 1
+
+        if self.state == HALF_OPEN:
+            # The probe failed, wait twice as long before the next one
+            self.delay = min(self.max_delay, self.delay * 2)
+        elif self.state == OPEN or self.failures < self.failure_threshold:
+            return None
+
+        self.state = OPEN
+        self.retry_at = time.monotonic() + self.delay
+        self.opened += 1
+        return OPEN
+
+    def abandon(self) -> None:
+        """
+        Forget a probe that ended without a result (cancelled or raised), the next request probes again
+        """
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+
+    def as_dict(self) -> dict:
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'delay': self.delay,
+            'retry_in': max(0.0, self.retry_at - time.monotonic()) if self.state != CLOSED else 0.0,
+            'opened': self.opened,
+        }
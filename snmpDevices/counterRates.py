@@ -0,0 +1,101 @@
+import time
+
+# sysUpTime is a 32-bit TimeTicks value in centiseconds
+TICKS_PER_SECOND = 100
+
+# Seconds the agent clock may fall behind ours between two samples (response delays, retries) before it counts as a restart
+RESTART_SLACK = 10.0
+
+# Counter32 values wrap to 0 after 2^32 - 1
+COUNTER32_MODULUS = 2 ** 32
+
+
+class counterRates:
+    """
+    Per-second rates of SNMP counters
+
+    Keeps the last (sysUpTime, value) sample of every (device, index, counter)
+    and turns the next sample into a rate over the agent clock, so polling
+    jitter and slow responses do not skew the result.
+
+    - a Counter32 below its previous value wrapped once and is corrected
+    - a Counter64 below its previous value was reset (64-bit counters do not wrap in practice)
+    - sysUpTime below its previous value means the agent restarted, the counters start over
+    - so does sysUpTime advancing less than our own clock: the agent restarted and has
+      already been up longer than at the previous sample
+
+    The first sample of a counter, and the first after a reset, yields None.
+
+    example usage:
+        rates = counterRates()
+        table = await dev.run_snmp_walk_table({ 'InOctets': '.1.3.6.1.2.1.2.2.1.10' }, stamp=True)
+        rates.table_rates('10.0.0.1:161', table, { 'InOctets': 32 })
+    """
+
+    def __init__(self):
+        # (device, index, counter) -> (sysUpTime, value, time.monotonic() of the sample)
+        self.samples = {}
+
+    def rate(self, key: tuple, ticks: int, value: int, bits: int = 32, now: float = None) -> float:
+        """
+        Store the sample (ticks, value) of the counter key and return its rate per second since the last sample
+        now is the time.monotonic() of the sample, the current time by default
+        """
+        now = time.monotonic() if now == None else now
+        previous = self.samples.get(key)
+        self.samples[key] = (ticks, value, now)
+
+        if previous == None:
+            return None
+
+        last_ticks, last_value, last_time = previous
+        elapsed = ticks - last_ticks
+
+        # Negative: the agent restarted (or sysUpTime wrapped after 497 days), there is no baseline
+        # Zero: the same PDU timestamp twice, nothing to divide by
+        if elapsed <= 0:
+            return None
+
+        # The agent clock advanced less than ours: it restarted in between and its new sysUpTime already passed the old one
+        if elapsed / TICKS_PER_SECOND + RESTART_SLACK < now - last_time:
+            return None
+
+        delta = value - last_value
+        if delta < 0:
+            # A Counter64 never wraps, it was reset (counter discontinuity)
+            if bits != 32:
+                return None
+            delta += COUNTER32_MODULUS
+
+        return delta * TICKS_PER_SECOND / elapsed
+
+    def table_rates(self, device: str, table: dict, counters: dict) -> dict:
+        """
+        Rates of a table walked with stamp=True: { index: { counter: (sysUpTime, value) } }
+        counters maps each counter column to its width (32 or 64)
+        Returns { index: { counter: rate per second or None } }
+        """
+        rates = {}
+        for index, row in table.items():
+            values = rates[index] = {}
+            for name, bits in counters.items():
+                sample = row.get(name)
+                if sample == None or sample[0] == None or not sample[1]:
+                    values[name] = None
+                    continue
+
+                ticks, value = sample
+                values[name] = self.rate((device, index, name), ticks, int(value), bits)
+
+        return rates
+
+    def forget(self, device: str = None) -> None:
+        """
+        Drop the stored samples of a device, or of every device
+        """
+        if device == None:
+            self.samples.clear()
+            return
+
+        for key in [key for key in self.samples if key[0] == device]:
+            del self.samples[key]
@@ -0,0 +1,90 @@
+import asyncio
+import atexit
+import os
+import threading
+
+
+class backgroundLoop:
+    """
+    Long-lived asyncio event loop running in a daemon thread
+
+    Synchronous callers submit coroutines with run() and block on the result,
+    so they pay only for the network round trip instead of a loop set-up and
+    tear-down per request. Works from code that already has a running loop,
+    since the coroutine always executes on the background thread.
+    """
+
+    def __init__(self, name:str='snmpDevices-loop'):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the loop thread if it is not running yet and return the loop
+        """
+        with self._lock:
+            # A forked child inherits the loop object but not the thread running it
+            if self.loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return self.loop
+
+            self.loop = asyncio.new_event_loop()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run_forever, name=self.name, daemon=True)
+            self._thread.start()
+            return self.loop
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro):
+        """
+        Run a coroutine on the background loop and wait for its result
+        """
+        loop = self.start()
+
+        # Blocking the loop thread on itself would deadlock
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("run() called from the background loop thread, await the coroutine instead")
+
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def stop(self) -> None:
+        """
+        Stop the loop and wait for its thread to finish
+        """
+        with self._lock:
+            loop, thread = self.loop, self._thread
+            self.loop = None
+            self._thread = None
+
+        if loop is None or self._pid != os.getpid():
+            return
+
+        if thread is not threading.current_thread():
+            # Let pending tasks (engine timers, in-flight requests) unwind before closing the loop
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        else:
+            loop.call_soon(loop.stop)
+
+
+async def _cancel_pending() -> None:
+    """
+    Cancel every task on the running loop except the caller
+    """
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Process-wide loop shared by every synchronous caller
+default_loop = backgroundLoop()
+atexit.register(default_loop.stop)
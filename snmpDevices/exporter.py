@@ -0,0 +1,240 @@
+"""
+Prometheus / OpenMetrics exporter serving the most recent background poll
+
+A poll loop feeds every FleetPoller result into pre-rendered exposition
+fragments, one per (metric family, device), replaced as results arrive.
+The response body is joined once after an update and then reused, so a
+scrape is a buffer copy and never triggers SNMP traffic.
+"""
+
+import asyncio
+import logging
+import re
+import time
+
+from .flattenMetrics import flatten_result
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+TEXT_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_invalid_name = re.compile(r'[^a-zA-Z0-9_:]')
+
+logger = logging.getLogger('snmpDevices')
+
+
+def metric_name(prefix: str, metric: str) -> str:
+    """
+    Prometheus metric name of a flattened metric, cpuMetrics.ssCpuUser -> snmp_cpuMetrics_ssCpuUser
+    """
+    return _invalid_name.sub('_', f"{prefix}_{metric}")
+
+
+def label_value(value) -> str:
+    """
+    Escape a label value
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_value(value) -> str:
+    """
+    Sample value in exposition format
+    """
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+class metricsExporter:
+    """
+    HTTP exporter serving poll results in OpenMetrics (or Prometheus text) format
+
+    poller      FleetPoller polled every interval seconds in the background
+    interval    seconds between the starts of two polls
+    prefix      prefix of every metric name
+
+    Per device it also exposes staleness metadata:
+        <prefix>_up                                 1 if any metric of the last result was read
+        <prefix>_last_poll_timestamp_seconds        start of the last result
+        <prefix>_poll_duration_seconds              duration of the last result
+        <prefix>_poll_errors                        metrics that failed in the last result
+        <prefix>_stale                              1 if the last poll cycle returned nothing for the device
+    and <prefix>_exporter_cycle_timestamp_seconds / _duration_seconds for the last completed poll cycle.
+
+    example usage:
+        exporter = metricsExporter(FleetPoller(inventory), interval=30)
+        await exporter.serve(host='0.0.0.0', port=9116)
+    """
+
+    def __init__(self, poller, interval: float = 30, prefix: str = 'snmp'):
+        self.poller = poller
+        self.interval = interval
+        self.prefix = prefix
+
+        # family -> { device: rendered sample lines }, replaced device by device
+        self.families = {}
+        # device -> families it has fragments in, and its label set
+        self.device_families = {}
+        self.device_labels = {}
+        # Joined response body, None when a fragment changed since it was built
+        self._body = None
+
+        self._poll_task = None
+        self._server = None
+
+    def update(self, result: dict) -> None:
+        """
+        Replace the fragments of one device with a new FleetPoller result
+        """
+        device = result['name']
+        labels = self.device_labels[device] = f'device="{label_value(device)}",type="{label_value(result["type"])}"'
+
+        lines = {}
+        for metric, index, value in flatten_result(result):
+            family = metric_name(self.prefix, metric)
+            sample_labels = labels if index == None else f'{labels},index="{label_value(index)}"'
+            lines.setdefault(family, []).append(f"{family}{{{sample_labels}}} {format_value(value)}\n")
+
+        # Staleness metadata
+        meta = {
+            'up': 1 if result['metrics'] else 0,
+            'last_poll_timestamp_seconds': result['timestamp'],
+            'poll_duration_seconds': result['duration'],
+            'poll_errors': len(result['errors']),
+            'stale': 0,
+        }
+        for name, value in meta.items():
+            family = metric_name(self.prefix, name)
+            lines[family] = [f"{family}{{{labels}}} {format_value(value)}\n"]
+
+        self._replace(device, { family: ''.join(samples) for family, samples in lines.items() })
+
+    def mark_stale(self, device: str) -> None:
+        """
+        Flag a device that returned nothing in the last poll cycle, keeping its last values
+        """
+        family = metric_name(self.prefix, 'stale')
+        if device in self.families.get(family, {}):
+            self.families[family][device] = f"{family}{{{self.device_labels[device]}}} 1\n"
+            self._body = None
+
+    def _replace(self, device: str, fragments: dict) -> None:
+        """
+        Swap every fragment of a device for fragments
+        """
+        for family in self.device_families.get(device, ()):
+            if family not in fragments:
+                self.families[family].pop(device, None)
+                if not self.families[family]:
+                    del self.families[family]
+
+        for family, fragment in fragments.items():
+            self.families.setdefault(family, {})[device] = fragment
+
+        self.device_families[device] = set(fragments)
+        self._body = None
+
+    def render(self) -> bytes:
+        """
+        Exposition body, rebuilt only after an update
+        """
+        if self._body == None:
+            parts = []
+            for family in sorted(self.families):
+                parts.append(f"# TYPE {family} gauge\n")
+                parts.extend(self.families[family].values())
+            parts.append("# EOF\n")
+            self._body = ''.join(parts).encode()
+        return self._body
+
+    async def poll_forever(self) -> None:
+        """
+        Poll the fleet every interval seconds and update the fragments as results arrive
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            cycle_started = time.time()
+
+            seen = set()
+            try:
+                async for result in self.poller.poll():
+                    self.update(result)
+                    seen.add(result['name'])
+            except Exception:
+                # Keep serving the last results, every device not seen is flagged stale below
+                logger.exception("Poll cycle failed")
+
+            for device in list(self.device_families):
+                if device not in seen:
+                    self.mark_stale(device)
+
+            cycle = {
+                'exporter_cycle_timestamp_seconds': cycle_started,
+                'exporter_cycle_duration_seconds': time.time() - cycle_started,
+            }
+            self._replace(None, { metric_name(self.prefix, name): f"{metric_name(self.prefix, name)} {format_value(value)}\n" for name, value in cycle.items() })
+
+            await asyncio.sleep(max(0.0, self.interval - (loop.time() - started)))
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer one HTTP request from the cached body
+        """
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+            request_line, *headers = head.decode('latin-1').split('\r\n')
+            method, path = request_line.split(' ')[:2]
+
+            if method not in ('GET', 'HEAD') or path.split('?')[0] != '/metrics':
+                status, content_type, body = '404 Not Found', 'text/plain; charset=utf-8', b'Not Found\n'
+            else:
+                accept = ' '.join(header for header in headers if header.lower().startswith('accept:'))
+                content_type = OPENMETRICS_CONTENT_TYPE if 'application/openmetrics-text' in accept else TEXT_CONTENT_TYPE
+                status, body = '200 OK', self.render()
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            )
+            if method != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '0.0.0.0', port: int = 9116) -> None:
+        """
+        Start the HTTP server and the background poll loop on the running loop
+        """
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self._poll_task = asyncio.create_task(self.poll_forever())
+
+    async def stop(self) -> None:
+        """
+        Stop the poll loop and the HTTP server
+        """
+        if self._poll_task != None:
+            self._poll_task.cancel()
+            await asyncio.gather(self._poll_task, return_exceptions=True)
+            self._poll_task = None
+
+        if self._server != None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve(self, host: str = '0.0.0.0', port: int = 9116) -> None:
+        """
+        Serve until cancelled
+        """
+        await self.start(host, port)
+        try:
+            await self._poll_task
+        finally:
+            await self.stop()
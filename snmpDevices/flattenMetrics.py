@@ -0,0 +1,64 @@
+"""
+Flatten polled metric values into numeric (metric, index, value) samples
+
+    cpuMetrics {'ssCpuUser': 9, ...}                 -> ('cpuMetrics.ssCpuUser', None, 9)
+    baseOutputStatus (2, 'onLine')                   -> ('baseOutputStatus', None, 2)
+    ifRates [{'Index': 1, 'InOctets': 10.5, ...}]    -> ('ifRates.InOctets', 1, 10.5)
+    batteryRuntime {'hours': 1, ...}                 -> ('batteryRuntime.hours', None, 1)
+
+Strings and None are skipped, booleans become 0 / 1.
+"""
+
+import dataclasses
+import math
+
+
+def flatten_metric(name: str, value, index=None):
+    """
+    Yield (metric, index, value) for every number in a metric value
+    """
+    if value == None or isinstance(value, str):
+        return
+
+    if isinstance(value, bool):
+        yield (name, index, int(value))
+
+    elif isinstance(value, (int, float)):
+        if not (isinstance(value, float) and math.isnan(value)):
+            yield (name, index, value)
+
+    # Enum metrics are (code, description)
+    elif isinstance(value, tuple):
+        if value and isinstance(value[0], int):
+            yield (name, index, value[0])
+
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key != 'Index':
+                yield from flatten_metric(f"{name}.{key}", item, index)
+
+    # Table metrics: one dict per row with its 'Index'
+    elif isinstance(value, list):
+        for row in value:
+            if isinstance(row, dict):
+                yield from flatten_metric(name, row, row.get('Index', index))
+
+    # Snapshot records
+    elif dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            yield from flatten_metric(f"{name}.{field.name}", getattr(value, field.name), index)
+
+    # Columnar interface rates (ifColumnRates)
+    elif hasattr(value, 'index') and hasattr(value, 'rates'):
+        indexes = [int(id) for id in value.index]
+        for key, column in value.rates.items():
+            for id, item in zip(indexes, column.tolist()):
+                yield from flatten_metric(f"{name}.{key}", item, id)
+
+
+def flatten_result(result: dict):
+    """
+    Yield (metric, index, value) for every number in a FleetPoller result
+    """
+    for name, value in result['metrics'].items():
+        yield from flatten_metric(name, value)
@@ -0,0 +1,345 @@
+import asyncio
+import inspect
+import multiprocessing
+import multiprocessing.connection
+import time
+
+from .snmp import snmpRead, close_shared_engine
+from .ups import upsAPC, upsCyberPower
+from .sensors import HWgSTE
+from .networking import ifaceMetrics
+from .hostDefaults import host
+from .timeSeries import seriesStore
+from .inventoryCache import inventoryCache
+
+# Device classes an inventory entry can name in its 'type' key
+DEVICE_CLASSES = {
+    'host': host,
+    'ifaceMetrics': ifaceMetrics,
+    'upsAPC': upsAPC,
+    'upsCyberPower': upsCyberPower,
+    'HWgSTE': HWgSTE,
+}
+
+def device_metrics(cls: type) -> list[str]:
+    """
+    Names of the metrics of a device class, every aget_<name>() that takes no arguments
+    """
+    metrics = []
+    for name in dir(cls):
+        member = getattr(cls, name)
+        if not name.startswith('aget_') or not inspect.iscoroutinefunction(member):
+            continue
+
+        params = list(inspect.signature(member).parameters.values())[1:]
+        if all(param.default is not param.empty for param in params):
+            metrics.append(name[len('aget_'):])
+
+    return metrics
+
+def build_device(entry: dict, share_engine: bool = True) -> snmpRead:
+    """
+    Device instance for an inventory entry
+    entry holds 'type' (a DEVICE_CLASSES key) and the constructor arguments (ip, port, snmpv, community, ...)
+    """
+    options = { key: value for key, value in entry.items() if key not in ('type', 'name', 'metrics', 'device') }
+    options.setdefault('share_engine', share_engine)
+    return DEVICE_CLASSES[entry.get('type', 'host')](**options)
+
+
+class FleetPoller:
+    """
+    Concurrent poller for an inventory of devices on one event loop
+
+    inventory is a list of dicts, one per device:
+        { 'type': 'host', 'ip': '10.0.0.1', 'community': 'public', 'snmpv': 2, 'metrics': ['cpuMetrics', 'memMetrics'] }
+    'type' names a DEVICE_CLASSES entry and the remaining keys are its constructor arguments.
+    A ready instance can be passed as 'device' instead. 'metrics' defaults to every metric of the
+    device class and 'name' to 'ip:port'.
+
+    max_in_flight bounds the SNMP requests in flight across the whole fleet, per_device the
+    requests in flight to any single device. Devices built from the inventory share one SNMP
+    engine (one UDP socket) per event loop.
+
+    With processes > 1 the inventory is sharded round robin across that many worker processes,
+    each running its own event loop and engine with an equal share of max_in_flight. Workers
+    stay alive between polls (keeping their caches) and stream results back over a pipe; poll()
+    yields the same result dicts as in single-process mode. Entries must then be dicts, not
+    'device' instances.
+
+    timeout, retries, adaptive_timeout and circuit_breaker, when set, are the defaults of every dict
+    entry that does not set them itself (see snmpRead); adaptive_timeout=True lets each device learn
+    its timeout from its response times. With circuit_breaker (the default), a device that stops
+    answering is skipped, its metrics reported as errors, until a probe gets a response again.
+
+    With a store (timeSeries.seriesStore) every numeric metric of every result is appended
+    to its (device, metric, index) series as results arrive.
+
+    Every result is also written to each of sinks (sinks.influxSink / sinks.jsonlSink);
+    a sink whose queue is full holds back the poll until it catches up.
+
+    inventory_cache (an SQLite file path, or an inventoryCache in single-process mode) keeps the
+    interface and storage indexes of every device on disk, so a restarted poller does not walk
+    them again while the agents have not restarted (see inventoryCache).
+
+    example usage:
+        poller = FleetPoller(inventory, max_in_flight=500, per_device=2)
+        async for result in poller.poll():
+            print(result['name'], result['metrics'], result['errors'])
+    """
+
+    def __init__(self, inventory: list, max_in_flight: int = 500, per_device: int = 2, share_engine: bool = True, processes: int = 1, store: seriesStore = None, sinks: list = None, timeout: float = None, retries: int = None, adaptive_timeout: bool = None, circuit_breaker: bool = True, inventory_cache=None):
+        self.max_in_flight = max_in_flight
+        self.per_device = per_device
+        self.share_engine = share_engine
+        self.processes = processes
+
+        # Time series store fed with every result, see timeSeries.seriesStore
+        self.store = store
+        # Batching output sinks written with every result, see sinks.batchSink
+        self.sinks = list(sinks or ())
+
+        # Fleet-wide request options, overridden by the keys of each inventory entry
+        options = (('timeout', timeout), ('retries', retries), ('adaptive_timeout', adaptive_timeout), ('circuit_breaker', circuit_breaker))
+        defaults = { key: value for key, value in options if value != None }
+        inventory = [entry if 'device' in entry else { **defaults, **entry } for entry in inventory]
+
+        # (process, pipe) of every worker, started by the first sharded poll
+        self.inventory = list(inventory)
+        self.workers = []
+        self._polling = False
+
+        # Persistent inventory cache, opened by whichever process polls (each worker opens the file)
+        self.inventory_cache = inventory_cache
+
+        # (name, device, metrics) for every inventory entry, polled by this process
+        self.devices = []
+        if processes > 1:
+            if any('device' in entry for entry in self.inventory):
+                raise ValueError("sharded polling needs dict inventory entries, not 'device' instances")
+            if inventory_cache != None and not isinstance(inventory_cache, str):
+                raise ValueError("sharded polling needs the inventory_cache file path")
+            return
+
+        # The cache opened from a path is closed with the poller
+        self._owns_cache = isinstance(inventory_cache, str)
+        if self._owns_cache:
+            self.inventory_cache = inventoryCache(inventory_cache)
+
+        for entry in inventory:
+            device = entry.get('device') or build_device(entry, share_engine)
+            metrics = list(entry.get('metrics') or device_metrics(type(device)))
+
+            for metric in metrics:
+                if not hasattr(device, f"aget_{metric}"):
+                    raise ValueError(f"{type(device).__name__} has no metric {metric!r}")
+
+            name = entry.get('name') or f"{device.ip}:{device.port}"
+            # Telemetry of the device is labelled with its inventory name
+            device.label = name
+            if self.inventory_cache != None and device.inventory_cache == None:
+                device.inventory_cache = self.inventory_cache
+            self.devices.append((name, device, metrics))
+
+    async def poll(self):
+        """
+        Poll every device once, yielding one result per device as soon as it completes
+        """
+        results = self._poll_sharded() if self.processes > 1 else self._poll_local()
+        try:
+            async for result in results:
+                await self._publish(result)
+                yield result
+        finally:
+            await results.aclose()
+
+    async def _publish(self, result: dict) -> None:
+        """
+        Feed a result to the store and the sinks
+        """
+        if self.store != None:
+            self.store.add_result(result)
+        for sink in self.sinks:
+            await sink.write(result)
+
+    async def _poll_local(self):
+        """
+        Poll the devices of this process on the running loop
+        """
+        # Semaphores bind to the running loop, so they are created per poll
+        in_flight = asyncio.Semaphore(self.max_in_flight)
+        for name, device, metrics in self.devices:
+            # Take the device slot before the global one so a busy device does not hold fleet slots
+            device.request_limits = (asyncio.Semaphore(self.per_device), in_flight)
+
+        tasks = [asyncio.create_task(self._poll_device(name, device, metrics)) for name, device, metrics in self.devices]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # The consumer stopped early, do not leave requests running in the background
+            for task in tasks:
+                task.cancel()
+
+    async def collect(self) -> list[dict]:
+        """
+        Poll every device once and return all results
+        """
+        return [result async for result in self.poll()]
+
+    async def _poll_device(self, name: str, device: snmpRead, metrics: list) -> dict:
+        """
+        Poll the metrics of one device concurrently
+        """
+        started = time.time()
+
+        # The device stopped answering, do not even queue its requests until its circuit lets a probe through
+        breaker = getattr(device, 'breaker', None)
+        if breaker != None and breaker.blocked():
+            values = [ConnectionError(f"circuit {breaker.state}, device skipped")] * len(metrics)
+        else:
+            values = await asyncio.gather(*(getattr(device, f"aget_{metric}")() for metric in metrics), return_exceptions=True)
+
+        result = {
+            'name': name,
+            'type': type(device).__name__,
+            'ip': device.ip,
+            'port': device.port,
+            'timestamp': started,
+            'duration': time.time() - started,
+            'metrics': {},
+            'errors': {},
+        }
+        for metric, value in zip(metrics, values):
+            if isinstance(value, Exception):
+                result['errors'][metric] = repr(value)
+            else:
+                result['metrics'][metric] = value
+
+        return result
+
+    async def _poll_sharded(self):
+        """
+        Ask every worker process to poll its shard and yield results as they arrive
+        """
+        # A previous poll was abandoned while its workers were still streaming results
+        if self._polling:
+            self._stop_workers()
+
+        if not self.workers:
+            self._start_workers()
+
+        workers = self.workers
+        self._polling = True
+
+        pending = {}
+        for process, conn in workers:
+            conn.send('poll')
+            pending[conn] = process
+
+        died = False
+        loop = asyncio.get_running_loop()
+        try:
+            while pending:
+                # Wait for any worker pipe without blocking the event loop
+                ready = await loop.run_in_executor(None, multiprocessing.connection.wait, list(pending))
+                for conn in ready:
+                    try:
+                        result = conn.recv()
+                    except (EOFError, OSError):
+                        # The worker died, its shard is restarted on the next poll
+                        result = None
+                        died = True
+
+                    if result is None:
+                        pending.pop(conn, None)
+                    else:
+                        yield result
+        finally:
+            if self.workers is workers:
+                self._polling = bool(pending)
+                if died:
+                    self._stop_workers()
+
+    def _start_workers(self) -> None:
+        """
+        Start one worker process per shard of the inventory
+        """
+        context = multiprocessing.get_context('spawn')
+        max_in_flight = max(1, self.max_in_flight // self.processes)
+
+        for shard in range(self.processes):
+            inventory = self.inventory[shard::self.processes]
+            if not inventory:
+                continue
+
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_shard_worker,
+                args=(child_conn, inventory, max_in_flight, self.per_device, self.share_engine, self.inventory_cache),
+                name=f"FleetPoller-{shard}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+
+    def _stop_workers(self) -> None:
+        """
+        Stop every worker process
+        """
+        workers, self.workers = self.workers, []
+        self._polling = False
+        for process, conn in workers:
+            try:
+                conn.send('stop')
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    async def close(self) -> None:
+        """
+        Close the SNMP engines of every device and stop the worker processes
+        """
+        self._stop_workers()
+
+        for name, device, metrics in self.devices:
+            await device.close()
+
+        if self.share_engine:
+            await close_shared_engine()
+
+        if self.processes <= 1 and self._owns_cache:
+            self.inventory_cache.close()
+
+
+def _shard_worker(conn, inventory: list, max_in_flight: int, per_device: int, share_engine: bool, inventory_cache: str = None) -> None:
+    """
+    Worker process of a sharded FleetPoller: polls its shard on every 'poll' command
+    and sends each result over conn, followed by None once the shard is done
+    """
+    async def serve():
+        poller = FleetPoller(inventory, max_in_flight, per_device, share_engine, inventory_cache=inventory_cache)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                command = await loop.run_in_executor(None, conn.recv)
+                if command != 'poll':
+                    break
+
+                async for result in poller.poll():
+                    conn.send(result)
+                conn.send(None)
+        finally:
+            await poller.close()
+
+    try:
+        asyncio.run(serve())
+    except (EOFError, BrokenPipeError, KeyboardInterrupt):
+        # The parent went away
+        pass
+    finally:
+        conn.close()
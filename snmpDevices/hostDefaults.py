@@ -1,328 +1,385 @@
-from .snmp import snmpRead
+import asyncio
+import time
+
+from .mibProfile import profileDevice
+from .counterRates import counterRates
+from .inventoryCache import cacheEntry
 from .snmpMibMapping import ( 
     get_iftype_description,
     get_ifOperStatus_description,
     get_ifAdminStatus_description
 )
 
-class host(snmpRead):
+# HOST-RESOURCES-MIB hrStorageEntry and the hrStorageType of fixed disks
+HR_STORAGE_ROOT_OID = '.1.3.6.1.2.1.25.2.3.1'
+HR_STORAGE_FIXED_DISK = '1.3.6.1.2.1.25.2.1.4'
+
+# sysUpTime, checked with every use of the storage index cache
+SYS_UPTIME_OID = '.1.3.6.1.2.1.1.3.0'
+
+# Seconds a storage index cache entry is used before hrStorageIndex is walked again for new disks
+STORAGE_INDEX_MAX_AGE = 3600.0
+
+# UCD-DISKIO-MIB diskIOTable and its columns
+DISKIO_ROOT_OID = '.1.3.6.1.4.1.2021.13.15.1.1'
+DISKIO_COLUMNS = {
+    'Device': 2,
+    'IONRead': 3,
+    'IONWritten': 4,
+    'IOReads': 5,
+    'IOWrites': 6,
+    'IOLA1': 9,
+    'IOLA5': 10,
+    'IOLA15': 11,
+    'IONReadX': 12,
+    'IONWrittenX': 13,
+}
+
+# Counter columns of aget_diskIORates and their width; the 64-bit byte counters replace the 32-bit ones when present
+DISKIO_RATE_COUNTERS = {
+    'IONRead': 32,
+    'IONWritten': 32,
+    'IOReads': 32,
+    'IOWrites': 32,
+}
+DISKIO_X_RATE_COUNTERS = { 'IONReadX': ('IONRead', 64), 'IONWrittenX': ('IONWritten', 64) }
+
+# System group, UCD-SNMP-MIB memory / CPU / load and LM-SENSORS-MIB
+HOST_PROFILE = {
+    'hostName': { 'oid': '.1.3.6.1.2.1.1.5.0' },
+    'contact': { 'oid': '.1.3.6.1.2.1.1.4.0' },
+    'location': { 'oid': '.1.3.6.1.2.1.1.6.0' },
+    'upTime': { 'oid': '.1.3.6.1.2.1.1.3.0' },
+
+    # System Metrics
+    'memSwapMetrics': {
+        'doc': 'Memory Swap Metrics',
+        'group': {
+            # Swap Memory Statistics
+            ## Total swap space available on the system (in KB).
+            'memTotalSwap': { 'oid': '.1.3.6.1.4.1.2021.4.3.0', 'convert': 'int' },
+            ## Currently available swap space (not used).
+            'memAvailSwap': { 'oid': '.1.3.6.1.4.1.2021.4.4.0', 'convert': 'int' },
+            ## Minimum required swap space before alerting (in KB).
+            'memMinimumSwap': { 'oid': '.1.3.6.1.4.1.2021.4.12.0', 'convert': 'int' },
+        },
+    },
+    'memMetrics': {
+        'doc': 'Memory Metrics',
+        'group': {
+            # Physical (Real) Memory (RAM) Statistics
+            ## Total RAM available on the system (in KB).
+            'memTotalReal': { 'oid': '.1.3.6.1.4.1.2021.4.5.0', 'convert': 'int' },
+            ## Total RAM used on the system (in KB).
+            'memAvailReal': { 'oid': '.1.3.6.1.4.1.2021.4.6.0', 'convert': 'int' },
+            ## Total RAM free on the system (in KB).
+            'memTotalFree': { 'oid': '.1.3.6.1.4.1.2021.4.11.0', 'convert': 'int' },
+
+            # Memory Buffers
+            ## Shared memory used by multiple processes
+            'memShared': { 'oid': '.1.3.6.1.4.1.2021.4.13.0', 'convert': 'int' },
+            ## Buffer memory used for temporary data.
+            'memBuffer': { 'oid': '.1.3.6.1.4.1.2021.4.14.0', 'convert': 'int' },
+            ## Cached memory (used for speeding up file access).
+            'memCached': { 'oid': '.1.3.6.1.4.1.2021.4.15.0', 'convert': 'int' },
+        },
+    },
+    'cpuMetrics': {
+        'doc': 'CPU Metrics',
+        'group': {
+            # CPU Utilization (Percentage)
+            ## Percentage of CPU time spent in user mode (processing applications)
+            'ssCpuUser': { 'oid': '.1.3.6.1.4.1.2021.11.9.0', 'convert': 'int' },
+            ## Percentage of CPU time spent in system mode (kernel operations)
+            'ssCpuSystem': { 'oid': '.1.3.6.1.4.1.2021.11.10.0', 'convert': 'int' },
+            ## Percentage of CPU time the system is idle.
+            'ssCpuIdle': { 'oid': '.1.3.6.1.4.1.2021.11.11.0', 'convert': 'int' },
+
+            # CPU & Interrupts
+            ## interrupts per second
+            'ssSysInterrupts': { 'oid': '.1.3.6.1.4.1.2021.11.7.0', 'convert': 'int' },
+            ## context switches per second
+            'ssSysContext': { 'oid': '.1.3.6.1.4.1.2021.11.8.0', 'convert': 'int' },
+        },
+    },
+    'LoadAvg': {
+        'doc': 'Load Average',
+        'group': {
+            # load average in 1 minute
+            'load_avg1': { 'oid': '.1.3.6.1.4.1.2021.10.1.3.1', 'convert': 'float' },
+            # load average in 5 minutes
+            'load_avg5': { 'oid': '.1.3.6.1.4.1.2021.10.1.3.2', 'convert': 'float' },
+            # load average in 15 minutes
+            'load_avg15': { 'oid': '.1.3.6.1.4.1.2021.10.1.3.3', 'convert': 'float' },
+        },
+    },
+
+    # SNMP Sensors
+    'sensors': {
+        'doc': 'SNMP Sensors',
+        'table': '.1.3.6.1.4.1.2021.13.16.2.1',
+        'columns': {
+            'Sensor': { 'column': 2 },
+            'Value': { 'column': 3, 'convert': 'milli' },
+        },
+    },
+}
+
+class host(profileDevice):
     """
     SNMP Host Defaults
     """
 
-    def __init__(self,ip: str,port: int = 161,snmpv: int = 1,community: str = None,user: str = None,authkey: str = None,privkey: str = None):
-        super().__init__(ip, port, snmpv, community, user, authkey, privkey)
+    PROFILE = HOST_PROFILE
+
+    def __init__(self,ip: str,port: int = 161,snmpv: int = 1,community: str = None,user: str = None,authkey: str = None,privkey: str = None, **kwargs):
+        super().__init__(ip, port, snmpv, community, user, authkey, privkey, **kwargs)
+
+        # Disk I/O table fetch in flight, shared by concurrent callers
+        self._diskio_fetch = None
+        self._diskio_waiters = 0
+
+        # Last counter samples of aget_diskIORates
+        self.counter_rates = counterRates()
+
+        # Storage index cache: cacheEntry of the hrStorage indexes of the fixed disks, kept only with an inventory_cache
+        self.storage_index_cache = None
         
-    @property
-    def get_hostName(self) -> str:
-        hostname = self.get_oid(".1.3.6.1.2.1.1.5.0")
-        return str(hostname) if hostname != None else None
-    
-    @property
-    def get_contact(self) -> str:
-        contact = self.get_oid(".1.3.6.1.2.1.1.4.0")
-        return str(contact) if contact != None else None
-    
-    @property
-    def get_location(self) -> str:
-        location = self.get_oid(".1.3.6.1.2.1.1.6.0")
-        return str(location) if location != None else None
-    
-    @property
-    def get_upTime(self) -> str:
-        uptime = self.get_oid(".1.3.6.1.2.1.1.3.0")
-        return str(uptime) if uptime != None else None
-    
-    # System Metrics
-    @property
-    def get_memSwapMetrics(self) -> dict:
-        """
-        Memory Swap Metrics
-        """
-        mem = {}
-        # Swap Memory Statistics
-        ## Total swap space available on the system (in KB).
-        memTotalSwap = self.get_oid(".1.3.6.1.4.1.2021.4.3.0")
-        mem['memTotalSwap'] = int(memTotalSwap) if memTotalSwap != None else None
-        ## Currently available swap space (not used).
-        memAvailSwap = self.get_oid(".1.3.6.1.4.1.2021.4.4.0")
-        mem['memAvailSwap'] = int(memAvailSwap) if memAvailSwap != None else None
-        ## Minimum required swap space before alerting (in KB).
-        memMinimumSwap = self.get_oid(".1.3.6.1.4.1.2021.4.12.0")
-        mem['memMinimumSwap'] = int(memMinimumSwap) if memMinimumSwap != None else None
-    
-        return mem
-
-    @property
-    def get_memMetrics(self) -> dict:
-        """
-        Memory Metrics
-        """
-        mem = {}
-        # Physical (Real) Memory (RAM) Statistics
-        ## Total RAM available on the system (in KB).
-        memTotalReal = self.get_oid(".1.3.6.1.4.1.2021.4.5.0")
-        mem['memTotalReal'] = int(memTotalReal) if memTotalReal != None else None
-        ## Total RAM used on the system (in KB).
-        memAvailReal = self.get_oid(".1.3.6.1.4.1.2021.4.6.0")
-        mem['memAvailReal'] = int(memAvailReal) if memAvailReal != None else None
-        ## Total RAM free on the system (in KB).
-        memTotalReal = self.get_oid(".1.3.6.1.4.1.2021.4.11.0")
-        mem['memTotalFree'] = int(memTotalReal) if memTotalReal != None else None
-
-        # Memory Buffers
-        ## Shared memory used by multiple processes
-        memShared = self.get_oid(".1.3.6.1.4.1.2021.4.13.0")
-        mem['memShared'] = int(memShared) if memShared != None else None
-        ## Buffer memory used for temporary data.
-        memBuffer = self.get_oid(".1.3.6.1.4.1.2021.4.14.0")
-        mem['memBuffer'] = int(memBuffer) if memBuffer != None else None
-        ## Cached memory (used for speeding up file access).
-        memCached = self.get_oid(".1.3.6.1.4.1.2021.4.15.0")
-        mem['memCached'] = int(memCached) if memCached != None else None
-                                            
-        return mem
-
-    @property
-    def get_cpuMetrics(self) -> dict:
-        """
-        CPU Metrics
-        """
-        cpu = {}
-        # CPU Utilization (Percentage)
-        ## Percentage of CPU time spent in user mode (processing applications)
-        ssCpuUser = self.get_oid(".1.3.6.1.4.1.2021.11.9.0")
-        cpu['ssCpuUser'] = int(ssCpuUser) if ssCpuUser != None else None
-        ## Percentage of CPU time spent in system mode (kernel operations)
-        ssCpuSystem = self.get_oid(".1.3.6.1.4.1.2021.11.10.0")
-        cpu['ssCpuSystem'] = int(ssCpuSystem) if ssCpuSystem != None else None
-        ## Percentage of CPU time the system is idle.
-        ssCpuIdle = self.get_oid(".1.3.6.1.4.1.2021.11.11.0")
-        cpu['ssCpuIdle'] = int(ssCpuIdle) if ssCpuIdle != None else None
-
-        # CPU & Interrupts
-        ## interrupts per second
-        ssSysInterrupts = self.get_oid(".1.3.6.1.4.1.2021.11.7.0")
-        cpu['ssSysInterrupts'] = int(ssSysInterrupts) if ssSysInterrupts != None else None
-        ## context switches per second
-        ssSysContext = self.get_oid(".1.3.6.1.4.1.2021.11.8.0")
-        cpu['ssSysContext'] = int(ssSysContext) if ssSysContext != None else None
-
-        return cpu
-
-    @property
-    def get_LoadAvg(self) -> list[float]:
-        """
-        Load Average
-        """
-        load_avg = {}
-        # load average in 1 minute
-        load_avg1 = self.get_oid(".1.3.6.1.4.1.2021.10.1.3.1")
-        load_avg['load_avg1'] = float(load_avg1) if load_avg1 != None else None
-        # load average in 5 minutes
-        load_avg5 = self.get_oid(".1.3.6.1.4.1.2021.10.1.3.2")
-        load_avg['load_avg5'] = float(load_avg5) if load_avg5 != None else None
-        # load average in 15 minutes
-        load_avg15 = self.get_oid(".1.3.6.1.4.1.2021.10.1.3.3")
-        load_avg['load_avg15'] = float(load_avg15) if load_avg15 != None else None
-
-        return load_avg
-
-    @property
-    def get_storage(self) -> list[dict]:
+    async def aget_storage(self) -> list[dict]:
         """
         Storage usage metrics (Disk)
+        The fixed disks are found by walking hrStorageIndex on every call. With an inventory_cache, they are kept
+        (in memory and on disk) until sysUpTime shows an agent restart, one of them disappears or
+        STORAGE_INDEX_MAX_AGE passes, so newly mounted disks show up
         """
-        
-        storage_root_oid = '.1.3.6.1.2.1.25.2.3.1'
-        storage_index = self.walk_oid(f"{storage_root_oid}.1")
+        rows = None
+        entry = self._storage_index()
+        if entry != None:
+            fixed_ids = entry.data
+            # sysUpTime rides in the request of the rows, checking the cache costs no extra PDU
+            uptime, *values = await self.run_snmp_get_many([SYS_UPTIME_OID, *(f"{HR_STORAGE_ROOT_OID}.{column}.{id}" for id in fixed_ids for column in (3, 4, 5, 6))])
+            if uptime != None and not entry.restarted(int(uptime)) and None not in values[0::4]:
+                rows = [values[i:i + 4] for i in range(0, len(values), 4)]
+            else:
+                self.clear_storage_index()
+
+        if rows == None:
+            fixed_ids = await self._awalk_storage_index()
+            if fixed_ids == None:
+                return None
+
+            # Description, allocation units, size and used space of every fixed disk in one request
+            rows = await self.run_snmp_get_rows(HR_STORAGE_ROOT_OID, fixed_ids, [3, 4, 5, 6])
 
-        if not storage_index:
-            return None
-        
         storages = []
-        for oid, id in storage_index:
+        for id, (desc, AllocationUnits, Size, Used) in zip(fixed_ids, rows):
             
             storage = {}
 
-            # Storage type
-            storage_type = self.get_oid(f"{storage_root_oid}.2.{id}")
-
-            if not storage_type:
-                continue
-
-            # only hrStorageFixedDisk type
-            if storage_type == '1.3.6.1.2.1.25.2.1.4':
-                # The index of the storage area on the device.
-                storage['Index'] = int(id)
-                # The name of the storage area.
-                desc = self.get_oid(f"{storage_root_oid}.3.{id}")
-                storage['Descr'] = str(desc) if desc != None else None
-                # The size of the storage area.
-                AllocationUnits = self.get_oid(f"{storage_root_oid}.4.{id}")
-                storage['AllocationUnits'] = int(AllocationUnits) if AllocationUnits != None else None
-                # The total size of the storage area.
-                Size = self.get_oid(f"{storage_root_oid}.5.{id}")
-                storage['Size'] = int(Size) if Size != None else None
-                # The amount of the storage area that is currently in use.
-                Used = self.get_oid(f"{storage_root_oid}.6.{id}")
-                storage['Used'] = int(Used) if Used != None else None
-
-                # The percentage of the storage area that is currently in use.
-                storage['UsedPercent'] = round((storage['Used'] / storage['Size'] * 100),2) if storage['Used'] != None and storage['Size'] != None else None
-                # The percentage of the storage area that is currently available.
-                storage['FreePercent'] = round((100 - storage['UsedPercent']),2) if storage['UsedPercent'] != None else 0.0
-
-                storages.append(storage)
+            # The index of the storage area on the device.
+            storage['Index'] = int(id)
+            # The name of the storage area.
+            storage['Descr'] = str(desc) if desc != None else None
+            # The size of the storage area.
+            storage['AllocationUnits'] = int(AllocationUnits) if AllocationUnits != None else None
+            # The total size of the storage area.
+            storage['Size'] = int(Size) if Size != None else None
+            # The amount of the storage area that is currently in use.
+            storage['Used'] = int(Used) if Used != None else None
+
+            # The percentage of the storage area that is currently in use.
+            storage['UsedPercent'] = round((storage['Used'] / storage['Size'] * 100),2) if storage['Used'] != None and storage['Size'] != None else None
+            # The percentage of the storage area that is currently available.
+            storage['FreePercent'] = round((100 - storage['UsedPercent']),2) if storage['UsedPercent'] != None else 0.0
+
+            storages.append(storage)
             
         storages.sort(key=lambda x: x['Index'])
         return storages
 
-    # Disk IO Metrics
-    @property
-    def get_diskION(self) -> list[dict]:
+    def _storage_index(self) -> cacheEntry:
         """
-        Disk I/O Operations Metrics (Bytes)
+        Storage index cache entry, loaded from the inventory_cache after a restart
+        None without an inventory_cache, or if the entry is missing or older than STORAGE_INDEX_MAX_AGE
         """
-        disk_root_oid = ".1.3.6.1.4.1.2021.13.15.1.1"
-        disk_index = self.walk_oid(f"{disk_root_oid}.1")
-
-        if not disk_index:
+        if self.inventory_cache == None:
             return None
-        
-        disks = []
-        for oid, id in disk_index:
-            disk = {}
-            # Represents the index of each disk device in the SNMP table.
-            disk['Index'] = int(id)
-            # The name of the disk device.
-            Device = self.get_oid(f"{disk_root_oid}.2.{id}")
-            disk['Device'] = str(Device) if Device != None else None
-            # Total bytes read from each device since boot.
-            IONRead = self.get_oid(f"{disk_root_oid}.3.{id}")
-            disk['IONRead'] = int(IONRead) if IONRead != None else None
-            # Total bytes written to each device since boot.
-            IONWritten = self.get_oid(f"{disk_root_oid}.4.{id}")
-            disk['IONWritten'] = int(IONWritten) if IONWritten != None else None
 
-            disks.append(disk)
-        disks.sort(key=lambda x: x['Index'])
-        return disks
+        if self.storage_index_cache == None:
+            self.storage_index_cache = self.inventory_cache.load(self.label, 'storage')
 
-    @property
-    def get_diskIO(self) -> list[dict]:
+        entry = self.storage_index_cache
+        if entry != None and time.time() - entry.saved > STORAGE_INDEX_MAX_AGE:
+            return None
+        return entry
+
+    async def _awalk_storage_index(self) -> list:
         """
-        Disk I/O Operations Metrics (Operations)
+        Walk hrStorageIndex for the indexes of the fixed disks, kept in the storage index cache with an inventory_cache
         """
-        disk_root_oid = ".1.3.6.1.4.1.2021.13.15.1.1"
-        disk_index = self.walk_oid(f"{disk_root_oid}.1")
+        storage_index = await self.run_snmp_walk(f"{HR_STORAGE_ROOT_OID}.1")
 
-        if not disk_index:
+        if not storage_index:
             return None
 
-        disks = []
-        for oid, id in disk_index:
-            disk = {}
-            # Represents the index of each disk device in the SNMP table.
-            disk['Index'] = int(id)
-            # The name of the disk device.
-            Device = self.get_oid(f"{disk_root_oid}.2.{id}")
-            disk['Device'] = str(Device) if Device != None else None
-            # Total read operations on each device since boot.
-            IOReads = self.get_oid(f"{disk_root_oid}.5.{id}")
-            disk['IOReads'] = int(IOReads) if IOReads != None else None
-            # Total write operations on each device since boot.
-            IOWrites = self.get_oid(f"{disk_root_oid}.6.{id}")
-            disk['IOWrites'] = int(IOWrites) if IOWrites != None else None
+        ids = [id for oid, id in storage_index]
 
-            disks.append(disk)
-        disks.sort(key=lambda x: x['Index'])
-        return disks
+        # Storage type of every storage area and sysUpTime in one request
+        uptime, *storage_types = await self.run_snmp_get_many([SYS_UPTIME_OID, *(f"{HR_STORAGE_ROOT_OID}.2.{id}" for id in ids)])
+
+        # only hrStorageFixedDisk type
+        fixed_ids = [id for id, storage_type in zip(ids, storage_types) if storage_type == HR_STORAGE_FIXED_DISK]
+
+        if uptime != None and self.inventory_cache != None:
+            self.storage_index_cache = cacheEntry(fixed_ids, int(uptime))
+            self.inventory_cache.save(self.label, 'storage', self.storage_index_cache)
 
-    @property
-    def get_diskIOLA(self) -> list[dict]:
+        return fixed_ids
+
+    def clear_storage_index(self) -> None:
         """
-        Disk I/O Load Average
-        1, 5, 15 minutes
+        Drop the storage index cache, in memory and on disk, the next call walks it again
+        """
+        self.storage_index_cache = None
+
+        if self.inventory_cache != None:
+            self.inventory_cache.drop(self.label, 'storage')
+
+    # Disk IO Metrics
+    async def aget_diskIOTable(self, exclude: tuple = None) -> list[dict]:
+        """
+        Disk I/O table (UCD-DISKIO-MIB diskIOTable), every column of every disk
+        exclude: device name prefixes to skip, e.g. ('loop', 'ram'), dropped before the counters are requested
         """
-        disk_root_oid = ".1.3.6.1.4.1.2021.13.15.1.1"
-        disk_index = self.walk_oid(f"{disk_root_oid}.1")
+        if exclude:
+            return await self._fetch_diskIOTable(tuple(exclude))
+
+        # Concurrent callers (the diskIO views polled together) share one walk of the table
+        fetch = self._diskio_fetch
+        if fetch is None or fetch.done() or fetch.get_loop() is not asyncio.get_running_loop():
+            fetch = self._diskio_fetch = asyncio.ensure_future(self._fetch_diskIOTable())
+
+        self._diskio_waiters += 1
+        try:
+            disks = await asyncio.shield(fetch)
+        finally:
+            self._diskio_waiters -= 1
+            # Every caller gave up (cancelled), do not leave the walk running on its own
+            if not self._diskio_waiters and not fetch.done():
+                fetch.cancel()
+
+        return [dict(disk) for disk in disks] if disks != None else None
+
+    def get_diskIOTable(self, exclude: tuple = None) -> list[dict]:
+        """
+        Disk I/O table (UCD-DISKIO-MIB diskIOTable)
+        """
+        return self.run_sync(self.aget_diskIOTable(exclude))
 
-        if not disk_index:
+    async def _fetch_diskIOTable(self, exclude: tuple = None) -> list[dict]:
+        """
+        Walk the disk I/O table, all columns in lockstep or, with exclude, the device names first
+        """
+        if not exclude:
+            table = await self.run_snmp_walk_table({ name: f"{DISKIO_ROOT_OID}.{column}" for name, column in DISKIO_COLUMNS.items() })
+        else:
+            devices, = await self.run_snmp_walk_columns([f"{DISKIO_ROOT_OID}.{DISKIO_COLUMNS['Device']}"])
+            ids = [id for id, device in devices.items() if not device.startswith(exclude)]
+
+            # Every counter of the remaining disks in one request
+            counters = [name for name in DISKIO_COLUMNS if name != 'Device']
+            rows = await self.run_snmp_get_rows(DISKIO_ROOT_OID, ids, [DISKIO_COLUMNS[name] for name in counters])
+            table = { id: { 'Device': devices[id], **dict(zip(counters, row)) } for id, row in zip(ids, rows) }
+
+        if not table:
             return None
 
         disks = []
-        for oid, id in disk_index:
+        for id, row in table.items():
             disk = {}
             # Represents the index of each disk device in the SNMP table.
             disk['Index'] = int(id)
             # The name of the disk device.
-            Device = self.get_oid(f"{disk_root_oid}.2.{id}")
-            disk['Device'] = str(Device) if Device != None else None
-            # These values represent disk utilization over 1, 5, and 15 minutes, similar to CPU load averages.
-            iola1 = self.get_oid(f"{disk_root_oid}.9.{id}")
-            disk['IOLA1'] = int(iola1) if iola1 != None else None
-            iola5 = self.get_oid(f"{disk_root_oid}.10.{id}")
-            disk['IOLA5'] = int(iola5) if iola5 != None else None
-            iola15 = self.get_oid(f"{disk_root_oid}.11.{id}")
-            disk['IOLA15'] = int(iola15) if iola15 != None else None
+            disk['Device'] = str(row['Device']) if row['Device'] != None else None
+            for name in DISKIO_COLUMNS:
+                if name != 'Device':
+                    disk[name] = int(row[name]) if row[name] != None else None
 
             disks.append(disk)
         disks.sort(key=lambda x: x['Index'])
         return disks
 
-    @property
-    def get_diskIONX(self) -> list[dict]:
+    async def aget_diskIORates(self) -> list[dict]:
         """
-        Disk I/O Operations Metrics (Extended)
+        Disk I/O rates per second (bytes and operations read / written)
+        Counters are sampled with sysUpTime from the same PDU and handle Counter32 wrap and agent restarts
+        The first poll returns None rates, every later poll the rates since the previous one
         """
-        disk_root_oid = ".1.3.6.1.4.1.2021.13.15.1.1"
-        disk_index = self.walk_oid(f"{disk_root_oid}.1")
+        counters = dict(DISKIO_RATE_COUNTERS)
+        # SNMPv1 has no Counter64
+        if self.snmpv != 0:
+            counters.update((x_name, bits) for x_name, (name, bits) in DISKIO_X_RATE_COUNTERS.items())
+
+        columns = { name: f"{DISKIO_ROOT_OID}.{DISKIO_COLUMNS[name]}" for name in ['Device', *counters] }
+        table = await self.run_snmp_walk_table(columns, stamp=True)
 
-        if not disk_index:
+        if not table:
             return None
-        
+
+        rates = self.counter_rates.table_rates(self.label, table, counters)
+
         disks = []
-        for oid, id in disk_index:
+        for id, rate in rates.items():
+            # Prefer the 64-bit byte counters, the 32-bit ones wrap after 4 GB
+            for x_name, (name, bits) in DISKIO_X_RATE_COUNTERS.items():
+                if table[id].get(x_name) != None:
+                    rate[name] = rate[x_name]
+                rate.pop(x_name, None)
+
             disk = {}
-            # Represents the index of each disk device in the SNMP table.
             disk['Index'] = int(id)
             # The name of the disk device.
-            Device = self.get_oid(f"{disk_root_oid}.2.{id}")
-            disk['Device'] = str(Device) if Device != None else None
-            # The diskIONReadX and diskIONWrittenX variables represent extended versions of the diskIONRead and diskIONWritten variables.
-            IONReadX = self.get_oid(f"{disk_root_oid}.12.{id}")
-            disk['IONReadX'] = int(IONReadX) if IONReadX != None else None
-            IONWrittenX = self.get_oid(f"{disk_root_oid}.13.{id}")
-            disk['IONWrittenX'] = int(IONWrittenX) if IONWrittenX != None else None
-
+            disk['Device'] = str(table[id]['Device'][1]) if table[id]['Device'] != None else None
+            disk.update(rate)
             disks.append(disk)
+
         disks.sort(key=lambda x: x['Index'])
         return disks
 
-    # SNMP Sensors
-    @property
-    def get_sensors(self) -> list[dict]:
+    async def _diskIOView(self, names: list) -> list[dict]:
         """
-        SNMP Sensors
+        Index, Device and the given columns of the disk I/O table
         """
-        # The OID prefix for the sensor table
-        sensor_root_oid = ".1.3.6.1.4.1.2021.13.16.2.1"
-        sensor_indices = self.walk_oid(f"{sensor_root_oid}.1")
-
-        if not sensor_indices:
+        disks = await self.aget_diskIOTable()
+        if not disks:
             return None
-        
-        sensors = []
-        for oid, id in sensor_indices:
-            sensor = {}
-            sensor['Index'] = int(id)
-            descr = self.get_oid(f"{sensor_root_oid}.2.{id}")
-            sensor['Sensor'] = str(descr) if descr != None else None
-            s_value = self.get_oid(f"{sensor_root_oid}.3.{id}")
-            sensor['Value'] = (int(s_value) / 1000.0) if s_value != None else None
-
-            sensors.append(sensor)
-
-        sensors.sort(key=lambda x: x['Index'])
-        return sensors
\ No newline at end of file
+        return [{ 'Index': disk['Index'], 'Device': disk['Device'], **{ name: disk[name] for name in names } } for disk in disks]
+
+    async def aget_diskION(self) -> list[dict]:
+        """
+        Disk I/O Operations Metrics (Bytes)
+        """
+        # Total bytes read / written on each device since boot.
+        return await self._diskIOView(['IONRead', 'IONWritten'])
+
+    async def aget_diskIO(self) -> list[dict]:
+        """
+        Disk I/O Operations Metrics (Operations)
+        """
+        # Total read / write operations on each device since boot.
+        return await self._diskIOView(['IOReads', 'IOWrites'])
+
+    async def aget_diskIOLA(self) -> list[dict]:
+        """
+        Disk I/O Load Average
+        1, 5, 15 minutes
+        """
+        # These values represent disk utilization over 1, 5, and 15 minutes, similar to CPU load averages.
+        return await self._diskIOView(['IOLA1', 'IOLA5', 'IOLA15'])
+
+    async def aget_diskIONX(self) -> list[dict]:
+        """
+        Disk I/O Operations Metrics (Extended)
+        """
+        # The diskIONReadX and diskIONWrittenX variables represent extended versions of the diskIONRead and diskIONWritten variables.
+        return await self._diskIOView(['IONReadX', 'IONWrittenX'])
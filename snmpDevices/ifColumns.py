@@ -0,0 +1,153 @@
+"""
+Columnar interface counters backed by NumPy arrays (optional, python3 -m pip install numpy)
+
+One poll of a 10k-port chassis is held as one array per counter instead of one
+dict per interface, and deltas, rates and utilization are computed for every
+interface at once.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import time
+
+from .counterRates import TICKS_PER_SECOND, RESTART_SLACK
+
+
+def require_numpy() -> None:
+    """
+    Raise ImportError if NumPy is not installed
+    """
+    if np is None:
+        raise ImportError("columnar interface results need NumPy: python3 -m pip install numpy")
+
+
+class ifColumns:
+    """
+    Interface counters of one poll, aligned on ifIndex
+
+    index           ifIndex of every interface (int64, sorted)
+    values[name]    counter values (uint64)
+    present[name]   True where the agent returned the counter
+    ticks[name]     sysUpTime of the PDU that carried each value (int64)
+    bits[name]      counter width, 32 or 64
+    speed           interface speed in bits per second (float64, NaN if unknown)
+    sampled         time.monotonic() when the sample was taken
+    """
+
+    __slots__ = ('index', 'values', 'present', 'ticks', 'bits', 'speed', 'sampled')
+
+    def __init__(self, index, values: dict, present: dict, ticks: dict, bits: dict, speed, sampled: float = None):
+        self.index = index
+        self.values = values
+        self.present = present
+        self.ticks = ticks
+        self.bits = bits
+        self.speed = speed
+        self.sampled = time.monotonic() if sampled == None else sampled
+
+    @classmethod
+    def from_walk(cls, bits: dict, rows: list, speed_rows: list = None, speed_unit: float = 1.0) -> 'ifColumns':
+        """
+        Sample from run_snmp_walk_raw(..., stamp=True) rows, one list of (Oid, value, sysUpTime) per counter in bits
+        speed_rows is the walked ifSpeed / ifHighSpeed column, speed_unit its unit in bits per second
+        """
+        require_numpy()
+
+        # The last sub-identifier of an ifTable / ifXTable OID is the ifIndex
+        def column_index(column):
+            return np.fromiter((oid[-1] for oid, value, ticks in column), dtype=np.int64, count=len(column))
+
+        indexes = [column_index(column) for column in rows]
+        if speed_rows != None:
+            indexes.append(column_index(speed_rows))
+        index = np.unique(np.concatenate(indexes)) if indexes else np.empty(0, dtype=np.int64)
+
+        values, present, ticks = {}, {}, {}
+        for name, column, column_ids in zip(bits, rows, indexes):
+            positions = np.searchsorted(index, column_ids)
+            column_ticks = np.fromiter((t if t != None else -1 for oid, value, t in column), dtype=np.int64, count=len(column))
+
+            values[name] = np.zeros(len(index), dtype=np.uint64)
+            values[name][positions] = np.fromiter((int(value) for oid, value, t in column), dtype=np.uint64, count=len(column))
+            ticks[name] = np.full(len(index), -1, dtype=np.int64)
+            ticks[name][positions] = column_ticks
+            present[name] = ticks[name] >= 0
+
+        speed = np.full(len(index), np.nan)
+        if speed_rows != None:
+            positions = np.searchsorted(index, indexes[-1])
+            speed[positions] = np.fromiter((int(value) for oid, value, t in speed_rows), dtype=np.float64, count=len(speed_rows)) * speed_unit
+
+        return cls(index, values, present, ticks, dict(bits), speed)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def rates(self, previous: 'ifColumns' = None, prefer: dict = None) -> 'ifColumnRates':
+        """
+        Per-second rates since the previous sample, NaN where unknown
+        Counter32 wrap is corrected; a Counter64 going backwards, a sysUpTime going backwards or
+        advancing less than our clock (agent restart) and interfaces missing from either sample give NaN
+        prefer maps a counter to the one it replaces where present, e.g. { 'HCInOctets': 'InOctets' }
+        """
+        rates = {}
+        if previous != None:
+            common, positions, previous_positions = np.intersect1d(self.index, previous.index, assume_unique=True, return_indices=True)
+
+        for name, bits in self.bits.items():
+            rate = np.full(len(self.index), np.nan)
+            rates[name] = rate
+            if previous == None or name not in previous.values:
+                continue
+
+            current_values = self.values[name][positions]
+            previous_values = previous.values[name][previous_positions]
+            elapsed = self.ticks[name][positions] - previous.ticks[name][previous_positions]
+            valid = self.present[name][positions] & previous.present[name][previous_positions] & (elapsed > 0)
+            # The agent clock advanced less than ours: it restarted in between, see counterRates
+            valid &= elapsed / TICKS_PER_SECOND + RESTART_SLACK >= self.sampled - previous.sampled
+
+            # uint64 subtraction is modulo 2^64, masking it gives the Counter32 delta across a wrap
+            delta = current_values - previous_values
+            if bits == 32:
+                delta &= np.uint64(0xFFFFFFFF)
+            else:
+                valid &= current_values >= previous_values
+
+            rate[positions] = np.where(valid, delta.astype(np.float64) * TICKS_PER_SECOND / np.where(valid, elapsed, 1), np.nan)
+
+        for preferred, name in (prefer or {}).items():
+            if preferred in rates:
+                rates[name] = np.where(self.present[preferred], rates.pop(preferred), rates[name])
+
+        return ifColumnRates(self.index, rates, self.speed)
+
+
+class ifColumnRates:
+    """
+    Per-second counter rates of every interface
+
+    index           ifIndex of every interface (int64, sorted)
+    rates[name]     rate per second (float64, NaN where unknown)
+    speed           interface speed in bits per second (float64)
+    """
+
+    __slots__ = ('index', 'rates', 'speed')
+
+    def __init__(self, index, rates: dict, speed):
+        self.index = index
+        self.rates = rates
+        self.speed = speed
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def utilization(self, name: str = 'InOctets'):
+        """
+        Link utilization of an octet counter, rate * 8 / speed (0.0 to 1.0, NaN if the speed is unknown or 0)
+        """
+        speed = np.where(self.speed > 0, self.speed, np.nan)
+        return self.rates[name] * 8 / speed
@@ -0,0 +1,133 @@
+"""
+Persistent cache of slow-changing device data
+
+The interface index (ifIndex, ifDescr, ifType, ifPhysAddress, ...) and the
+fixed disks of the hrStorage table are learned with walks. Kept in an SQLite
+file, they survive a restart of the poller, so a warm start goes straight to
+counter polling instead of walking every device again.
+
+Every entry is keyed by (device, kind) and saved with the sysUpTime of the
+agent when it was read, and for interface data its ifTableLastChange. An entry
+is used only if the agent has not restarted since (see cacheEntry.restarted)
+and, where given, ifTableLastChange has not moved.
+
+    cache = inventoryCache('/var/cache/snmpDevices/inventory.sqlite')
+    poller = FleetPoller(inventory, inventory_cache=cache)
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+# Seconds the boot time of an agent (now - sysUpTime) may move before the agent is taken as restarted
+BOOT_SLACK = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory (
+    device TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    uptime INTEGER,
+    last_change TEXT,
+    saved REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (device, kind)
+)
+"""
+
+
+class cacheEntry:
+    """
+    Cached data of one (device, kind)
+
+    data            JSON-compatible value
+    uptime          sysUpTime of the agent (centiseconds) when the data was read
+    last_change     ifTableLastChange when the data was read, None if not relevant
+    saved           time.time() when the data was read
+    """
+
+    __slots__ = ('data', 'uptime', 'last_change', 'saved')
+
+    def __init__(self, data, uptime: int, last_change: str = None, saved: float = None):
+        self.data = data
+        self.uptime = uptime
+        self.last_change = last_change
+        self.saved = saved if saved != None else time.time()
+
+    def restarted(self, uptime: int) -> bool:
+        """
+        True if sysUpTime shows the agent restarted since the entry was read
+        """
+        if self.uptime == None or uptime < self.uptime:
+            return True
+
+        # The agent restarted while the poller was down and has been up longer than before: its boot time moved
+        return (time.time() - uptime / 100) - (self.saved - self.uptime / 100) > BOOT_SLACK
+
+    def valid(self, uptime: int, last_change: str = None) -> bool:
+        """
+        True if the entry still describes an agent reporting uptime and last_change now
+        """
+        return uptime != None and not self.restarted(uptime) and self.last_change == last_change
+
+
+class inventoryCache:
+    """
+    (device, kind) -> cacheEntry, stored in an SQLite file
+
+    Reads and writes are small and run on the calling thread. The connection is shared by
+    every thread (the synchronous API runs on the background loop thread) behind a lock.
+    The file uses write-ahead logging, so worker processes of a sharded FleetPoller can share it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # An entry lost on power failure is walked again, no need to sync every write
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+
+    def load(self, device: str, kind: str) -> cacheEntry:
+        """
+        Entry of (device, kind), None if there is none
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data, uptime, last_change, saved FROM inventory WHERE device = ? AND kind = ?", (device, kind)
+            ).fetchone()
+        if row == None:
+            return None
+
+        data, uptime, last_change, saved = row
+        try:
+            return cacheEntry(json.loads(data), uptime, last_change, saved)
+        except ValueError:
+            return None
+
+    def save(self, device: str, kind: str, entry: cacheEntry) -> None:
+        data = json.dumps(entry.data)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO inventory (device, kind, uptime, last_change, saved, data) VALUES (?, ?, ?, ?, ?, ?)",
+                (device, kind, entry.uptime, entry.last_change, entry.saved, data),
+            )
+            self._db.commit()
+
+    def drop(self, device: str, kind: str = None) -> None:
+        """
+        Forget the entry of (device, kind), or every entry of device
+        """
+        with self._lock:
+            if kind == None:
+                self._db.execute("DELETE FROM inventory WHERE device = ?", (device,))
+            else:
+                self._db.execute("DELETE FROM inventory WHERE device = ? AND kind = ?", (device, kind))
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
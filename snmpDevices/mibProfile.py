@@ -0,0 +1,246 @@
+"""
+Declarative MIB profiles
+
+A profile maps each metric name of a device type to one of:
+
+    scalar  { 'oid': '.1.3.6.1.2.1.1.5.0', 'convert': 'int', 'enum': { 1: 'Unknown', ... }, 'doc': '...' }
+            'convert' and 'enum' are optional; an enum metric returns (code, description)
+    group   { 'group': { key: scalar, ... }, 'doc': '...' }
+            returns { key: value }
+    table   { 'table': '.1.3.6.1.4.1.2021.13.16.2.1', 'columns': { key: { 'column': 2, 'convert': ... } }, 'doc': '...' }
+            returns one { 'Index': index, key: value } per row, sorted by index
+
+'convert' is a CONVERTERS name or any callable taking the value string.
+A profileDevice subclass with a PROFILE gets aget_<name>() / get_<name> for
+every metric, and fetches any set of scalars and groups in batched GETs.
+"""
+
+import asyncio
+import dataclasses
+import typing
+
+from .snmp import snmpRead
+from .convertTools import convert_centiseconds, toFloat
+
+# Named conversions usable in profiles, applied to the value string
+CONVERTERS = {
+    'str': str,
+    'int': int,
+    'float': float,
+    # Values reported in tenths (CyberPower voltages, frequencies, temperatures)
+    'toFloat': toFloat,
+    # TimeTicks to { hours, minutes, seconds, centiseconds }
+    'centiseconds': lambda value: convert_centiseconds(int(value)),
+    # Thousandths (lm-sensors temperatures, fans and voltages)
+    'milli': lambda value: int(value) / 1000.0,
+    # TruthValue style flags where 2 means set (battery needs replacing)
+    'flag2': lambda value: int(value) == 2,
+}
+
+# Python type of the values each named conversion returns, used for snapshot record fields
+CONVERTER_TYPES = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'toFloat': float,
+    'centiseconds': dict,
+    'milli': float,
+    'flag2': bool,
+}
+
+
+class _metricPlan:
+    """
+    A profile metric compiled once per class: OIDs to request and how to decode them
+    """
+
+    __slots__ = ('name', 'kind', 'doc', 'type', 'keys', 'oids', 'decoders', 'columns')
+
+    def __init__(self, name: str, spec: dict):
+        self.name = name
+        self.doc = spec.get('doc')
+        self.keys = []
+        self.oids = []
+        self.decoders = []
+        self.columns = {}
+
+        if 'oid' in spec:
+            self.kind = 'scalar'
+            self.type = _value_type(spec)
+            self.oids.append(spec['oid'])
+            self.decoders.append(_decoder(spec))
+        elif 'group' in spec:
+            self.kind = 'group'
+            self.type = dict
+            for key, item in spec['group'].items():
+                self.keys.append(key)
+                self.oids.append(item['oid'])
+                self.decoders.append(_decoder(item))
+        elif 'table' in spec:
+            self.kind = 'table'
+            self.type = list
+            root = spec['table'].rstrip('.')
+            for key, item in spec['columns'].items():
+                self.keys.append(key)
+                self.columns[key] = f"{root}.{item['column']}"
+                self.decoders.append(_decoder(item))
+        else:
+            raise ValueError(f"profile metric {name!r} needs an 'oid', a 'group' or a 'table'")
+
+    def decode(self, values: list):
+        """
+        Metric value from the raw value strings of its OIDs
+        """
+        if self.kind == 'scalar':
+            return self.decoders[0](values[0])
+        return { key: decode(value) for key, decode, value in zip(self.keys, self.decoders, values) }
+
+    def decode_table(self, table: dict) -> list:
+        """
+        Metric rows from a walked table { index: { key: value } }
+        """
+        if not table:
+            return None
+
+        rows = []
+        for index, values in table.items():
+            row = { 'Index': int(index) if index.isdigit() else index }
+            for key, decode in zip(self.keys, self.decoders):
+                row[key] = decode(values[key])
+            rows.append(row)
+
+        rows.sort(key=lambda x: (isinstance(x['Index'], str), x['Index']))
+        return rows
+
+
+def _decoder(spec: dict):
+    """
+    Function decoding one value string according to its 'convert' / 'enum' spec
+    """
+    convert = spec.get('convert')
+    if isinstance(convert, str):
+        convert = CONVERTERS[convert]
+
+    enum = spec.get('enum')
+    if enum != None:
+        # Resolve every code to its (code, description) tuple up front
+        states = { str(code): (int(code), description) for code, description in enum.items() }
+
+        def decode(value):
+            if not value:
+                return None
+            state = states.get(value)
+            return state if state != None else (int(value), None)
+        return decode
+
+    if convert == None:
+        return lambda value: value
+
+    def decode(value):
+        return convert(value) if value else None
+    return decode
+
+
+def _value_type(spec: dict) -> type:
+    """
+    Python type of a decoded scalar
+    """
+    if spec.get('enum') != None:
+        return tuple
+    convert = spec.get('convert')
+    if convert == None:
+        return str
+    return CONVERTER_TYPES.get(convert, object) if isinstance(convert, str) else object
+
+
+def _profile_metric(name: str, doc: str):
+    """
+    aget_<name>() coroutine fetching one profile metric
+    """
+    async def metric(self):
+        values = await self.fetch_profile([name])
+        return values[name]
+
+    metric.__name__ = 'aget_' + name
+    metric.__qualname__ = 'aget_' + name
+    metric.__doc__ = doc
+    return metric
+
+
+class profileDevice(snmpRead):
+    """
+    Device described by a declarative MIB profile
+
+    Subclasses set PROFILE (see the module docstring) and get aget_<name>() /
+    get_<name> for every metric. Metrics a subclass writes by hand are kept.
+    """
+
+    PROFILE = {}
+    _profile = {}
+
+    # Record returned by snapshot(), one field per scalar and group metric
+    Snapshot = None
+
+    def __init_subclass__(cls, **kwargs):
+        # Compile the profile once per class, extending the profile of the parent class
+        cls._profile = dict(getattr(cls, '_profile', {}))
+        for name, spec in cls.__dict__.get('PROFILE', {}).items():
+            cls._profile[name] = _metricPlan(name, spec)
+
+            if f"aget_{name}" not in vars(cls):
+                setattr(cls, f"aget_{name}", _profile_metric(name, spec.get('doc')))
+
+        cls.Snapshot = dataclasses.make_dataclass(
+            f"{cls.__name__}Snapshot",
+            [
+                (name, typing.Optional[plan.type], dataclasses.field(default=None))
+                for name, plan in cls._profile.items() if plan.kind != 'table'
+            ],
+            frozen=True,
+            slots=True,
+        )
+        cls.Snapshot.__module__ = cls.__module__
+
+        # snmpRead adds the sync properties for the generated coroutines
+        super().__init_subclass__(**kwargs)
+
+    async def fetch_profile(self, names: list = None) -> dict:
+        """
+        Fetch several profile metrics at once, every profile metric by default
+        Scalars and groups share batched GETs, tables are walked concurrently
+        """
+        plans = [self._profile[name] for name in (names if names != None else self._profile)]
+
+        scalars = [plan for plan in plans if plan.kind != 'table']
+        tables = [plan for plan in plans if plan.kind == 'table']
+
+        oids = [oid for plan in scalars for oid in plan.oids]
+        values, *walked = await asyncio.gather(
+            self.run_snmp_get_many(oids),
+            *(self.run_snmp_walk_table(plan.columns) for plan in tables),
+        )
+
+        metrics = {}
+        position = 0
+        for plan in scalars:
+            metrics[plan.name] = plan.decode(values[position:position + len(plan.oids)])
+            position += len(plan.oids)
+
+        for plan, table in zip(tables, walked):
+            metrics[plan.name] = plan.decode_table(table)
+
+        return metrics
+
+    async def asnapshot(self):
+        """
+        Every scalar and group metric of the profile in one batched fetch
+        Returns a Snapshot record, one max_varbinds PDU per 25 OIDs by default
+        """
+        names = [field.name for field in dataclasses.fields(self.Snapshot)]
+        return self.Snapshot(**await self.fetch_profile(names))
+
+    def snapshot(self):
+        """
+        Every scalar and group metric of the profile in one batched fetch, as a Snapshot record
+        """
+        return self.run_sync(self.asnapshot())
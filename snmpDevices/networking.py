@@ -1,568 +1,459 @@
+import asyncio
+
 from .snmp import snmpRead
+from .counterRates import counterRates
+from .ifColumns import ifColumns, require_numpy
+from .inventoryCache import cacheEntry
 from .snmpMibMapping import ( 
     get_iftype_description,
     get_ifOperStatus_description,
     get_ifAdminStatus_description
 )
 
+# ifTable (.1.3.6.1.2.1.2.2.1) and ifXTable (.1.3.6.1.2.1.31.1.1.1) columns by name
+IF_TABLE_COLUMNS = {
+    'descr': '.1.3.6.1.2.1.2.2.1.2',
+    'type': '.1.3.6.1.2.1.2.2.1.3',
+    'mtu': '.1.3.6.1.2.1.2.2.1.4',
+    'speed': '.1.3.6.1.2.1.2.2.1.5',
+    'PhysAddress': '.1.3.6.1.2.1.2.2.1.6',
+    'AdminStatus': '.1.3.6.1.2.1.2.2.1.7',
+    'OperStatus': '.1.3.6.1.2.1.2.2.1.8',
+    'LastChange': '.1.3.6.1.2.1.2.2.1.9',
+    'InOctets': '.1.3.6.1.2.1.2.2.1.10',
+    'InUcastPkts': '.1.3.6.1.2.1.2.2.1.11',
+    'InNUcastPkts': '.1.3.6.1.2.1.2.2.1.12',
+    'InDiscards': '.1.3.6.1.2.1.2.2.1.13',
+    'InErrors': '.1.3.6.1.2.1.2.2.1.14',
+    'InUnknownProtos': '.1.3.6.1.2.1.2.2.1.15',
+    'OutOctets': '.1.3.6.1.2.1.2.2.1.16',
+    'OutUcastPkts': '.1.3.6.1.2.1.2.2.1.17',
+    'OutNUcastPkts': '.1.3.6.1.2.1.2.2.1.18',
+    'OutDiscards': '.1.3.6.1.2.1.2.2.1.19',
+    'OutErrors': '.1.3.6.1.2.1.2.2.1.20',
+    'OutQLen': '.1.3.6.1.2.1.2.2.1.21',
+    'name': '.1.3.6.1.2.1.31.1.1.1.1',
+    'HCInOctets': '.1.3.6.1.2.1.31.1.1.1.6',
+    'HCOutOctets': '.1.3.6.1.2.1.31.1.1.1.10',
+    'HighSpeed': '.1.3.6.1.2.1.31.1.1.1.15',
+    'Alias': '.1.3.6.1.2.1.31.1.1.1.18',
+}
+
+# Columns that describe an interface and rarely change, kept in the interface index cache
+IF_INDEX_COLUMNS = ['descr', 'name', 'type', 'mtu', 'PhysAddress', 'Alias']
+
+# Counter columns of aget_ifRates and their width; the ifXTable 64-bit octet counters replace the 32-bit ones when present
+IF_RATE_COUNTERS = {
+    'InOctets': 32,
+    'OutOctets': 32,
+    'InUcastPkts': 32,
+    'OutUcastPkts': 32,
+    'InDiscards': 32,
+    'OutDiscards': 32,
+    'InErrors': 32,
+    'OutErrors': 32,
+}
+IF_HC_RATE_COUNTERS = { 'HCInOctets': ('InOctets', 64), 'HCOutOctets': ('OutOctets', 64) }
+
+# sysUpTime and ifTableLastChange, used to invalidate the interface index cache
+SYS_UPTIME_OID = '.1.3.6.1.2.1.1.3.0'
+IF_TABLE_LAST_CHANGE_OID = '.1.3.6.1.2.1.31.1.5.0'
+
 class ifaceMetrics(snmpRead):
     """
     Interface Metrics Class ISO/IEC 8802-3 (Ethernet)
     """
 
-    def __init__(self,ip: str,port: int = 161,snmpv: int = 1,community: str = None,user: str = None,authkey: str = None,privkey: str = None):
-        super().__init__(ip, port, snmpv, community, user, authkey, privkey)
-        
-    # Interface Metrics
-    @property
-    def get_ifType(self) -> list[dict]:
-        """
-        Interface Type  (Ethernet, Loopback, etc.)
-        """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+    def __init__(self,ip: str,port: int = 161,snmpv: int = 1,community: str = None,user: str = None,authkey: str = None,privkey: str = None, columnar: bool = False, **kwargs):
+        super().__init__(ip, port, snmpv, community, user, authkey, privkey, **kwargs)
 
-        if not iface_indices:
-            return None
+        # Columnar mode: aget_ifRates returns an ifColumnRates of NumPy arrays instead of one dict per interface
+        if columnar:
+            require_numpy()
+        self.columnar = columnar
+        self._if_columns = None
 
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+        # Interface index cache: ifIndex -> IF_INDEX_COLUMNS, with the sysUpTime / ifTableLastChange it was read at
+        self.if_index_cache = None
+        self._if_index_uptime = None
+        self._if_index_last_change = None
+        # Interface index check / walk in flight, shared by concurrent callers
+        self._if_index_fetch = None
+        self._if_index_waiters = 0
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+        # Last counter samples of aget_ifRates
+        self.counter_rates = counterRates()
 
-            # The type of interface.
-            type = self.get_oid(f"{if_root_oid}.3.{id}")
-            iface['type'] = get_iftype_description(int(type)) if type != None else None
+    async def aget_ifIndex(self) -> dict:
+        """
+        Interface index cache: { ifIndex: { descr, name, type, mtu, PhysAddress, Alias } }
+        The columns are walked again only when ifTableLastChange moves or sysUpTime shows an agent restart
+        With an inventory_cache, the index is kept on disk and a restarted poller reuses it under the same conditions
+        """
+        # Concurrent callers (the interface metrics polled together) share one check and walk of the index
+        fetch = self._if_index_fetch
+        if fetch is None or fetch.done() or fetch.get_loop() is not asyncio.get_running_loop():
+            fetch = self._if_index_fetch = asyncio.ensure_future(self._fetch_ifIndex())
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        self._if_index_waiters += 1
+        try:
+            return await asyncio.shield(fetch)
+        finally:
+            self._if_index_waiters -= 1
+            # Every caller gave up (cancelled), do not leave the walk running on its own
+            if not self._if_index_waiters and not fetch.done():
+                fetch.cancel()
 
-    @property
-    def get_ifMtu(self) -> list[dict]:
+    async def _fetch_ifIndex(self) -> dict:
         """
-        Interface MTU (Maximum Transmission Unit)
+        Check the interface index cache against sysUpTime / ifTableLastChange and walk it again if needed
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        uptime, last_change = await self.run_snmp_get_many([SYS_UPTIME_OID, IF_TABLE_LAST_CHANGE_OID])
 
-        if not iface_indices:
-            return None
+        if self.if_index_cache is None and self.inventory_cache != None and uptime != None:
+            entry = self.inventory_cache.load(self.label, 'ifIndex')
+            if entry != None and entry.data.get('columns') == IF_INDEX_COLUMNS and entry.valid(int(uptime), last_change):
+                self.if_index_cache = entry.data['table']
+                self._if_index_uptime = int(uptime)
+                self._if_index_last_change = last_change
+                return self.if_index_cache
 
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+        if self.if_index_cache is not None:
+            # The agent did not answer, the walk would fail as well
+            if uptime == None:
+                return self.if_index_cache
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+            restarted = self._if_index_uptime == None or int(uptime) < self._if_index_uptime
+            if not restarted and last_change == self._if_index_last_change:
+                return self.if_index_cache
 
-            # The size of the largest packet that can be sent/received on the interface.
-            mtu = self.get_oid(f"{if_root_oid}.4.{id}")
-            iface['mtu'] = int(mtu) if mtu != None else None
+        table = await self.run_snmp_walk_table({ name: IF_TABLE_COLUMNS[name] for name in IF_INDEX_COLUMNS })
 
-            iface_metrics.append(iface)
+        if not table:
+            return self.if_index_cache
 
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        self.if_index_cache = table
+        self._if_index_uptime = int(uptime) if uptime != None else None
+        self._if_index_last_change = last_change
 
-    @property
-    def get_ifSpeed(self) -> list[dict]:
+        if self.inventory_cache != None and uptime != None:
+            self.inventory_cache.save(self.label, 'ifIndex', cacheEntry({ 'columns': IF_INDEX_COLUMNS, 'table': table }, int(uptime), last_change))
+        return table
+
+    def get_ifIndex(self) -> dict:
         """
-        Interface Speed (bits per second)
+        Interface index cache: { ifIndex: { descr, name, type, mtu, PhysAddress, Alias } }
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+        return self.run_sync(self.aget_ifIndex())
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The speed of the interface in bits per second.
-            speed = int(self.get_oid(f"{if_root_oid}.5.{id}"))
-            iface['speed'] = int(speed) if speed != None else None
+    def clear_ifIndex(self) -> None:
+        """
+        Drop the interface index cache, in memory and on disk, the next call walks it again
+        """
+        self.if_index_cache = None
+        self._if_index_uptime = None
+        self._if_index_last_change = None
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        if self.inventory_cache != None:
+            self.inventory_cache.drop(self.label, 'ifIndex')
 
-    @property
-    def get_ifHighSpeed(self) -> list[dict]:
+    # Interface Table
+    async def aget_ifTable(self, columns: list = None) -> list[dict]:
         """
-        Interface Speed (bits per second)
+        Interface table (ifTable / ifXTable)
+        Walks the requested columns of IF_TABLE_COLUMNS side by side and joins them by ifIndex
+        Returns one dict per interface with 'Index' and the raw value of every column
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        columns = list(columns) if columns else list(IF_TABLE_COLUMNS)
 
-        if not iface_indices:
-            return None
+        # Descriptive columns come from the interface index cache, only the others are walked
+        cached = [name for name in columns if name in IF_INDEX_COLUMNS]
+        walked = [name for name in columns if name not in IF_INDEX_COLUMNS]
 
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+        index = await self.aget_ifIndex() if cached else {}
+        table = await self.run_snmp_walk_table({ name: IF_TABLE_COLUMNS[name] for name in walked }) if walked else {}
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+        if not index and not table:
+            return None
 
-            # The speed of the interface in bits per second.
-            speed = int(self.get_oid(f".1.3.6.1.2.1.31.1.1.1.15.{id}"))
-            iface['HighSpeed'] = int(speed) if speed != None else None
+        iface_table = []
+        for id in index.keys() | table.keys():
+            row = dict.fromkeys(columns)
+            if id in index:
+                row.update((name, index[id][name]) for name in cached)
+            if id in table:
+                row.update(table[id])
+            row['Index'] = int(id)
+            iface_table.append(row)
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        iface_table.sort(key=lambda x: x['Index'])
+        return iface_table
 
-    @property
-    def get_ifPhysAddress(self) -> list[dict]:
+    def get_ifTable(self, columns: list = None) -> list[dict]:
         """
-        Interface Physical Address (MAC Address)
+        Interface table (ifTable / ifXTable)
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
+        return self.run_sync(self.aget_ifTable(columns))
 
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+    async def aget_ifRates(self) -> list[dict]:
+        """
+        Interface counter rates per second (octets, unicast packets, discards, errors)
+        Counters are sampled with sysUpTime from the same PDU and handle Counter32 wrap and agent restarts
+        The first poll returns None rates, every later poll the rates since the previous one
+        In columnar mode returns an ifColumnRates (NaN rates on the first poll) with link utilization
+        """
+        if self.columnar:
+            return await self._aifColumnRates()
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+        counters = dict(IF_RATE_COUNTERS)
+        # SNMPv1 has no Counter64
+        if self.snmpv != 0:
+            counters.update((hc_name, bits) for hc_name, (name, bits) in IF_HC_RATE_COUNTERS.items())
 
-            # The interface's address at the protocol layer immediately 'below' the network layer in the protocol stack.
-            PhysAddress = str(self.get_oid(f"{if_root_oid}.6.{id}"))
-            iface['PhysAddress'] = None
-            if PhysAddress:
-                iface['PhysAddress'] = (":".join([PhysAddress[i:i+2] for i in range(0, len(PhysAddress), 2)])).replace("0x:", "")
+        index, table = await asyncio.gather(
+            self.aget_ifIndex(),
+            self.run_snmp_walk_table({ name: IF_TABLE_COLUMNS[name] for name in counters }, stamp=True),
+        )
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        if not table:
+            return None
 
-    @property
-    def get_ifAdminStatus(self) -> list[dict]:
-        """
-        Interface Admin Status (Up, Down)
-        The current operational state of the interface
-        """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        rates = self.counter_rates.table_rates(self.label, table, counters)
 
-        if not iface_indices:
-            return None
+        iface_rates = []
+        for id, rate in rates.items():
+            # Prefer the 64-bit octet counters, 32-bit ones wrap within seconds on fast links
+            for hc_name, (name, bits) in IF_HC_RATE_COUNTERS.items():
+                if table[id].get(hc_name) != None:
+                    rate[name] = rate[hc_name]
+                rate.pop(hc_name, None)
 
-        iface_metrics = []
-        for oid, id in iface_indices:
             iface = {}
             iface['Index'] = int(id)
-
             # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+            iface['descr'] = str(index[id]['descr']) if index and id in index and index[id]['descr'] else None
+            iface.update(rate)
+            iface_rates.append(iface)
 
-            # The current operational state of the interface.
-            AdminStatus = int(self.get_oid(f"{if_root_oid}.7.{id}"))
-            iface['AdminStatus'] = get_ifAdminStatus_description(AdminStatus) if AdminStatus != None else None
+        iface_rates.sort(key=lambda x: x['Index'])
+        return iface_rates
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
-
-    @property
-    def get_ifOperStatus(self) -> list[dict]:
+    async def _aifColumns(self) -> ifColumns:
         """
-        Interface Operational Status (Up, Down)
+        Interface counters as NumPy arrays (ifColumns), sampled with sysUpTime from the same PDU
+        Needs NumPy
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
+        require_numpy()
 
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+        bits = dict(IF_RATE_COUNTERS)
+        # SNMPv1 has no Counter64 and no ifHighSpeed
+        if self.snmpv != 0:
+            bits.update((hc_name, hc_bits) for hc_name, (name, hc_bits) in IF_HC_RATE_COUNTERS.items())
+            speed_name, speed_unit = 'HighSpeed', 1e6
+        else:
+            speed_name, speed_unit = 'speed', 1.0
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+        *rows, speed_rows = await self.run_snmp_walk_raw([IF_TABLE_COLUMNS[name] for name in [*bits, speed_name]], stamp=True)
+        return ifColumns.from_walk(bits, rows, speed_rows, speed_unit)
 
-            # The current operational state of the interface.
-            OperStatus = int(self.get_oid(f"{if_root_oid}.8.{id}"))
-            iface['OperStatus'] = get_ifOperStatus_description(OperStatus) if OperStatus != None else None
+    async def _aifColumnRates(self):
+        """
+        Columnar interface rates since the previous columnar sample
+        """
+        sample = await self._aifColumns()
+        previous, self._if_columns = self._if_columns, sample
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        return sample.rates(previous, { hc_name: name for hc_name, (name, bits) in IF_HC_RATE_COUNTERS.items() })
 
-    @property
-    def get_ifLastChange(self) -> list[dict]:
+    async def _aifMetrics(self, columns: dict) -> list[dict]:
         """
-        Interface Last Change
+        Interface name plus the given columns, converted, for every interface
+        columns maps a column name to the conversion applied to its value
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        iface_table = await self.aget_ifTable(['descr', *columns])
 
-        if not iface_indices:
+        if not iface_table:
             return None
 
         iface_metrics = []
-        for oid, id in iface_indices:
+        for row in iface_table:
             iface = {}
-            iface['Index'] = int(id)
+            iface['Index'] = row['Index']
 
             # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+            iface['descr'] = str(row['descr']) if row['descr'] else None
 
-            # The value of sysUpTime at the time the interface entered its current operational state.
-            LastChange = int(self.get_oid(f"{if_root_oid}.9.{id}"))
-            iface['LastChange'] = LastChange if LastChange != None else None
+            for name, convert in columns.items():
+                iface[name] = convert(row[name]) if row[name] != None else None
 
             iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
+
         return iface_metrics
 
-    @property
-    def get_ifIOOctets(self) -> list[dict]:
+    # Interface Metrics
+    async def aget_ifType(self) -> list[dict]:
         """
-        Interface I/O Octets (Bytes)
+        Interface Type  (Ethernet, Loopback, etc.)
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+        # The type of interface.
+        return await self._aifMetrics({ 'type': lambda type: get_iftype_description(int(type)) })
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The total number of octets received on the interface, including framing characters.
-            InOctets = int(self.get_oid(f"{if_root_oid}.10.{id}"))
-            iface['InOctets'] = int(InOctets) if InOctets != None else None
+    async def aget_ifMtu(self) -> list[dict]:
+        """
+        Interface MTU (Maximum Transmission Unit)
+        """
+        # The size of the largest packet that can be sent/received on the interface.
+        return await self._aifMetrics({ 'mtu': int })
 
-            # The total number of octets transmitted out of the interface, including framing characters.
-            OutOctets = int(self.get_oid(f"{if_root_oid}.16.{id}"))
-            iface['OutOctets'] = int(OutOctets) if OutOctets != None else None
+    async def aget_ifSpeed(self) -> list[dict]:
+        """
+        Interface Speed (bits per second)
+        """
+        # The speed of the interface in bits per second.
+        return await self._aifMetrics({ 'speed': int })
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+    async def aget_ifHighSpeed(self) -> list[dict]:
+        """
+        Interface Speed (bits per second)
+        """
+        # The speed of the interface in units of 1,000,000 bits per second.
+        return await self._aifMetrics({ 'HighSpeed': int })
 
-    @property
-    def get_ifHCIOOctets(self) -> list[dict]:
+    async def aget_ifPhysAddress(self) -> list[dict]:
         """
-        Interface I/O Octets (High Capacity 64bit) (Bytes)
+        Interface Physical Address (MAC Address)
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        # The interface's address at the protocol layer immediately 'below' the network layer in the protocol stack.
+        def mac(PhysAddress: str) -> str:
+            if not PhysAddress:
+                return None
+            return (":".join([PhysAddress[i:i+2] for i in range(0, len(PhysAddress), 2)])).replace("0x:", "")
 
-        if not iface_indices:
-            return None
+        return await self._aifMetrics({ 'PhysAddress': mac })
 
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
+    async def aget_ifAdminStatus(self) -> list[dict]:
+        """
+        Interface Admin Status (Up, Down)
+        The current operational state of the interface
+        """
+        # The desired state of the interface.
+        return await self._aifMetrics({ 'AdminStatus': lambda status: get_ifAdminStatus_description(int(status)) })
 
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
+    async def aget_ifOperStatus(self) -> list[dict]:
+        """
+        Interface Operational Status (Up, Down)
+        """
+        # The current operational state of the interface.
+        return await self._aifMetrics({ 'OperStatus': lambda status: get_ifOperStatus_description(int(status)) })
 
-            # The total number of octets received on the interface, including framing characters.
-            InOctets = int(self.get_oid(f".1.3.6.1.2.1.31.1.1.1.6.{id}"))
-            iface['HCInOctets'] = int(InOctets) if InOctets != None else None
+    async def aget_ifLastChange(self) -> list[dict]:
+        """
+        Interface Last Change
+        """
+        # The value of sysUpTime at the time the interface entered its current operational state.
+        return await self._aifMetrics({ 'LastChange': int })
 
-            # The total number of octets transmitted out of the interface, including framing characters.
-            OutOctets = int(self.get_oid(f".1.3.6.1.2.1.31.1.1.1.10.{id}"))
-            iface['HCOutOctets'] = int(OutOctets) if OutOctets != None else None
+    async def aget_ifIOOctets(self) -> list[dict]:
+        """
+        Interface I/O Octets (Bytes)
+        """
+        # The total number of octets received / transmitted on the interface, including framing characters.
+        return await self._aifMetrics({ 'InOctets': int, 'OutOctets': int })
 
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+    async def aget_ifHCIOOctets(self) -> list[dict]:
+        """
+        Interface I/O Octets (High Capacity 64bit) (Bytes)
+        """
+        # The total number of octets received / transmitted on the interface, including framing characters.
+        return await self._aifMetrics({ 'HCInOctets': int, 'HCOutOctets': int })
 
-    @property
-    def get_ifIOErrors(self) -> list[dict]:
+    async def aget_ifIOErrors(self) -> list[dict]:
         """
         Interface I/O Errors
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The number of inbound packets that contained errors preventing them from being deliverable to a higher-layer protocol.
-            InErrors = int(self.get_oid(f"{if_root_oid}.14.{id}"))
-            iface['InErrors'] = int(InErrors) if InErrors != None else None
-
-            # The number of outbound packets that could not be transmitted because of errors.
-            OutErrors = int(self.get_oid(f"{if_root_oid}.20.{id}"))
-            iface['OutErrors'] = int(OutErrors) if OutErrors != None else None
-
-            iface_metrics.append(iface)
-
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        # The number of inbound packets that contained errors preventing them from being deliverable to a higher-layer protocol.
+        # The number of outbound packets that could not be transmitted because of errors.
+        return await self._aifMetrics({ 'InErrors': int, 'OutErrors': int })
     
-    @property
-    def get_ifIODiscards(self) -> list[dict]:
+    async def aget_ifIODiscards(self) -> list[dict]:
         """
         Interface Discards
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The number of inbound packets which were chosen to be discarded even though no errors had been detected to prevent their being delivered.
-            InDiscards = int(self.get_oid(f"{if_root_oid}.13.{id}"))
-            iface['InDiscards'] = int(InDiscards) if InDiscards != None else None
-
-            # The number of outbound packets which were chosen to be discarded even though no errors had been detected to prevent their being transmitted.
-            OutDiscards = int(self.get_oid(f"{if_root_oid}.19.{id}"))
-            iface['OutDiscards'] = int(OutDiscards) if OutDiscards != None else None
-
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        # The number of inbound / outbound packets which were chosen to be discarded even though no errors had been detected.
+        return await self._aifMetrics({ 'InDiscards': int, 'OutDiscards': int })
 
-    @property
-    def get_ifUnknownProtos(self) -> list[dict]:
+    async def aget_ifUnknownProtos(self) -> list[dict]:
         """
         Interface Unknown Protocols
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
-
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The number of packets received via the interface which were discarded because of an unknown or unsupported protocol.
-            InUnknownProtos = int(self.get_oid(f"{if_root_oid}.15.{id}"))
-            iface['InUnknownProtos'] = int(InUnknownProtos) if InUnknownProtos != None else None
-
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
+        # The number of packets received via the interface which were discarded because of an unknown or unsupported protocol.
+        return await self._aifMetrics({ 'InUnknownProtos': int })
 
-    @property
-    def get_ifNUcastPkts(self) -> list[dict]:
+    async def aget_ifNUcastPkts(self) -> list[dict]:
         """
         Interface Inbound Non-Unicast Packets
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        # The number of non-unicast packets delivered to / requested by a higher (sub-)layer.
+        return await self._aifMetrics({ 'InNUcastPkts': int, 'OutNUcastPkts': int })
 
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The number of packets, delivered by this sub-layer to a higher (sub-)layer, which were addressed to a multicast address at this sub-layer.
-            InNUcastPkts = int(self.get_oid(f"{if_root_oid}.12.{id}"))
-            iface['InNUcastPkts'] = int(InNUcastPkts) if InNUcastPkts != None else None
-
-            # The total number of packets that higher-level protocols requested be transmitted to a sub-layer (i.e., the number of packets passed to the MAC service provider).
-            OutNUcastPkts = int(self.get_oid(f"{if_root_oid}.18.{id}"))
-            iface['OutNUcastPkts'] = int(OutNUcastPkts) if OutNUcastPkts != None else None
-
-            iface_metrics.append(iface)
-
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
-
-    @property
-    def get_ifUcastPkts(self) -> list[dict]:
+    async def aget_ifUcastPkts(self) -> list[dict]:
         """
         Interface Inbound Unicast Packets
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        # The number of unicast packets delivered to / requested by a higher (sub-)layer.
+        return await self._aifMetrics({ 'InUcastPkts': int, 'OutUcastPkts': int })
 
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The number of packets, delivered by this sub-layer to a higher (sub-)layer, which were not addressed to a multicast or broadcast address at this sub-layer.
-            InUcastPkts = int(self.get_oid(f"{if_root_oid}.11.{id}"))
-            iface['InUcastPkts'] = int(InUcastPkts) if InUcastPkts != None else None
-            
-            # The total number of packets that higher-level protocols requested be transmitted to a sub-layer (i.e., the number of packets passed to the MAC service provider).
-            OutUcastPkts = int(self.get_oid(f"{if_root_oid}.17.{id}"))
-            iface['OutUcastPkts'] = int(OutUcastPkts) if OutUcastPkts != None else None
-
-            iface_metrics.append(iface)
-
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
-
-    @property
-    def get_ifOutQLen(self) -> list[dict]:
+    async def aget_ifOutQLen(self) -> list[dict]:
         """
         The length of the output packet queue (in packets).
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        # The length of the output packet queue (in packets).
+        return await self._aifMetrics({ 'OutQLen': int })
 
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The length of the output packet queue (in packets).
-            OutQLen = int(self.get_oid(f"{if_root_oid}.21.{id}"))
-            iface['OutQLen'] = int(OutQLen) if OutQLen != None else None
-
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
-
-    @property
-    def get_ifAlias(self) -> list[dict]:
+    async def aget_ifAlias(self) -> list[dict]:
         """
         Interface Alias (Description)
         """
-        if_root_oid = ".1.3.6.1.2.1.2.2.1"
-        iface_indices = self.walk_oid(f"{if_root_oid}.1")
+        # The alias name of the interface as specified by a network manager.
+        return await self._aifMetrics({ 'Alias': str })
 
-        if not iface_indices:
-            return None
-
-        iface_metrics = []
-        for oid, id in iface_indices:
-            iface = {}
-            iface['Index'] = int(id)
-
-            # The name of the interface.
-            descr = self.get_oid(f"{if_root_oid}.2.{id}")
-            iface['descr'] = str(descr) if descr else None
-
-            # The length of the output packet queue (in packets).
-            if_alias = str(self.get_oid(f".1.3.6.1.2.1.31.1.1.1.18.{id}"))
-            iface['Alias'] = str(if_alias) if if_alias != None else None
-
-            iface_metrics.append(iface)
-        
-        iface_metrics.sort(key=lambda x: x['Index'])
-        return iface_metrics
-
-    @property
-    def get_ifIPAddress(self) -> list[dict]:
+    async def aget_ifIPAddress(self) -> list[dict]:
         """
         Interface IP Address and Netmask
         """
-        # The index value which uniquely identifies the interface to which this entry is applicable.
-        ipAdEntIfIndex_oid = "1.3.6.1.2.1.4.20.1.2"
-        ipAdEntIfIndex = self.walk_oid(ipAdEntIfIndex_oid)
+        ipAdEnt_oid = "1.3.6.1.2.1.4.20.1"
+        ipAdEnt = await self.run_snmp_walk_table({
+            # The index value which uniquely identifies the interface to which this entry is applicable.
+            'IfIndex': f"{ipAdEnt_oid}.2",
+            # The subnet mask associated with the IP address of this entry.
+            'NetMask': f"{ipAdEnt_oid}.3",
+        })
 
-        if not ipAdEntIfIndex:
+        if not ipAdEnt:
             return None
 
+        # The name of every interface that has an address, in one request
+        if_indices = sorted({ int(row['IfIndex']) for row in ipAdEnt.values() if row['IfIndex'] != None })
+        descrs = dict(zip(if_indices, await self.run_snmp_get_rows(".1.3.6.1.2.1.2.2.1", if_indices, [2])))
+
         ipaddr_list = []
-        ipAdEntNetMask_oid = "1.3.6.1.2.1.4.20.1.3"
-        for ip in ipAdEntIfIndex:
-            
+        for address, row in ipAdEnt.items():
+            if row['IfIndex'] == None:
+                continue
+
             ipaddr = {}
             # The index value which uniquely identifies the interface to which this entry is applicable.
-            ipaddr['Index'] = int(ip[1])
+            ipaddr['Index'] = int(row['IfIndex'])
             # The name of the interface.
-            descr = self.get_oid(f".1.3.6.1.2.1.2.2.1.2.{ipaddr['Index']}")
+            descr = descrs[ipaddr['Index']][0]
             ipaddr['descr'] = str(descr) if descr != None else None
             # The IP address to which this entry's information pertains.
-            ipaddr['ipAddress'] = str(ip[0][len(ipAdEntIfIndex_oid)+1:]) if ip[0] != None else None
+            ipaddr['ipAddress'] = str(address)
             # The subnet mask associated with the IP address of this entry.
-            ipaddr['netmask'] = str(self.get_oid(f"{ipAdEntNetMask_oid}.{ipaddr['ipAddress']}")) if ipaddr['ipAddress'] != None else None
+            ipaddr['netmask'] = str(row['NetMask'])
 
             ipaddr_list.append(ipaddr)
 
         # Sort by interface index
         ipaddr_list.sort(key=lambda x: x['Index'])
-        return ipaddr_list
\ No newline at end of file
+        return ipaddr_list
@@ -0,0 +1,51 @@
+from functools import lru_cache
+
+
+class Oid(tuple):
+    """
+    SNMP object identifier as a tuple of ints
+
+    Tuple comparison is the lexicographic OID order used by GETNEXT / GETBULK,
+    and prefix checks compare whole sub-identifiers, so 1.3.6.1.2.1.2.2.1.1 is
+    not a prefix of 1.3.6.1.2.1.2.2.1.10.1.
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def parse(oid: 'str | tuple') -> 'Oid':
+        """
+        Oid from a dotted string (with or without the leading dot) or a sequence of ints
+        Parsed strings are interned, so repeated column / table OIDs are parsed once
+        """
+        if isinstance(oid, Oid):
+            return oid
+        if isinstance(oid, str):
+            return _parse(oid)
+        # pysnmp ObjectName
+        if hasattr(oid, 'asTuple'):
+            return Oid(oid.asTuple())
+        return Oid(oid)
+
+    def startswith(self, prefix: 'Oid') -> bool:
+        """
+        True if prefix is this OID or one of its ancestors
+        """
+        return len(self) >= len(prefix) and self[:len(prefix)] == prefix
+
+    def suffix(self, prefix: 'Oid') -> 'Oid':
+        """
+        Sub-identifiers following prefix, the row index of a table column OID
+        """
+        return Oid(self[len(prefix):])
+
+    def __str__(self) -> str:
+        return '.'.join(map(str, self))
+
+    def __repr__(self) -> str:
+        return f"Oid('{self}')"
+
+
+@lru_cache(maxsize=65536)
+def _parse(oid: str) -> Oid:
+    return Oid(int(part) for part in oid.strip('.').split('.') if part)
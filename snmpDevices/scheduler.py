@@ -0,0 +1,220 @@
+"""
+Multi-rate polling of a fleet: every metric group on its own interval
+
+Counters are worth reading every few seconds, while the description of a
+device (interface types, MAC addresses, model, serial number) rarely
+changes. pollScheduler polls each group of metrics at its own interval:
+
+    scheduler = pollScheduler(inventory, groups={
+        'counters': (5, ['ifHCIOOctets', 'loadPercentage']),
+        'inventory': (3600, ['ifType', 'ifPhysAddress', 'ifMtu', 'model', 'serialNumber', 'powerRating']),
+    }, default_interval=60)
+    async for result in scheduler.run():
+        print(result['name'], result['groups'], result['metrics'])
+
+Metrics of a device that fall due together (within window seconds) are polled
+in one go, with request coalescing on (see snmpRead coalesce) so their GETs and
+column walks share PDUs. Every device starts at a random offset within its
+shortest interval, which spreads the requests of the fleet over time instead of
+sending them in one UDP burst per tick. A group still being polled when it
+falls due again skips that tick.
+"""
+
+import asyncio
+import heapq
+import random
+
+from .fleet import FleetPoller
+
+# Metrics describing a device rather than measuring it, polled every INVENTORY_INTERVAL by default
+INVENTORY_METRICS = [
+    'ifIndex', 'ifType', 'ifMtu', 'ifSpeed', 'ifHighSpeed', 'ifPhysAddress', 'ifAlias', 'ifIPAddress',
+    'model', 'serialNumber', 'powerRating', 'name', 'hostName', 'contact', 'location', 'ObjectID', 'macAddress',
+]
+INVENTORY_INTERVAL = 3600.0
+
+DEFAULT_GROUPS = { 'inventory': (INVENTORY_INTERVAL, INVENTORY_METRICS) }
+
+
+class _deviceSchedule:
+    """
+    Due times of the metric groups of one device
+
+    groups      { group: (interval, metrics, ticks) }, the group is next due at origin + ticks * interval
+    running     groups being polled
+    """
+
+    __slots__ = ('name', 'device', 'origin', 'groups', 'running')
+
+    def __init__(self, name: str, device, origin: float, groups: dict):
+        self.name = name
+        self.device = device
+        self.origin = origin
+        self.groups = groups
+        self.running = set()
+
+    def due(self, group: str) -> float:
+        interval, metrics, ticks = self.groups[group]
+        return self.origin + ticks * interval
+
+    def next_due(self) -> float:
+        return min(self.due(group) for group in self.groups)
+
+
+class pollScheduler:
+    """
+    Poll the metric groups of every device of an inventory at their own interval
+
+    inventory, max_in_flight, per_device, store, sinks and the request options are those of
+    FleetPoller (single process only).
+
+    groups              { group name: (interval in seconds, [metric names]) }
+    default_interval    interval of the metrics of a device that are in no group (group 'default')
+    jitter              fraction of its shortest interval over which the start of each device is spread
+    window              seconds within which groups of a device falling due are polled together
+    seed                seed of the start offsets, for reproducible schedules
+
+    run() yields the FleetPoller result of every poll, with 'groups' listing the groups it covered.
+
+    skipped     ticks skipped because the previous poll of the group had not finished
+    """
+
+    def __init__(self, inventory: list, groups: dict = None, default_interval: float = 60.0, jitter: float = 1.0, window: float = 0.1, seed: int = None, max_in_flight: int = 500, per_device: int = 2, share_engine: bool = True, store=None, sinks: list = None, **options):
+        self.poller = FleetPoller(inventory, max_in_flight, per_device, share_engine, store=store, sinks=sinks, **options)
+        self.groups = dict(DEFAULT_GROUPS if groups == None else groups)
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.window = window
+        self.rng = random.Random(seed)
+        self.skipped = 0
+
+        for group, (interval, metrics) in self.groups.items():
+            if interval <= 0:
+                raise ValueError(f"interval of group {group!r} must be positive")
+
+        # Metric -> group, the first group naming a metric wins
+        self._metric_groups = {}
+        for group, (interval, metrics) in self.groups.items():
+            for metric in metrics:
+                self._metric_groups.setdefault(metric, group)
+
+        self.schedules = []
+        for name, device, metrics in self.poller.devices:
+            # Metrics due at the same time share their PDUs
+            device.coalesce = True
+            self.schedules.append(_deviceSchedule(name, device, 0.0, self._device_groups(metrics)))
+
+    def _device_groups(self, metrics: list) -> dict:
+        """
+        { group: (interval, metrics, ticks) } of the metrics of one device
+        """
+        groups = {}
+        for metric in metrics:
+            group = self._metric_groups.get(metric, 'default')
+            interval = self.groups[group][0] if group != 'default' else self.default_interval
+            groups.setdefault(group, (interval, [], 0))[1].append(metric)
+        return groups
+
+    async def run(self, duration: float = None):
+        """
+        Poll on schedule, yielding results as polls complete, for duration seconds or until cancelled
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + duration if duration != None else None
+
+        # Every device starts at its own offset, a fraction of its shortest interval
+        heap = []
+        for position, schedule in enumerate(self.schedules):
+            if not schedule.groups:
+                continue
+            shortest = min(interval for interval, metrics, ticks in schedule.groups.values())
+            schedule.origin = started + self.rng.uniform(0, self.jitter * shortest)
+            schedule.groups = { group: (interval, metrics, 0) for group, (interval, metrics, ticks) in schedule.groups.items() }
+            heapq.heappush(heap, (schedule.origin, position))
+
+        # Semaphores bind to the running loop, so they are created per run
+        in_flight = asyncio.Semaphore(self.poller.max_in_flight)
+        for schedule in self.schedules:
+            schedule.device.request_limits = (asyncio.Semaphore(self.poller.per_device), in_flight)
+
+        results = asyncio.Queue()
+        tasks = set()
+        try:
+            while heap:
+                due, position = heap[0]
+                if deadline != None and due >= deadline:
+                    break
+
+                # Hand over the results of the polls that completed while waiting
+                delay = due - loop.time()
+                while delay > 0:
+                    try:
+                        result = await asyncio.wait_for(results.get(), delay)
+                    except asyncio.TimeoutError:
+                        break
+                    await self.poller._publish(result)
+                    yield result
+                    delay = due - loop.time()
+
+                heapq.heappop(heap)
+                schedule = self.schedules[position]
+                task = self._start(schedule, due, loop.time(), results)
+                if task != None:
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                heapq.heappush(heap, (schedule.next_due(), position))
+
+            # The schedule is over, wait for the polls in flight
+            while tasks or not results.empty():
+                if results.empty():
+                    await asyncio.wait(set(tasks), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                result = results.get_nowait()
+                await self.poller._publish(result)
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _start(self, schedule: _deviceSchedule, due: float, now: float, results: asyncio.Queue) -> asyncio.Task:
+        """
+        Start the poll of the groups of a device due by due + window and move them to their next tick
+        """
+        groups = []
+        for group, (interval, metrics, ticks) in schedule.groups.items():
+            if schedule.due(group) > due + self.window:
+                continue
+
+            # Late ticks (a slow event loop) are dropped rather than polled in a burst
+            next_ticks = max(ticks + 1, int((now - schedule.origin) // interval) + 1)
+            schedule.groups[group] = (interval, metrics, next_ticks)
+
+            if group in schedule.running:
+                self.skipped += 1
+            else:
+                groups.append(group)
+
+        if not groups:
+            return None
+
+        metrics = [metric for group in groups for metric in schedule.groups[group][1]]
+        schedule.running.update(groups)
+        return asyncio.create_task(self._poll(schedule, groups, metrics, results))
+
+    async def _poll(self, schedule: _deviceSchedule, groups: list, metrics: list, results: asyncio.Queue) -> None:
+        """
+        Poll metrics of one device and queue the result
+        """
+        try:
+            result = await self.poller._poll_device(schedule.name, schedule.device, metrics)
+            result['groups'] = groups
+            results.put_nowait(result)
+        finally:
+            schedule.running.difference_update(groups)
+
+    async def close(self) -> None:
+        """
+        Close the SNMP engines of every device
+        """
+        await self.poller.close()
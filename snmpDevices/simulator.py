@@ -0,0 +1,487 @@
+"""
+Local SNMP agent simulator replaying recorded walks
+
+Every simulated agent is a UDP endpoint answering GET, GETNEXT and GETBULK
+(SNMPv1 / v2c) from a recorded walk, with optional per-request latency,
+packet loss and a response size limit. Agents started from the same walk
+share its parsed OID table, so thousands of them fit on one event loop,
+each on its own localhost port.
+
+Walk files are either snmpsim .snmprec records (oid|tag|value, written by
+record_walk()) or the output of `snmpwalk -On`.
+
+    python3 -m snmpDevices.simulator snmpDevices/walks/net-snmp-host.snmprec --port 16161 --count 1000 --latency 0.002 --loss 0.01
+"""
+
+import argparse
+import asyncio
+from bisect import bisect_right
+import random
+import re
+import time
+
+from pyasn1.codec.ber import decoder, encoder
+from pyasn1.type import tag
+from pysnmp.proto import api, rfc1902, rfc1905
+
+from .oid import Oid
+
+# sysUpTime.0, answered from the agent clock when live_uptime is set
+SYS_UPTIME_INSTANCE = Oid.parse('1.3.6.1.2.1.1.3.0')
+
+# snmprec type tags (BER tag numbers, application types offset by 64)
+SNMPREC_TYPES = {
+    2: rfc1902.Integer32,
+    4: rfc1902.OctetString,
+    5: rfc1902.Null,
+    6: rfc1902.ObjectName,
+    64: rfc1902.IpAddress,
+    65: rfc1902.Counter32,
+    66: rfc1902.Gauge32,
+    67: rfc1902.TimeTicks,
+    68: rfc1902.Opaque,
+    70: rfc1902.Counter64,
+}
+
+# snmpwalk -On types
+SNMPWALK_TYPES = {
+    'STRING': rfc1902.OctetString,
+    'Hex-STRING': rfc1902.OctetString,
+    'INTEGER': rfc1902.Integer32,
+    'OID': rfc1902.ObjectName,
+    'IpAddress': rfc1902.IpAddress,
+    'Network Address': rfc1902.IpAddress,
+    'Counter32': rfc1902.Counter32,
+    'Gauge32': rfc1902.Gauge32,
+    'Timeticks': rfc1902.TimeTicks,
+    'Counter64': rfc1902.Counter64,
+    'Opaque': rfc1902.Opaque,
+}
+
+_snmpwalk_line = re.compile(r'^\.?(\d+(?:\.\d+)*) = (?:([A-Za-z0-9 -]+?): )?(.*)$')
+_number = re.compile(r'-?\d+')
+
+
+def _snmpwalk_value(type_name: str, text: str):
+    """
+    pysnmp value of one snmpwalk -On value
+    """
+    # snmpwalk prints an empty string without a type
+    if type_name == None:
+        return rfc1902.OctetString(text.strip('"'))
+
+    cls = SNMPWALK_TYPES.get(type_name)
+    if cls == None:
+        raise ValueError(f"unsupported snmpwalk type {type_name!r}")
+
+    if type_name == 'Hex-STRING':
+        return cls(bytes.fromhex(text.replace(' ', '')))
+    if cls is rfc1902.OctetString:
+        # A multi-line string only closes its quote on the last line
+        return cls(text[1:].removesuffix('"') if text.startswith('"') else text)
+    if cls is rfc1902.ObjectName:
+        return cls(text.lstrip('.'))
+    if cls is rfc1902.IpAddress:
+        return cls(text.split()[0])
+    if cls is rfc1902.TimeTicks:
+        # Timeticks: (123456) 0:20:34.56
+        return cls(int(text[text.index('(') + 1:text.index(')')]) if '(' in text else int(text.split()[0]))
+    # INTEGER: up(1) / INTEGER: 42 kB
+    enum = re.search(r'\((-?\d+)\)', text)
+    return cls(int(enum.group(1)) if enum else int(_number.search(text).group()))
+
+
+def _snmprec_value(tag_text: str, text: str):
+    """
+    pysnmp value of one snmprec tag and value (tags ending in x hold hex encoded values)
+    """
+    hex_encoded = tag_text.endswith('x')
+    cls = SNMPREC_TYPES.get(int(tag_text.rstrip('x')))
+    if cls == None:
+        raise ValueError(f"unsupported snmprec tag {tag_text!r}")
+
+    if hex_encoded:
+        data = bytes.fromhex(text)
+        return cls(data) if cls in (rfc1902.OctetString, rfc1902.Opaque, rfc1902.IpAddress) else cls(data.decode())
+    if cls is rfc1902.Null:
+        return cls('')
+    if cls in (rfc1902.OctetString, rfc1902.Opaque, rfc1902.ObjectName, rfc1902.IpAddress):
+        return cls(text)
+    return cls(int(text))
+
+
+class walkData:
+    """
+    Recorded OID values of one agent, searchable in OID order
+
+    values      { Oid: pysnmp value }
+    oids        every Oid, sorted
+    """
+
+    __slots__ = ('values', 'oids', 'uptime')
+
+    def __init__(self, values: dict):
+        self.values = values
+        self.oids = sorted(values)
+        # Recorded sysUpTime, the start of the simulated clock
+        uptime = values.get(SYS_UPTIME_INSTANCE)
+        self.uptime = int(uptime) if uptime != None else 0
+
+    def __len__(self) -> int:
+        return len(self.oids)
+
+    @classmethod
+    def load(cls, path: str) -> 'walkData':
+        """
+        Read a .snmprec file or snmpwalk -On output
+        """
+        values = {}
+        last = None
+        with open(path, encoding='utf-8', errors='replace') as walk:
+            for number, line in enumerate(walk, 1):
+                line = line.rstrip('\r\n')
+                if not line or line.startswith('#'):
+                    continue
+
+                try:
+                    match = _snmpwalk_line.match(line)
+                    if match:
+                        oid, type_name, text = match.groups()
+                        last = Oid.parse(oid)
+                        values[last] = _snmpwalk_value(type_name, text)
+                    elif '|' in line and not line.startswith(' '):
+                        oid, tag_text, text = line.split('|', 2)
+                        last = Oid.parse(oid.lstrip('.'))
+                        values[last] = _snmprec_value(tag_text, text)
+                    elif last != None and isinstance(values[last], rfc1902.OctetString):
+                        # Continuation of a multi-line snmpwalk string
+                        text = bytes(values[last]).decode(errors='replace')
+                        values[last] = rfc1902.OctetString((text + '\n' + line).removesuffix('"'))
+                    else:
+                        raise ValueError("not a walk record")
+                except (ValueError, IndexError) as e:
+                    raise ValueError(f"{path}:{number}: {e}: {line!r}") from None
+
+        return cls(values)
+
+    def next(self, oid: tuple, skip_counter64: bool = False) -> Oid:
+        """
+        First recorded Oid after oid, None at the end of the walk
+        SNMPv1 has no Counter64, its GETNEXT skips them
+        """
+        i = bisect_right(self.oids, oid)
+        if skip_counter64:
+            while i < len(self.oids) and isinstance(self.values[self.oids[i]], rfc1902.Counter64):
+                i += 1
+        return self.oids[i] if i < len(self.oids) else None
+
+
+def _snmprec_record(oid, value) -> str:
+    """
+    snmprec line of one walked value
+    """
+    # The outermost tag, application types are implicitly tagged universal ones
+    outer = value.tagSet[-1]
+    number = outer.tagId + (64 if outer.tagClass == tag.tagClassApplication else 0)
+
+    # OCTET STRING and Opaque, as text where it is printable
+    if number in (4, 68):
+        data = bytes(value)
+        try:
+            text = data.decode('ascii')
+            if text.isprintable() and '|' not in text:
+                return f"{oid}|{number}|{text}"
+        except UnicodeDecodeError:
+            pass
+        return f"{oid}|{number}x|{data.hex()}"
+
+    # OBJECT IDENTIFIER and IpAddress
+    if number in (6, 64):
+        return f"{oid}|{number}|{value.prettyPrint()}"
+    return f"{oid}|{number}|{int(value)}"
+
+
+async def record_walk(device, path: str, root: str = '1.3.6.1') -> int:
+    """
+    Walk a device (snmpRead) from root and save it as a .snmprec file, returns the number of records
+    """
+    column, = await device.run_snmp_walk_raw([root])
+    with open(path, 'w', encoding='utf-8') as walk:
+        for oid, value, ticks in column:
+            walk.write(_snmprec_record(oid, value) + '\n')
+    return len(column)
+
+
+class simulatedAgent(asyncio.DatagramProtocol):
+    """
+    SNMPv1 / v2c agent answering from a walkData
+
+    community       community accepted, None to answer any
+    latency         seconds every response is delayed
+    jitter          random extra delay, uniform in 0 .. jitter seconds
+    loss            probability a request is dropped without a response
+    max_size        largest response in bytes: GETBULK responses are cut to fit,
+                    GET / GETNEXT answer tooBig
+    live_uptime     sysUpTime.0 advances from its recorded value, otherwise it stays recorded
+
+    stats counts requests, responses, dropped, malformed, tooBig, bytes_in, bytes_out and each PDU type.
+    """
+
+    def __init__(self, walk: walkData, community: str = None, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0, max_size: int = None, live_uptime: bool = True, rng: random.Random = None):
+        self.walk = walk
+        self.community = community.encode() if community != None else None
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.max_size = max_size
+        self.live_uptime = live_uptime
+        self.rng = rng or random.Random()
+
+        self.stats = dict.fromkeys(('requests', 'responses', 'dropped', 'malformed', 'tooBig', 'bytes_in', 'bytes_out', 'get', 'getnext', 'getbulk'), 0)
+        self.transport = None
+        self.started = time.monotonic()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+        self.started = time.monotonic()
+
+    def close(self) -> None:
+        if self.transport != None:
+            self.transport.close()
+
+    def _value(self, oid: Oid):
+        if self.live_uptime and oid == SYS_UPTIME_INSTANCE:
+            return rfc1902.TimeTicks((self.walk.uptime + int((time.monotonic() - self.started) * 100)) % 2**32)
+        return self.walk.values[oid]
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.stats['requests'] += 1
+        self.stats['bytes_in'] += len(data)
+
+        if self.loss and self.rng.random() < self.loss:
+            self.stats['dropped'] += 1
+            return
+
+        try:
+            response = self.respond(data)
+        except Exception:
+            # Not an SNMPv1 / v2c request we can decode
+            self.stats['malformed'] += 1
+            return
+        if response == None:
+            self.stats['dropped'] += 1
+            return
+
+        self.stats['responses'] += 1
+        self.stats['bytes_out'] += len(response)
+
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._sendto, response, addr)
+        else:
+            self.transport.sendto(response, addr)
+
+    def _sendto(self, response: bytes, addr) -> None:
+        if not self.transport.is_closing():
+            self.transport.sendto(response, addr)
+
+    def respond(self, data: bytes) -> bytes:
+        """
+        Encoded response to one request message, None if it is not answered
+        """
+        version = int(api.decodeMessageVersion(data))
+        proto = api.PROTOCOL_MODULES[version]
+        message, rest = decoder.decode(data, asn1Spec=proto.Message())
+
+        # Real agents silently ignore a wrong community
+        if self.community != None and bytes(proto.apiMessage.get_community(message)) != self.community:
+            return None
+
+        request = proto.apiMessage.get_pdu(message)
+        response = proto.apiMessage.get_response(message)
+        pdu = proto.apiMessage.get_pdu(response)
+        varbinds = proto.apiPDU.get_varbinds(request)
+        v1 = version == api.SNMP_VERSION_1
+
+        if request.isSameTypeWith(proto.GetRequestPDU()):
+            self.stats['get'] += 1
+            out = []
+            for position, (name, value) in enumerate(varbinds):
+                oid = Oid(name.asTuple())
+                if oid in self.walk.values and not (v1 and isinstance(self.walk.values[oid], rfc1902.Counter64)):
+                    out.append((name, self._value(oid)))
+                elif v1:
+                    return self._error(proto, response, pdu, 'noSuchName', position + 1, varbinds)
+                else:
+                    out.append((name, rfc1905.noSuchObject))
+
+        elif request.isSameTypeWith(proto.GetNextRequestPDU()):
+            self.stats['getnext'] += 1
+            out = []
+            for position, (name, value) in enumerate(varbinds):
+                oid = self.walk.next(name.asTuple(), v1)
+                if oid != None:
+                    out.append((oid, self._value(oid)))
+                elif v1:
+                    return self._error(proto, response, pdu, 'noSuchName', position + 1, varbinds)
+                else:
+                    out.append((name, rfc1905.endOfMibView))
+
+        elif not v1 and request.isSameTypeWith(proto.GetBulkRequestPDU()):
+            self.stats['getbulk'] += 1
+            non_repeaters = max(0, int(proto.apiBulkPDU.get_non_repeaters(request)))
+            repetitions = max(0, int(proto.apiBulkPDU.get_max_repetitions(request)))
+
+            out = []
+            for name, value in varbinds[:non_repeaters]:
+                oid = self.walk.next(name.asTuple())
+                out.append((oid, self._value(oid)) if oid != None else (name, rfc1905.endOfMibView))
+
+            names = [name for name, value in varbinds[non_repeaters:]]
+            current = [name.asTuple() for name in names]
+            for repetition in range(repetitions if current else 0):
+                for j, name in enumerate(names):
+                    oid = self.walk.next(current[j]) if current[j] != None else None
+                    if oid == None:
+                        out.append((name, rfc1905.endOfMibView))
+                        current[j] = None
+                    else:
+                        out.append((oid, self._value(oid)))
+                        current[j] = oid
+                if all(oid == None for oid in current):
+                    break
+
+            return self._fit(proto, response, pdu, out, non_repeaters)
+
+        else:
+            return None
+
+        proto.apiPDU.set_varbinds(pdu, out)
+        encoded = encoder.encode(response)
+        if self.max_size != None and len(encoded) > self.max_size:
+            self.stats['tooBig'] += 1
+            return self._error(proto, response, pdu, 'tooBig', 0, varbinds)
+        return encoded
+
+    def _error(self, proto, response, pdu, status: str, index: int, varbinds) -> bytes:
+        """
+        Encoded error response carrying the request varbinds
+        """
+        proto.apiPDU.set_error_status(pdu, {'tooBig': 1, 'noSuchName': 2}[status])
+        proto.apiPDU.set_error_index(pdu, index)
+        proto.apiPDU.set_varbinds(pdu, varbinds)
+        return encoder.encode(response)
+
+    def _fit(self, proto, response, pdu, out: list, keep: int) -> bytes:
+        """
+        Encoded GETBULK response, trailing varbinds dropped until it fits in max_size
+        """
+        proto.apiPDU.set_varbinds(pdu, out)
+        encoded = encoder.encode(response)
+        if self.max_size == None or len(encoded) <= self.max_size:
+            return encoded
+
+        self.stats['tooBig'] += 1
+        count = len(out)
+        while count > keep:
+            # Guess from the average varbind size, then step down one at a time
+            count = min(count - 1, max(keep, int(count * self.max_size / len(encoded))))
+            proto.apiPDU.set_varbinds(pdu, out[:count])
+            encoded = encoder.encode(response)
+            if len(encoded) <= self.max_size:
+                return encoded
+
+        return self._error(proto, response, pdu, 'tooBig', 0, out[:keep])
+
+
+async def start_agents(walk, count: int = 1, port: int = 16161, host: str = '127.0.0.1', seed: int = None, **options) -> list[simulatedAgent]:
+    """
+    Start count agents replaying walk (a walkData or a walk file) on ports port .. port + count - 1
+    options are passed to simulatedAgent; every agent shares the parsed walk
+
+    Each agent holds one socket, raise the open files limit (ulimit -n) for thousands of agents.
+    """
+    if not isinstance(walk, walkData):
+        walk = walkData.load(walk)
+
+    loop = asyncio.get_running_loop()
+    agents = []
+    try:
+        for i in range(count):
+            rng = random.Random(seed + i) if seed != None else None
+            transport, agent = await loop.create_datagram_endpoint(
+                lambda rng=rng: simulatedAgent(walk, rng=rng, **options),
+                local_addr=(host, port + i),
+            )
+            agents.append(agent)
+    except OSError:
+        for agent in agents:
+            agent.close()
+        raise
+
+    return agents
+
+
+def total_stats(agents: list) -> dict:
+    """
+    stats summed over agents
+    """
+    totals = {}
+    for agent in agents:
+        for key, value in agent.stats.items():
+            totals[key] = totals.get(key, 0) + value
+    return totals
+
+
+def _raise_open_files_limit() -> None:
+    """
+    Raise the soft open files limit to the hard limit where the platform allows it
+    """
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(prog='python3 -m snmpDevices.simulator', description="Serve recorded SNMP walks from simulated agents")
+    parser.add_argument('walk', help=".snmprec file or snmpwalk -On output")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=16161, help="port of the first agent")
+    parser.add_argument('--count', type=int, default=1, help="agents on consecutive ports")
+    parser.add_argument('--community', default=None, help="accepted community, any if not set")
+    parser.add_argument('--latency', type=float, default=0.0, help="response delay in seconds")
+    parser.add_argument('--jitter', type=float, default=0.0, help="random extra delay in seconds")
+    parser.add_argument('--loss', type=float, default=0.0, help="probability a request is dropped")
+    parser.add_argument('--max-size', type=int, default=None, help="largest response in bytes (tooBig)")
+    parser.add_argument('--static-uptime', action='store_true', help="answer the recorded sysUpTime")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the loss and jitter draws")
+    args = parser.parse_args(argv)
+
+    _raise_open_files_limit()
+
+    async def serve():
+        agents = await start_agents(
+            args.walk, args.count, args.port, args.host, seed=args.seed,
+            community=args.community, latency=args.latency, jitter=args.jitter, loss=args.loss,
+            max_size=args.max_size, live_uptime=not args.static_uptime,
+        )
+        print(f"{len(agents)} agents serving {len(agents[0].walk)} OIDs on {args.host}:{args.port}-{args.port + len(agents) - 1}", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            print(total_stats(agents), flush=True)
+            for agent in agents:
+                agent.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""
+Batched output sinks for poll results
+
+A sink serializes each FleetPoller result as it is written (Influx line
+protocol or JSON Lines) into a bounded queue; a background task drains the
+queue into batches, flushed by size or age, and sends them over a transport
+(file, TCP socket or HTTP endpoint). When the queue is full, write() waits,
+which slows the poller down instead of growing memory.
+"""
+
+import asyncio
+import dataclasses
+import json
+import logging
+import math
+import re
+from abc import ABC, abstractmethod
+from urllib.parse import urlsplit
+
+logger = logging.getLogger('snmpDevices')
+
+# Line breaks end a line protocol line, in tags and string fields they are replaced by a space
+_line_breaks = re.compile(r'[\r\n]+')
+
+
+def _escape_tag(value) -> str:
+    """
+    Escape a line protocol measurement, tag key / value or field key
+    """
+    return _line_breaks.sub(' ', str(value)).replace('\\', '\\\\').replace(',', '\\,').replace('=', '\\=').replace(' ', '\\ ')
+
+
+def _field_value(value) -> str:
+    """
+    Line protocol field value, None for values that cannot be written
+    """
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f"{value}i"
+    if isinstance(value, float):
+        return repr(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        return '"' + _line_breaks.sub(' ', value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+    # Enum metrics are (code, description)
+    if isinstance(value, tuple) and value and isinstance(value[0], int):
+        return f"{value[0]}i"
+    return None
+
+
+def _fields(values: dict, prefix: str = '') -> list[str]:
+    """
+    key=value pairs of a dict, nested dicts flattened as parent_child
+    """
+    fields = []
+    for key, value in values.items():
+        if key == 'Index':
+            continue
+        if isinstance(value, dict):
+            fields.extend(_fields(value, f"{prefix}{key}_"))
+            continue
+        encoded = _field_value(value)
+        if encoded != None:
+            fields.append(f"{_escape_tag(prefix + str(key))}={encoded}")
+    return fields
+
+
+def influx_lines(result: dict) -> list[str]:
+    """
+    Influx line protocol lines of a FleetPoller result
+
+    One line per scalar / group metric and one per table row, the metric name as measurement:
+        cpuMetrics,device=h1,type=host ssCpuUser=9i,ssCpuIdle=80i 1700000000000000000
+        storage,device=h1,type=host,index=2 Descr="/",Size=2000i,UsedPercent=30.0 1700000000000000000
+    """
+    timestamp = int(result['timestamp'] * 1e9)
+    tags = f"device={_escape_tag(result['name'])},type={_escape_tag(result['type'])}"
+
+    lines = []
+    for metric, value in result['metrics'].items():
+        measurement = _escape_tag(metric)
+
+        if isinstance(value, list):
+            for row in value:
+                if isinstance(row, dict):
+                    fields = _fields(row)
+                    if fields:
+                        lines.append(f"{measurement},{tags},index={_escape_tag(row.get('Index'))} {','.join(fields)} {timestamp}")
+            continue
+
+        # Columnar interface rates (ifColumnRates), one line per interface
+        if hasattr(value, 'index') and hasattr(value, 'rates'):
+            columns = { key: column.tolist() for key, column in value.rates.items() }
+            for position, id in enumerate(value.index.tolist()):
+                fields = _fields({ key: column[position] for key, column in columns.items() })
+                if fields:
+                    lines.append(f"{measurement},{tags},index={id} {','.join(fields)} {timestamp}")
+            continue
+
+        if dataclasses.is_dataclass(value):
+            value = { field.name: getattr(value, field.name) for field in dataclasses.fields(value) }
+
+        fields = _fields(value) if isinstance(value, dict) else _fields({ 'value': value })
+        if fields:
+            lines.append(f"{measurement},{tags} {','.join(fields)} {timestamp}")
+
+    return lines
+
+
+def _json_default(value):
+    """
+    JSON encoding of snapshot records and NumPy values
+    """
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, '__slots__'):
+        return { name: getattr(value, name) for name in value.__slots__ }
+    return str(value)
+
+
+class fileTransport:
+    """
+    Append batches to a file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+
+    async def send(self, data: bytes) -> None:
+        # File writes block, keep them off the event loop
+        await asyncio.to_thread(self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        if self._file == None:
+            self._file = open(self.path, 'ab')
+        self._file.write(data)
+        self._file.flush()
+
+    async def close(self) -> None:
+        if self._file != None:
+            self._file.close()
+            self._file = None
+
+
+class socketTransport:
+    """
+    Stream batches over a TCP connection (e.g. a Telegraf socket_listener), reconnecting after errors
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._writer = None
+
+    async def send(self, data: bytes) -> None:
+        if self._writer == None:
+            reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            self._writer.write(data)
+            await self._writer.drain()
+        except BaseException:
+            # A failed or abandoned (timed out) write leaves a partial batch on the stream, start over on a new connection
+            self._writer.close()
+            self._writer = None
+            raise
+
+    async def close(self) -> None:
+        if self._writer != None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+
+
+class httpTransport:
+    """
+    POST batches to a local HTTP endpoint, e.g. http://localhost:8086/api/v2/write?org=o&bucket=b&precision=ns
+    """
+
+    def __init__(self, url: str, headers: dict = None, content_type: str = 'text/plain; charset=utf-8'):
+        parts = urlsplit(url)
+        if parts.scheme != 'http':
+            raise ValueError(f"only http:// endpoints are supported, got {url!r}")
+
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.target = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+        self.headers = { 'Content-Type': content_type, **(headers or {}) }
+
+    async def send(self, data: bytes) -> None:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            head = [f"POST {self.target} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Content-Length: {len(data)}", "Connection: close"]
+            head.extend(f"{name}: {value}" for name, value in self.headers.items())
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + data)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            status = status_line.split(b' ')[1:2]
+            if not status or not status[0].startswith(b'2'):
+                raise ConnectionError(f"HTTP endpoint answered {status_line.decode('latin-1').strip()!r}")
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        pass
+
+
+class batchSink(ABC):
+    """
+    Bounded, batching writer of poll results to a transport
+
+    batch_size      results per batch at most
+    batch_bytes     bytes per batch at most
+    flush_interval  seconds a result waits at most before its batch is sent
+    max_queue       results waiting to be batched; write() blocks while the queue is full
+    send_timeout    seconds a batch may take to send before it is given up
+
+    Batches that fail or time out are logged through the 'snmpDevices' logger and dropped,
+    so a dead or hung endpoint cannot grow memory or stall the poller.
+
+    example usage:
+        sink = influxSink(httpTransport('http://localhost:8086/api/v2/write?org=o&bucket=b'))
+        poller = FleetPoller(inventory, sinks=[sink])
+        ...
+        await sink.close()
+    """
+
+    def __init__(self, transport, batch_size: int = 1000, batch_bytes: int = 1 << 20, flush_interval: float = 1.0, max_queue: int = 10000, send_timeout: float = 10.0):
+        self.transport = transport
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+
+        self.sent_batches = 0
+        self.failed_batches = 0
+
+        self._queue = None
+        self._task = None
+
+    @abstractmethod
+    def serialize(self, result: dict) -> bytes:
+        """
+        Bytes written for one result
+        """
+
+    async def write(self, result: dict) -> None:
+        """
+        Queue one result, waiting while the queue is full
+        """
+        if self._task == None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._task = asyncio.create_task(self._drain())
+
+        data = self.serialize(result)
+        if data:
+            await self._queue.put(data)
+
+    async def _drain(self) -> None:
+        """
+        Collect queued results into batches and send them
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0])
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size and size < self.batch_bytes:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    data = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(data)
+                size += len(data)
+
+            await self._send(b''.join(batch))
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _send(self, data: bytes) -> None:
+        try:
+            await asyncio.wait_for(self.transport.send(data), self.send_timeout)
+            self.sent_batches += 1
+        except asyncio.TimeoutError:
+            self.failed_batches += 1
+            logger.warning("Sink batch of %d bytes dropped: no answer within %g s", len(data), self.send_timeout)
+        except Exception:
+            # Whatever the transport raises, the drain task must survive or write() would block forever
+            self.failed_batches += 1
+            logger.warning("Sink batch of %d bytes dropped", len(data), exc_info=True)
+
+    async def flush(self) -> None:
+        """
+        Wait until every queued result has been sent (or dropped)
+        """
+        if self._queue != None:
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """
+        Flush, stop the batching task and close the transport
+        """
+        await self.flush()
+        if self._task != None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.transport.close()
+
+
+class influxSink(batchSink):
+    """
+    Batching sink writing Influx line protocol, see influx_lines()
+    """
+
+    def serialize(self, result: dict) -> bytes:
+        lines = influx_lines(result)
+        return ('\n'.join(lines) + '\n').encode() if lines else b''
+
+
+class jsonlSink(batchSink):
+    """
+    Batching sink writing one JSON object per result and line
+    """
+
+    def serialize(self, result: dict) -> bytes:
+        return (json.dumps(result, default=_json_default, separators=(',', ':')) + '\n').encode()
@@ -4,6 +4,7 @@ from pysnmp.hlapi.asyncio import (
     #nextCmd,
     get_cmd,
     next_cmd,
+    bulk_cmd,
     SnmpEngine, 
     CommunityData, 
     UdpTransportTarget, 
@@ -14,15 +15,88 @@ from pysnmp.hlapi.asyncio import (
     usmHMACSHAAuthProtocol, 
     usmAesCfb128Protocol
 )
-import re
+from pysnmp.proto.rfc1905 import NoSuchObject, NoSuchInstance, EndOfMibView
+from pysnmp.proto import errind
+import functools
+import inspect
+import time
+import weakref
+
+from .eventLoop import backgroundLoop, default_loop
+from .oid import Oid
+from .telemetry import default_telemetry
+from .adaptiveTimeout import adaptiveTimeout
+from .circuitBreaker import circuitBreaker, circuitOpen, CLOSED, HALF_OPEN
+
+# sysUpTime, the agent clock in centiseconds, requested with GETNEXT / as a GETBULK non-repeater
+SYS_UPTIME = Oid.parse('1.3.6.1.2.1.1.3')
+
+# Telemetry operation of every request command
+COMMAND_OPERATIONS = { get_cmd: 'get', next_cmd: 'next', bulk_cmd: 'bulk' }
+
+# One shared SnmpEngine per event loop, used by instances created with share_engine=True
+_shared_engines = weakref.WeakKeyDictionary()
+
+async def close_shared_engine() -> None:
+    """
+    Close the SnmpEngine shared by share_engine=True instances on the running loop
+    """
+    engine = _shared_engines.pop(asyncio.get_running_loop(), None)
+    if engine is not None:
+        engine.close_dispatcher()
+
+def _settle_batch(future: asyncio.Future, task: asyncio.Task) -> None:
+    """
+    Pass the outcome of the task sending a batch to the future its callers wait on
+    """
+    if future.cancelled():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() != None:
+        future.set_exception(task.exception())
+    else:
+        future.set_result(task.result())
+
+def _sync_property(async_name: str, doc: str) -> property:
+    """
+    Property running the async metric async_name on the background loop of the instance
+    """
+    def getter(self):
+        return self.run_sync(getattr(self, async_name)())
+
+    getter.__name__ = 'get_' + async_name[len('aget_'):]
+    getter.__doc__ = doc
+    return property(getter)
 
 class snmpRead:
 
     """
     SNMP Read class
+
+    Device classes implement every metric as a coroutine aget_<name>(), awaitable
+    from any event loop, and get the synchronous property get_<name> for free.
     """
 
-    def __init__(self, ip:str, port:int = 161, snmpv:int=1, community:str=None, user:str=None, authkey:str=None, privkey:str=None):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Expose every async metric that takes no arguments as a sync property
+        for name, member in list(vars(cls).items()):
+            if not name.startswith('aget_') or not inspect.iscoroutinefunction(member):
+                continue
+
+            sync_name = 'get_' + name[len('aget_'):]
+            if sync_name in vars(cls):
+                continue
+
+            params = list(inspect.signature(member).parameters.values())[1:]
+            if any(param.default is param.empty for param in params):
+                continue
+
+            setattr(cls, sync_name, _sync_property(name, member.__doc__))
+
+    def __init__(self, ip:str, port:int = 161, snmpv:int=1, community:str=None, user:str=None, authkey:str=None, privkey:str=None, share_engine:bool=False, private_loop:bool=False, max_varbinds:int=25, max_repetitions:int=25, timeout:float=1.0, retries:int=5, adaptive_timeout:bool=False, circuit_breaker:bool=False, telemetry=None, coalesce:bool=False, inventory_cache=None):
 
         self.ip = ip
         self.port = port
@@ -57,55 +131,360 @@ class snmpRead:
         SNMP_V_MAP = { 1: 0, 2: 1, 3: 3 }
         self.snmpv = SNMP_V_MAP[snmpv]
 
+        # Authentication and context data are reused by every request
+        self.auth_data = self.usm_data if self.snmpv == 3 else CommunityData(self.community, mpModel=self.snmpv)  # model 0 is SNMPv1, model 1 is SNMPv2c
+        self.context_data = ContextData()
+
+        # Maximum number of varbinds packed into one GET PDU, lowered automatically on tooBig
+        self.max_varbinds = max_varbinds
+
+        # Number of rows requested per GETBULK PDU when walking SNMPv2c/v3 agents
+        self.max_repetitions = max_repetitions
+
+        # Seconds to wait for a response, and PDUs sent again after a timeout before the request fails
+        self.timeout = timeout
+        self.retries = retries
+
+        # With adaptive_timeout, the timeout follows the response times of the device, starting from timeout
+        self.rtt = adaptiveTimeout(timeout) if adaptive_timeout else None
+
+        # With circuit_breaker, requests fail at once while the device stops answering, see circuitBreaker
+        self.breaker = circuitBreaker() if circuit_breaker else None
+
+        # Request counters and events (telemetry.snmpTelemetry), labelled with label ('ip:port' unless set before the first request)
+        self.telemetry = telemetry if telemetry != None else default_telemetry
+        self.label = f"{ip}:{port}"
+
+        # Persistent store of slow-changing data learned by walks (inventoryCache), keyed by label
+        self.inventory_cache = inventory_cache
+
+        # Semaphores bounding the requests in flight, acquired in order around every PDU (see FleetPoller)
+        self.request_limits = ()
+
+        # With coalesce, GETs and column walks started in the same event loop iteration share their PDUs
+        self.coalesce = coalesce
+        # Open batches: key -> ({ item: position }, future of the results), and the tasks sending them
+        self._batches = {}
+        self._batch_tasks = set()
+
+        # Persistent engine and transport, created by open() on first use
+        self.share_engine = share_engine
+        self._engine = None
+        self._transport = None
+        self._loop = None
+
+        # Loop used by the synchronous API, shared by the whole process unless private_loop is set
+        self.private_loop = private_loop
+        self.sync_loop = backgroundLoop(f"snmpDevices-{ip}:{port}") if private_loop else default_loop
+
+    def run_sync(self, coro):
+        """
+        Run a coroutine on the background loop of this instance and return its result
+        """
+        return self.sync_loop.run(coro)
+
+    async def open(self) -> 'snmpRead':
+        """
+        Open the SNMP engine and UDP transport used by all requests of this instance
+        """
+        loop = asyncio.get_running_loop()
+
+        # Already open on the running loop
+        if self._transport is not None and self._loop is loop:
+            return self
+
+        # The engine is bound to the loop that created it, so rebuild it on a new loop
+        self._release()
+
+        if self.share_engine:
+            engine = _shared_engines.get(loop)
+            if engine is None:
+                engine = _shared_engines[loop] = SnmpEngine()
+            self._engine = engine
+        else:
+            self._engine = SnmpEngine() # SnmpEngine() is the main object that drives the whole SNMP engine
+
+        # UdpTransportTarget is the target SNMP entity; retries are sent by _send so each one is counted
+        self._transport = await UdpTransportTarget.create((self.ip, self.port), timeout=self.timeout, retries=0)
+        self._loop = loop
+
+        self.telemetry.attach(self._engine, self._transport.transport_address, self.label)
+        if self.breaker != None:
+            self.telemetry.breakers[self.label] = self.breaker
+        return self
+
+    async def close(self) -> None:
+        """
+        Close the SNMP engine and UDP transport
+        """
+        self._release()
+
+    def _release(self) -> None:
+        """
+        Drop the engine and transport, closing the engine socket if this instance owns it
+        """
+        engine = self._engine
+        self._engine = None
+        self._transport = None
+        self._loop = None
+
+        if engine is None or self.share_engine:
+            return
+        try:
+            engine.close_dispatcher()
+        except RuntimeError:
+            # The loop the engine was bound to is already closed, nothing left to release
+            pass
+
+    async def __aenter__(self) -> 'snmpRead':
+        return await self.open()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def __enter__(self) -> 'snmpRead':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._loop is self.sync_loop.loop and self._loop is not None:
+            self.run_sync(self.close())
+        else:
+            self._release()
+
+        if self.private_loop:
+            self.sync_loop.stop()
+
+    async def _send(self, command, *args, **options) -> tuple:
+        """
+        Send one request PDU with command (get_cmd, next_cmd, bulk_cmd) through the persistent engine
+        Waits for a free slot in every semaphore of request_limits first, and sends the PDU again up to
+        retries times when it times out. The exchange is recorded in telemetry
+        """
+        await self.open()
+
+        operation = COMMAND_OPERATIONS[command]
+        stats = self.telemetry.get(self.label, operation)
+        varbinds_sent = sum(isinstance(arg, ObjectType) for arg in args)
+
+        # A device with an open circuit is not worth a request slot
+        breaker = self.breaker
+        if breaker != None and breaker.blocked():
+            return self._short_circuit(stats, operation)
+
+        # Release exactly what was acquired, request_limits may be replaced (a new poll) while the request is in flight
+        acquired = []
+        probe = False
+        try:
+            for limit in self.request_limits:
+                await limit.acquire()
+                acquired.append(limit)
+
+            # The circuit may have opened while waiting for a slot
+            if breaker != None and not breaker.allow():
+                return self._short_circuit(stats, operation)
+            probe = breaker != None and breaker.state == HALF_OPEN
+
+            # A probe of a half open circuit gets a single attempt
+            retries = self.retries if breaker == None or breaker.state == CLOSED else 0
+
+            for attempt in range(1, retries + 2):
+                # The command reads the timeout of the transport target before its first await
+                timeout = self._transport.timeout = self.rtt.timeout(attempt) if self.rtt != None else self.timeout
+
+                started = time.perf_counter()
+                response = await command(self._engine, self.auth_data, self._transport, self.context_data, *args, lookupMib=False, **options)
+                latency = time.perf_counter() - started
+
+                if not isinstance(response[0], errind.RequestTimedOut):
+                    if self.rtt != None and not response[0]:
+                        self.rtt.observe(latency)
+                    break
+                # Stop retrying once other requests to the device have opened its circuit
+                if attempt > retries or (breaker != None and breaker.state != CLOSED and retries):
+                    break
+                stats.retries += 1
+                self.telemetry.emit('retry', self.label, operation, attempt=attempt, timeout=timeout)
+        except BaseException:
+            # A cancelled or failed probe tells nothing about the device, the next request probes again
+            if probe:
+                breaker.abandon()
+            raise
+        finally:
+            for limit in acquired:
+                limit.release()
+
+        if breaker != None:
+            # Only timeouts count against the device, any other answer shows it is reachable
+            state = breaker.failure() if isinstance(response[0], errind.RequestTimedOut) else breaker.success()
+            if state != None:
+                self.telemetry.emit('breaker', self.label, operation, state=state, failures=breaker.failures, delay=breaker.delay)
+
+        self._record(stats, operation, response, latency, attempt, varbinds_sent, timeout)
+        return response
+
+    def _short_circuit(self, stats, operation: str) -> tuple:
+        """
+        Response of a request refused by the circuit breaker
+        """
+        stats.short_circuits += 1
+        self.telemetry.emit('short_circuit', self.label, operation, retry_in=self.breaker.as_dict()['retry_in'])
+        return (circuitOpen, 0, 0, ())
+
+    def _record(self, stats, operation: str, response: tuple, latency: float, attempts: int, varbinds_sent: int, timeout: float) -> None:
+        """
+        Count one request and its response in telemetry and emit its events
+        """
+        errorIndication, errorStatus, errorIndex, varBinds = response
+
+        stats.requests += 1
+        stats.pdus += attempts
+        stats.varbinds_sent += varbinds_sent * attempts
+
+        if isinstance(errorIndication, errind.RequestTimedOut):
+            stats.timeouts += 1
+            self.telemetry.emit('timeout', self.label, operation, attempts=attempts, timeout=timeout)
+            return
+
+        if errorIndication:
+            error = str(errorIndication)
+            stats.error_indications[error] = stats.error_indications.get(error, 0) + 1
+            self.telemetry.emit('error_indication', self.label, operation, error=error)
+            return
+
+        stats.varbinds_received += len(varBinds)
+        stats.latency.observe(latency)
+
+        if errorStatus:
+            status = errorStatus.prettyPrint()
+            stats.error_status[status] = stats.error_status.get(status, 0) + 1
+            index = int(errorIndex)
+            oid = str(varBinds[index - 1][0]) if 0 < index <= len(varBinds) else None
+            self.telemetry.emit('error_status', self.label, operation, status=status, index=index, oid=oid)
+
+        self.telemetry.emit('request', self.label, operation, latency=latency, attempts=attempts, varbinds_sent=varbinds_sent, varbinds_received=len(varBinds))
+
+    async def _join_batch(self, key, items: list, send) -> list:
+        """
+        Add items to the batch of key opened in this event loop iteration and return their results
+        Once the loop moves on, the batch is sent as one send(items) call; an item asked by several callers is sent once
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(key)
+        if batch == None:
+            batch = self._batches[key] = ({}, loop.create_future())
+            loop.call_soon(self._send_batch, key, send)
+
+        positions, future = batch
+        slots = [positions.setdefault(item, len(positions)) for item in items]
+
+        # Shielded so a cancelled caller does not fail the other callers of the batch
+        results = await asyncio.shield(future)
+        return [results[slot] for slot in slots]
+
+    def _send_batch(self, key, send) -> None:
+        """
+        Close the batch of key and send it
+        """
+        positions, future = self._batches.pop(key)
+        task = asyncio.ensure_future(send(list(positions)))
+        self._batch_tasks.add(task)
+        task.add_done_callback(functools.partial(_settle_batch, future))
+        task.add_done_callback(self._batch_tasks.discard)
+
     async def run_snmp_get(self, oid: str) -> str:
         """
         SNMP get using getCmd
         """
-        # Get the value of the OID
-        errorIndication, errorStatus, errorIndex, varBinds = await get_cmd(
-            SnmpEngine(), # SnmpEngine() is the main object that drives the whole SNMP engine
-            self.usm_data if self.snmpv == 3 else CommunityData(self.community, mpModel=self.snmpv),  # model 0 is SNMPv1, model 1 is SNMPv2c
-            await UdpTransportTarget.create((self.ip, self.port)), # UdpTransportTarget is the target SNMP entity
-            ContextData(), # ContextData() is used to store the SNMP engine's state
-            ObjectType(ObjectIdentity(oid)) # ObjectType() is used to represent a MIB object
+        values = await self.run_snmp_get_many([oid])
+        return values[0]
+
+    async def run_snmp_get_many(self, oids: list) -> list:
+        """
+        SNMP get of many OIDs, packed up to max_varbinds per PDU
+        Returns the values in the order of oids, None for missing objects
+        """
+        if self.coalesce and oids:
+            return await self._join_batch('get', oids, self._get_many)
+        return await self._get_many(oids)
+
+    async def _get_many(self, oids: list) -> list:
+        """
+        Send the GET PDUs of run_snmp_get_many
+        """
+        values = [None] * len(oids)
+
+        # Split the request into PDUs of at most max_varbinds varbinds
+        positions = list(range(len(oids)))
+        chunks = [positions[i:i + self.max_varbinds] for i in range(0, len(positions), self.max_varbinds)]
+
+        await asyncio.gather(*(self._run_snmp_get_chunk(oids, chunk, values) for chunk in chunks))
+        return values
+
+    async def run_snmp_get_rows(self, root_oid: str, ids: list, columns: list) -> list:
+        """
+        SNMP get of the given columns of a table for every index
+        Returns one list of column values per index
+        """
+        values = await self.run_snmp_get_many([f"{root_oid}.{column}.{id}" for id in ids for column in columns])
+        width = len(columns)
+        return [values[i:i + width] for i in range(0, len(values), width)]
+
+    async def _run_snmp_get_chunk(self, oids: list, positions: list, values: list) -> None:
+        """
+        Send one GET PDU for oids[positions] and store the results into values
+        """
+        # Get the values of the OIDs
+        errorIndication, errorStatus, errorIndex, varBinds = await self._send(
+            get_cmd,
+            *[ObjectType(ObjectIdentity(oids[pos])) for pos in positions] # ObjectType() is used to represent a MIB object
         )
 
-        # Check for errors and return the value
+        # Check for errors, _send reports them as telemetry events
         if errorIndication:
-            print(f"Error Indication: {errorIndication}")
-            return None
-        # If the value is not found, return None
-        elif errorStatus:
-            print(f"Error Status: {errorStatus.prettyPrint()} at {errorIndex and varBinds[int(errorIndex) - 1][0] or '?'}")
-            return None
-        # If the value is found, return it
-        else:
-            for varBind in varBinds:
-                return str(varBind[1].prettyPrint())
-        
-        return None
+            return
+
+        if errorStatus:
+            status = errorStatus.prettyPrint()
+
+            # The response does not fit in one packet, split the PDU and remember the smaller size
+            if status == 'tooBig' and len(positions) > 1:
+                half = len(positions) // 2
+                self.max_varbinds = max(1, min(self.max_varbinds, half))
+                await self._run_snmp_get_chunk(oids, positions[:half], values)
+                await self._run_snmp_get_chunk(oids, positions[half:], values)
+                return
+
+            # SNMPv1 fails the whole PDU on the first missing object, drop it and ask again for the rest
+            if status == 'noSuchName' and 0 < int(errorIndex) <= len(positions):
+                missing = positions[int(errorIndex) - 1]
+                rest = [pos for pos in positions if pos != missing]
+                if rest:
+                    await self._run_snmp_get_chunk(oids, rest, values)
+                return
+
+            return
+
+        # If the value is found, store it; noSuchObject / noSuchInstance stay None
+        for pos, varBind in zip(positions, varBinds):
+            if not isinstance(varBind[1], (NoSuchObject, NoSuchInstance, EndOfMibView)):
+                values[pos] = str(varBind[1].prettyPrint())
     
     async def run_snmp_get_next(self, oid: str = None) -> tuple:
         """
         SNMP walk using nextCmd
         """
         # Get the next OID
-        errorIndication, errorStatus, errorIndex, varBinds = await next_cmd(
-            SnmpEngine(), # SnmpEngine() is the main object that drives the whole SNMP engine
-            self.usm_data if self.snmpv == 3 else CommunityData(self.community, mpModel=self.snmpv),  # model 0 is SNMPv1, model 1 is SNMPv2c
-            await UdpTransportTarget.create((self.ip, self.port)), # UdpTransportTarget is the target SNMP entity
-            ContextData(), # ContextData() is used to store the SNMP engine's state
+        errorIndication, errorStatus, errorIndex, varBinds = await self._send(
+            next_cmd,
             ObjectType(ObjectIdentity(oid)), # ObjectType() is used to represent a MIB object
             lexicographicMode=False  # Set to False to stop when outside the subtree
         )
 
-        # Check for errors and return the value
+        # Check for errors (reported by _send as telemetry events) and return the value
         if errorIndication:
-            print(f"Error Indication: {errorIndication}")
             return None
         # If the value is not found, return None
         elif errorStatus:
-            print(f'Error Status: {errorStatus.prettyPrint()} at {errorIndex and varBinds[int(errorIndex) - 1][0] or "?"}')
             return None
         # If the value is found, return it
         else:
@@ -114,6 +493,154 @@ class snmpRead:
         
         return None
     
+    async def _walk_columns(self, roots: list, stamp: bool = False) -> tuple:
+        """
+        Walk the subtrees under roots (Oid) side by side, one PDU carrying every unfinished subtree per step
+        Uses GETBULK for SNMPv2c/v3 and multi-varbind GETNEXT for SNMPv1
+        With stamp, every PDU also carries sysUpTime (a non-repeater for GETBULK)
+        Returns one list of (Oid, value, sysUpTime or None) per root, and False if a request failed
+        """
+        current = list(roots)
+        rows = [[] for _ in roots]
+        active = list(range(len(roots)))
+
+        # Columns sent per request, lowered when the agent cannot fit one row of every active column in a response
+        width = len(roots)
+
+        # Varbinds ahead of the columns in every request and response
+        head = [ObjectType(ObjectIdentity(SYS_UPTIME))] if stamp else []
+
+        while active:
+            batch = active[:width]
+            request = head + [ObjectType(ObjectIdentity(current[j])) for j in batch]
+
+            if self.snmpv != 0:
+                # Share the repetitions between the columns so the response size stays bounded
+                repetitions = max(1, self.max_repetitions // len(batch))
+                errorIndication, errorStatus, errorIndex, varBinds = await self._send(bulk_cmd, len(head), repetitions, *request)
+            else:
+                errorIndication, errorStatus, errorIndex, varBinds = await self._send(next_cmd, *request, lexicographicMode=False)
+
+            if errorIndication:
+                return rows, False
+
+            if errorStatus:
+                failed = int(errorIndex) - 1 - len(head)
+
+                # SNMPv1 reports the end of the MIB as noSuchName on the column that ran past it
+                if errorStatus.prettyPrint() == 'noSuchName' and 0 <= failed < len(batch):
+                    active.remove(batch[failed])
+                    continue
+
+                if errorStatus.prettyPrint() == 'tooBig':
+                    # The response does not fit in one packet, ask for fewer rows (GETNEXT asks for one already)
+                    if self.snmpv != 0 and self.max_repetitions > len(batch):
+                        self.max_repetitions = max(len(batch), self.max_repetitions // 2)
+                        continue
+                    # Not even one row fits, ask for fewer columns
+                    if width > 1:
+                        width = max(1, len(batch) // 2)
+                        continue
+
+                return rows, False
+
+            # The agent clock for every row of this response
+            ticks = None
+            if head and varBinds and Oid(varBinds[0][0].asTuple()).startswith(SYS_UPTIME):
+                ticks = int(varBinds[0][1])
+            varBinds = varBinds[len(head):]
+
+            # The agent truncated the response to less than one row: send fewer columns per request,
+            # the columns left out are asked again from their last OID
+            if len(varBinds) < len(batch):
+                if not varBinds:
+                    return rows, False
+                width = len(varBinds)
+
+            # The response is row major: one varbind per requested column for each repetition
+            still_active = set(batch)
+            for position, (name, value) in enumerate(varBinds):
+                j = batch[position % len(batch)]
+                if j not in still_active:
+                    continue
+
+                oid = Oid(name.asTuple())
+                # Stop the column at the end of the MIB, at the first OID outside of it, or if the agent does not move forward
+                if isinstance(value, EndOfMibView) or not oid.startswith(roots[j]) or oid <= current[j]:
+                    still_active.discard(j)
+                    continue
+
+                rows[j].append((oid, value, ticks))
+                current[j] = oid
+
+            # Only columns that left their subtree are done, those the response had no room for stay active
+            finished = set(batch) - still_active
+            active = [j for j in active if j not in finished]
+
+        return rows, True
+
+    async def run_snmp_walk_raw(self, column_oids: list, stamp: bool = False) -> list:
+        """
+        Walk several table columns side by side without formatting the values
+        Returns one list of (Oid, pysnmp value, sysUpTime or None) per column
+        """
+        if self.coalesce and column_oids:
+            return await self._join_batch(('walk', stamp), [Oid.parse(oid) for oid in column_oids], functools.partial(self._walk_raw, stamp=stamp))
+        return await self._walk_raw(column_oids, stamp)
+
+    async def _walk_raw(self, column_oids: list, stamp: bool = False) -> list:
+        """
+        Walk the columns of run_snmp_walk_raw
+        """
+        # Keep each PDU within max_varbinds varbinds, larger sets are walked as concurrent groups
+        width = max(1, self.max_varbinds - 1) if stamp else self.max_varbinds
+        if len(column_oids) > width:
+            groups = [column_oids[i:i + width] for i in range(0, len(column_oids), width)]
+            results = await asyncio.gather(*(self._walk_raw(group, stamp) for group in groups))
+            return [column for group in results for column in group]
+
+        rows, ok = await self._walk_columns([Oid.parse(oid) for oid in column_oids], stamp)
+        return rows
+
+    async def run_snmp_walk_columns(self, column_oids: list, stamp: bool = False) -> list:
+        """
+        Walk several table columns side by side
+        Returns one dict per column mapping the row index suffix to the value
+        With stamp, every value is (sysUpTime, value), sysUpTime read in the PDU that carried the value
+        """
+        roots = [Oid.parse(oid) for oid in column_oids]
+        rows = await self.run_snmp_walk_raw(roots, stamp)
+
+        if stamp:
+            return [
+                { str(oid.suffix(root)): (ticks, str(value.prettyPrint())) for oid, value, ticks in column }
+                for root, column in zip(roots, rows)
+            ]
+
+        return [
+            { str(oid.suffix(root)): str(value.prettyPrint()) for oid, value, ticks in column }
+            for root, column in zip(roots, rows)
+        ]
+
+    async def run_snmp_walk_table(self, columns: dict, stamp: bool = False) -> dict:
+        """
+        Walk the given columns of a table and join them by row index
+        columns maps a column name to its OID, returns { index: { name: value } }
+        With stamp, every value is (sysUpTime, value), see run_snmp_walk_columns
+        """
+        names = list(columns)
+        values = await self.run_snmp_walk_columns([columns[name] for name in names], stamp)
+
+        table = {}
+        for name, column in zip(names, values):
+            for index, value in column.items():
+                row = table.get(index)
+                if row is None:
+                    row = table[index] = dict.fromkeys(names)
+                row[name] = value
+
+        return table
+
     def  match_oid_prefix(self,prefix:str=None, oid:str=None) -> bool:
         """
         Check if the OID matches the prefix
@@ -122,56 +649,49 @@ class snmpRead:
         # Check if the OID matches the prefix
         if(not oid or not prefix):
             return False
-        
-        # Compile the prefix
-        compile = re.compile(f"^{prefix.replace('.', '')}")
-
-        # Check if the OID matches the prefix
-        match = compile.match(oid.replace('.', ''))
 
-        if match:
-            return True
-        
-        return False
+        # Compare whole sub-identifiers, so .1.1 is not a prefix of .1.10
+        return Oid.parse(oid).startswith(Oid.parse(prefix))
 
     def get_oid(self, oid:str) -> str:
         """
         Get the value of an OID
         """
-        return asyncio.run(self.run_snmp_get(oid))
+        return self.run_sync(self.run_snmp_get(oid))
 
-    def walk_oid(self, root_oid:str=None) -> tuple:
+    def get_oids(self, oids:list) -> list:
         """
-        Walk the SNMP tree starting from root_oid
+        Get the values of many OIDs with as few PDUs as possible
         """
+        return self.run_sync(self.run_snmp_get_many(oids))
 
-        # Get the first OID
-        data = asyncio.run(self.run_snmp_get_next(root_oid))
+    def get_rows(self, root_oid:str, ids:list, columns:list) -> list:
+        """
+        Get the given columns of a table for every index with as few PDUs as possible
+        """
+        return self.run_sync(self.run_snmp_get_rows(root_oid, ids, columns))
 
-        # If the OID is not found, return None
-        if(not data):
-            return None
+    async def run_snmp_walk(self, root_oid:str=None) -> list:
+        """
+        Walk the SNMP tree starting from root_oid, reusing one engine for the whole walk
+        GETBULK for SNMPv2c/v3 agents, GETNEXT for SNMPv1 agents
+        """
+        rows, ok = await self._walk_columns([Oid.parse(root_oid)])
 
-        # If the OID is not found, return None
-        if(not data[0] and data[1]):
-            return (root_oid, data[1])
-        
-        # If the OID is found, add it to the list
-        data_list = []
+        # If the first request fails, return None
+        if not ok and not rows[0]:
+            return None
 
-        # If the OID is found, add it to the list
-        if(self.match_oid_prefix(root_oid, data[0])):
-            data_list.append(data)
-        
-        # Walk the tree
-        while data[0]:
+        return [(str(oid), str(value)) for oid, value, ticks in rows[0]]
 
-            # Get the next OID
-            data = asyncio.run(self.run_snmp_get_next(data[0]))
-            if(not self.match_oid_prefix(root_oid, data[0])):
-                break
+    def walk_oid(self, root_oid:str=None) -> tuple:
+        """
+        Walk the SNMP tree starting from root_oid
+        """
+        return self.run_sync(self.run_snmp_walk(root_oid))
 
-            # If the OID is found, add it to the list
-            data_list.append(data)
-        
-        return data_list
\ No newline at end of file
+    def walk_table(self, columns:dict) -> dict:
+        """
+        Walk the given columns of a table and join them by row index
+        """
+        return self.run_sync(self.run_snmp_walk_table(columns))
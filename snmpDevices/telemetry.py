@@ -0,0 +1,271 @@
+"""
+Request telemetry of snmpRead instances
+
+Every request PDU exchange is counted per (device, operation), operation
+being 'get', 'next' or 'bulk': requests, PDUs sent, retries, timeouts,
+varbinds, errorStatus and errorIndication by type, bytes on the wire and a
+latency histogram. Failures are reported as structured events to hooks
+instead of being printed; the default telemetry logs them through the
+'snmpDevices' logger.
+
+    telemetry = snmpTelemetry()
+    telemetry.add_hook(print, 'timeout', 'error_status')
+    device = host('10.0.0.1', community='public', snmpv=2, telemetry=telemetry)
+    ...
+    telemetry.snapshot()['10.0.0.1:161']['bulk']['latency']
+"""
+
+from bisect import bisect_left
+import logging
+import time
+import weakref
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Event kinds passed to hooks
+EVENTS = ('request', 'retry', 'timeout', 'error_indication', 'error_status', 'short_circuit', 'breaker')
+
+# Operation of every request PDU type
+_PDU_OPERATIONS = {
+    'GetRequestPDU': 'get',
+    'GetNextRequestPDU': 'next',
+    'GetBulkRequestPDU': 'bulk',
+}
+
+# Request ids of sent PDUs kept to match their responses, the oldest are dropped past this
+_MAX_PENDING = 100000
+
+logger = logging.getLogger('snmpDevices')
+
+
+class histogram:
+    """
+    Counts of observed values per bucket (not cumulative)
+
+    bounds      upper bound of every bucket but the last
+    counts      values per bucket, len(bounds) + 1
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q quantile, None if empty (inf past the last bound)
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def as_dict(self) -> dict:
+        return { 'bounds': list(self.bounds), 'counts': list(self.counts), 'sum': self.sum, 'count': self.count }
+
+
+class requestStats:
+    """
+    Counters of one (device, operation)
+
+    requests            requests made, each sent once plus its retries
+    pdus                request PDUs sent
+    retries             PDUs sent again after a timeout
+    timeouts            requests that got no response after every retry
+    short_circuits      requests refused without a PDU because the circuit of the device was open
+    varbinds_sent       varbinds in the request PDUs
+    varbinds_received   varbinds in the responses
+    error_status        { errorStatus: responses }
+    error_indications   { errorIndication: requests }, timeouts excepted
+    bytes_sent          bytes of the request messages
+    bytes_received      bytes of the response messages
+    latency             histogram of the response times, in seconds
+    """
+
+    __slots__ = ('requests', 'pdus', 'retries', 'timeouts', 'short_circuits', 'varbinds_sent', 'varbinds_received', 'error_status', 'error_indications', 'bytes_sent', 'bytes_received', 'latency')
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.requests = 0
+        self.pdus = 0
+        self.retries = 0
+        self.timeouts = 0
+        self.short_circuits = 0
+        self.varbinds_sent = 0
+        self.varbinds_received = 0
+        self.error_status = {}
+        self.error_indications = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.latency = histogram(buckets)
+
+    def as_dict(self) -> dict:
+        values = { name: getattr(self, name) for name in self.__slots__ }
+        values['error_status'] = dict(self.error_status)
+        values['error_indications'] = dict(self.error_indications)
+        values['latency'] = self.latency.as_dict()
+        return values
+
+
+def log_event(event: dict) -> None:
+    """
+    Hook logging failure events through the 'snmpDevices' logger
+    tooBig and noSuchName are part of normal operation (the request is split / the walk ends), they log at debug level
+    """
+    kind = event['event']
+    if kind == 'error_status':
+        level = logging.DEBUG if event['status'] in ('tooBig', 'noSuchName') else logging.WARNING
+        logger.log(level, "%s %s: error status %s at %s", event['device'], event['operation'], event['status'], event['oid'])
+    elif kind == 'error_indication':
+        logger.warning("%s %s: %s", event['device'], event['operation'], event['error'])
+    elif kind == 'timeout':
+        logger.warning("%s %s: no response after %d attempts", event['device'], event['operation'], event['attempts'])
+    elif kind == 'retry':
+        logger.debug("%s %s: timeout, attempt %d", event['device'], event['operation'], event['attempt'])
+    elif kind == 'breaker':
+        if event['state'] == 'closed':
+            logger.info("%s: circuit closed, the device answers again", event['device'])
+        else:
+            logger.warning("%s: circuit open after %d failures, next probe in %.0f s", event['device'], event['failures'], event['delay'])
+
+
+class snmpTelemetry:
+    """
+    Request counters per (device, operation) and event hooks, shared by any number of snmpRead instances
+
+    stats       { (device, operation): requestStats }
+    breakers    { device: circuitBreaker } of the devices polled with circuit_breaker
+    hooks       { event kind: [callable(event dict)] }
+
+    Every event dict holds 'event', 'device', 'operation' and 'time', plus:
+        request             latency, attempts, varbinds_sent, varbinds_received
+        retry               attempt (the number of the attempt that timed out), timeout
+        timeout             attempts, timeout (of the last attempt)
+        error_indication    error
+        error_status        status, index, oid
+        short_circuit       retry_in (seconds until the next probe)
+        breaker             state (the new circuit state), failures, delay
+    A hook that raises is counted in hook_errors and does not fail the request.
+    """
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.stats = {}
+        self.breakers = {}
+        self.hooks = {}
+        self.hook_errors = 0
+
+        # Transport address -> device label, to account the bytes seen by the engine observer
+        self._addresses = {}
+        # Request id -> (device, operation) of the PDUs in flight
+        self._pending = {}
+        self._engines = weakref.WeakSet()
+
+    def add_hook(self, hook, *events: str) -> None:
+        """
+        Call hook(event) for the given event kinds, every kind if none is given
+        """
+        for kind in events or EVENTS:
+            if kind not in EVENTS:
+                raise ValueError(f"unknown telemetry event {kind!r}")
+            self.hooks.setdefault(kind, []).append(hook)
+
+    def remove_hook(self, hook) -> None:
+        for kind in list(self.hooks):
+            self.hooks[kind] = [registered for registered in self.hooks[kind] if registered != hook]
+            if not self.hooks[kind]:
+                del self.hooks[kind]
+
+    def emit(self, kind: str, device: str, operation: str, **fields) -> None:
+        """
+        Pass an event to the hooks registered for its kind
+        """
+        hooks = self.hooks.get(kind)
+        if not hooks:
+            return
+
+        event = { 'event': kind, 'device': device, 'operation': operation, 'time': time.time(), **fields }
+        for hook in hooks:
+            try:
+                hook(event)
+            except Exception:
+                self.hook_errors += 1
+
+    def get(self, device: str, operation: str) -> requestStats:
+        """
+        Counters of (device, operation), created on first use
+        """
+        stats = self.stats.get((device, operation))
+        if stats == None:
+            stats = self.stats[(device, operation)] = requestStats(self.buckets)
+        return stats
+
+    def attach(self, engine, address: tuple, device: str) -> None:
+        """
+        Count the bytes the engine sends to and receives from address as device
+        """
+        self._addresses[tuple(address)] = device
+        if engine not in self._engines:
+            engine.observer.register_observer(self._observe, 'rfc3412.sendPdu', 'rfc3412.receiveMessage:response')
+            self._engines.add(engine)
+
+    def _observe(self, engine, execpoint: str, variables: dict, context) -> None:
+        """
+        Engine observer: account the size of every message to a known address
+        """
+        device = self._addresses.get(tuple(variables['transportAddress']))
+        if device == None:
+            return
+
+        pdu = variables['pdu']
+        request_id = int(pdu[0])
+
+        if execpoint == 'rfc3412.sendPdu':
+            operation = _PDU_OPERATIONS.get(pdu.__class__.__name__)
+            if operation == None:
+                return
+            self.get(device, operation).bytes_sent += len(variables['outgoingMessage'])
+            if len(self._pending) >= _MAX_PENDING:
+                # Requests that timed out never see a response, forget the oldest
+                self._pending.pop(next(iter(self._pending)))
+            self._pending[request_id] = (device, operation)
+        else:
+            key = self._pending.pop(request_id, None)
+            if key != None:
+                self.get(*key).bytes_received += len(variables['wholeMsg'])
+
+    def snapshot(self) -> dict:
+        """
+        { device: { operation: counters as plain data, 'breaker': circuit state } }
+        """
+        snapshot = {}
+        for (device, operation), stats in self.stats.items():
+            snapshot.setdefault(device, {})[operation] = stats.as_dict()
+        for device, breaker in self.breakers.items():
+            snapshot.setdefault(device, {})['breaker'] = breaker.as_dict()
+        return snapshot
+
+    def reset(self, device: str = None) -> None:
+        """
+        Clear the counters of every device, or of one device
+        """
+        for key in [key for key in self.stats if device == None or key[0] == device]:
+            del self.stats[key]
+
+
+# Telemetry of snmpRead instances created without one, failures are logged
+default_telemetry = snmpTelemetry()
+default_telemetry.add_hook(log_event, 'retry', 'timeout', 'error_indication', 'error_status', 'breaker')
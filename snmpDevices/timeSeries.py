@@ -0,0 +1,167 @@
+"""
+In-memory time series of polled metrics
+
+Every (device, metric, index) series is a ring buffer of preallocated
+timestamp / value arrays, so appending is O(1) and memory is fixed by
+capacity x max_series, whatever the size of the fleet.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+import time
+
+from .flattenMetrics import flatten_result
+
+
+class ringBuffer:
+    """
+    Fixed-size series of (timestamp, value) samples, the oldest overwritten first
+    Samples must be appended in time order
+    """
+
+    __slots__ = ('capacity', 'times', 'values', 'start', 'count')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.values = array('d', bytes(8 * capacity))
+        # Position of the oldest sample and number of samples held
+        self.start = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> float:
+        # Timestamp of the i-th oldest sample, lets bisect search the ring in time order
+        return self.times[(self.start + i) % self.capacity]
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """
+        Add a sample, overwriting the oldest one when full
+        Returns False (and drops the sample) if it is older than the newest sample
+        """
+        if self.count and timestamp < self.last()[0]:
+            return False
+
+        if self.count < self.capacity:
+            position = (self.start + self.count) % self.capacity
+            self.count += 1
+        else:
+            position = self.start
+            self.start = (self.start + 1) % self.capacity
+
+        self.times[position] = timestamp
+        self.values[position] = value
+        return True
+
+    def expire(self, before: float) -> None:
+        """
+        Drop the samples older than before
+        """
+        while self.count and self.times[self.start] < before:
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+
+    def last(self) -> tuple:
+        """
+        Newest (timestamp, value), None if empty
+        """
+        if not self.count:
+            return None
+        position = (self.start + self.count - 1) % self.capacity
+        return (self.times[position], self.values[position])
+
+    def slice(self, start: float = None, end: float = None) -> list[tuple]:
+        """
+        Samples with start <= timestamp <= end, oldest first
+        """
+        first = bisect_left(self, start) if start != None else 0
+        stop = bisect_right(self, end) if end != None else self.count
+
+        samples = []
+        for i in range(first, stop):
+            position = (self.start + i) % self.capacity
+            samples.append((self.times[position], self.values[position]))
+        return samples
+
+
+class seriesStore:
+    """
+    Ring buffer per (device, metric, index) for polled metrics
+
+    capacity    samples kept per series
+    retention   seconds of history kept per series, None to keep capacity samples
+    max_series  series kept at most; the series updated least recently is dropped first
+
+    Memory is bounded by capacity x max_series x 16 bytes.
+
+    example usage:
+        store = seriesStore(capacity=120, retention=3600)
+        poller = FleetPoller(inventory, store=store)
+        ...
+        store.slice('10.0.0.1:161', 'ifRates.InOctets', 1, start=time.time() - 300)
+    """
+
+    def __init__(self, capacity: int = 360, retention: float = None, max_series: int = 100000):
+        self.capacity = capacity
+        self.retention = retention
+        self.max_series = max_series
+        # (device, metric, index) -> ringBuffer, least recently updated first
+        self.series = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def append(self, device: str, metric: str, index, timestamp: float, value: float) -> None:
+        """
+        Add one sample to its series
+        """
+        key = (device, metric, index)
+        buffer = self.series.get(key)
+        if buffer == None:
+            if len(self.series) >= self.max_series:
+                self.series.popitem(last=False)
+            buffer = self.series[key] = ringBuffer(self.capacity)
+        else:
+            self.series.move_to_end(key)
+
+        buffer.append(timestamp, value)
+        if self.retention != None:
+            buffer.expire(timestamp - self.retention)
+
+    def add_result(self, result: dict) -> None:
+        """
+        Add every numeric metric of a FleetPoller result
+        """
+        for metric, index, value in flatten_result(result):
+            self.append(result['name'], metric, index, result['timestamp'], value)
+
+    def slice(self, device: str, metric: str, index=None, start: float = None, end: float = None) -> list[tuple]:
+        """
+        (timestamp, value) samples of a series between start and end, oldest first
+        """
+        buffer = self.series.get((device, metric, index))
+        if buffer == None:
+            return []
+
+        # Samples past the retention are dropped lazily on append, skip them here too
+        if self.retention != None:
+            horizon = time.time() - self.retention
+            start = horizon if start == None else max(start, horizon)
+
+        return buffer.slice(start, end)
+
+    def last(self, device: str, metric: str, index=None) -> tuple:
+        """
+        Newest (timestamp, value) of a series, None if unknown
+        """
+        buffer = self.series.get((device, metric, index))
+        return buffer.last() if buffer != None else None
+
+    def keys(self, device: str = None) -> list[tuple]:
+        """
+        (device, metric, index) of every series, or of one device
+        """
+        return [key for key in self.series if device == None or key[0] == device]
@@ -0,0 +1,68 @@
+"""
+Shared fixtures: simulated agents replaying the bundled walks (snmpDevices.simulator)
+"""
+
+import asyncio
+import os
+import socket
+
+import pytest
+
+from snmpDevices.eventLoop import backgroundLoop
+from snmpDevices.simulator import start_agents, walkData
+
+WALKS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'snmpDevices', 'walks')
+HOST_WALK = os.path.join(WALKS_DIR, 'net-snmp-host.snmprec')
+UPS_WALK = os.path.join(WALKS_DIR, 'cyberpower-ups.snmprec')
+
+
+def free_port() -> int:
+    """
+    A UDP port nothing listens on right now
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+@pytest.fixture
+def host_walk() -> walkData:
+    # Loaded per test, so a test may change values without affecting the others
+    return walkData.load(HOST_WALK)
+
+
+@pytest.fixture
+def simulate():
+    """
+    simulate(walk, test, **options) runs await test(port, agent) against a fresh agent on its own event loop
+    """
+    def run(walk, test, **options):
+        async def main():
+            port = free_port()
+            agent, = await start_agents(walk, 1, port, **options)
+            try:
+                return await test(port, agent)
+            finally:
+                agent.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+@pytest.fixture
+def sync_agent(host_walk):
+    """
+    (port, agent) of an agent served from a background loop, for tests of the synchronous API
+    """
+    loop = backgroundLoop('simulator-tests')
+    port = free_port()
+    agent, = loop.run(start_agents(host_walk, 1, port))
+    try:
+        yield port, agent
+    finally:
+        async def close():
+            agent.close()
+
+        loop.run(close())
+        loop.stop()
@@ -0,0 +1,59 @@
+"""
+adaptiveTimeout estimates, backoff and bounds
+"""
+
+import pytest
+
+from snmpDevices.adaptiveTimeout import adaptiveTimeout, ALPHA, BETA, TIMER_TICK
+
+
+def test_initial():
+    rtt = adaptiveTimeout(initial=3.0, max_timeout=2.0)
+    # Nothing learned yet: the configured timeout, capped, without backoff
+    assert rtt.timeout(1) == rtt.timeout(4) == 2.0
+
+
+def test_estimate():
+    rtt = adaptiveTimeout()
+    rtt.observe(0.4)
+    assert (rtt.srtt, rtt.rttvar) == (0.4, 0.2)
+
+    rtt.observe(0.2)
+    assert rtt.rttvar == pytest.approx((1 - BETA) * 0.2 + BETA * 0.2)
+    assert rtt.srtt == pytest.approx((1 - ALPHA) * 0.4 + ALPHA * 0.2)
+    assert rtt.samples == 2
+
+
+@pytest.mark.parametrize('samples', [[0.001] * 20, [0.05, 0.3, 0.02, 0.8], [2.0, 3.0, 5.0]])
+def test_bounds(samples):
+    rtt = adaptiveTimeout(min_timeout=0.2, max_timeout=4.0)
+    for sample in samples:
+        rtt.observe(sample)
+
+    timeouts = [rtt.timeout(attempt) for attempt in range(1, 8)]
+    assert all(0.2 <= timeout <= 4.0 for timeout in timeouts)
+    # Every retry waits at least as long as the one before
+    assert timeouts == sorted(timeouts)
+    # Whole timer ticks
+    assert all(abs(timeout / TIMER_TICK - round(timeout / TIMER_TICK)) < 1e-9 for timeout in timeouts)
+
+
+def test_fast_agent():
+    rtt = adaptiveTimeout(initial=1.0, min_timeout=0.2)
+    for _ in range(20):
+        rtt.observe(0.001)
+    # A LAN agent answering in 1 ms still gets the floor, not 1 ms
+    assert rtt.timeout(1) == 0.2
+
+
+def test_backoff():
+    rtt = adaptiveTimeout(min_timeout=0.2, max_timeout=10.0)
+    for _ in range(20):
+        rtt.observe(0.5)
+
+    first, second, third = rtt.timeout(1), rtt.timeout(2), rtt.timeout(3)
+    assert first >= rtt.srtt + TIMER_TICK
+    # Doubled per retry, rounded up to the grid
+    assert 2 * first <= second < 2 * first * 1.25 + TIMER_TICK
+    assert 2 * second <= third < 2 * second * 1.25 + TIMER_TICK
+    assert rtt.timeout(20) == 10.0
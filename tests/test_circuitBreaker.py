@@ -0,0 +1,137 @@
+"""
+circuitBreaker state machine, and snmpRead against an agent that stops answering
+"""
+
+import asyncio
+import time
+
+from pysnmp.proto import errind
+
+from snmpDevices import host, snmp
+from snmpDevices.circuitBreaker import circuitBreaker, CLOSED, OPEN, HALF_OPEN
+from snmpDevices.telemetry import snmpTelemetry
+
+
+def test_breaker_states():
+    breaker = circuitBreaker(failure_threshold=2, base_delay=10.0, max_delay=30.0)
+    assert breaker.allow() and breaker.failure() == None
+    assert breaker.failure() == OPEN
+    assert breaker.blocked() and not breaker.allow()
+
+    # Past the delay, one probe goes through; its failure doubles the delay
+    breaker.retry_at = time.monotonic() - 1
+    assert not breaker.blocked() and breaker.allow()
+    assert breaker.state == HALF_OPEN and breaker.blocked()
+    assert breaker.failure() == OPEN and breaker.delay == 20.0
+
+    breaker.retry_at = time.monotonic() - 1
+    assert breaker.allow() and breaker.failure() == OPEN and breaker.delay == 30.0
+
+    # A successful probe closes the circuit and resets the delay
+    breaker.retry_at = time.monotonic() - 1
+    assert breaker.allow() and breaker.success() == CLOSED
+    assert breaker.delay == 10.0 and breaker.failures == 0 and not breaker.blocked()
+
+
+def test_breaker_against_agent(simulate, host_walk):
+    async def test(port, agent):
+        telemetry = snmpTelemetry()
+        events = []
+        telemetry.add_hook(events.append, 'breaker')
+
+        device = host('127.0.0.1', port, snmpv=2, community='public', timeout=0.2, retries=0, circuit_breaker=True, telemetry=telemetry)
+        device.breaker = circuitBreaker(failure_threshold=3, base_delay=0.3)
+
+        # The agent stops answering: three timeouts open the circuit
+        agent.loss = 1.0
+        for _ in range(3):
+            assert await device.run_snmp_get('.1.3.6.1.2.1.1.5.0') == None
+        assert device.breaker.state == OPEN
+
+        # Requests now fail at once, without a PDU
+        requests = agent.stats['requests']
+        started = time.monotonic()
+        assert await device.run_snmp_get('.1.3.6.1.2.1.1.5.0') == None
+        assert time.monotonic() - started < 0.1
+        assert agent.stats['requests'] == requests
+
+        # The agent is back: once the delay has passed, the probe closes the circuit
+        agent.loss = 0.0
+        await asyncio.sleep(0.35)
+        value = await device.run_snmp_get('.1.3.6.1.2.1.1.5.0')
+        await device.close()
+
+        snapshot = telemetry.snapshot()[device.label]
+        return value, device.breaker.state, [event['state'] for event in events], snapshot
+
+    value, state, transitions, snapshot = simulate(host_walk, test)
+    assert value == 'testhost'
+    assert state == CLOSED
+    assert transitions == [OPEN, CLOSED]
+    assert snapshot['get']['timeouts'] == 3
+    assert snapshot['get']['short_circuits'] == 1
+    assert snapshot['breaker']['opened'] == 1
+
+
+def test_breaker_abandon():
+    breaker = circuitBreaker(failure_threshold=1, base_delay=10.0)
+    breaker.failure()
+    breaker.retry_at = time.monotonic() - 1
+    assert breaker.allow() and breaker.state == HALF_OPEN
+
+    # A probe without result reopens the circuit for the next request to probe, the delay unchanged
+    breaker.abandon()
+    assert breaker.state == OPEN and not breaker.blocked() and breaker.delay == 10.0
+    assert breaker.allow() and breaker.state == HALF_OPEN
+
+    breaker.success()
+    breaker.abandon()
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe(simulate, host_walk):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=2, community='public', timeout=0.2, retries=0, circuit_breaker=True, telemetry=snmpTelemetry())
+        device.breaker = circuitBreaker(failure_threshold=1, base_delay=0.1)
+
+        agent.loss = 1.0
+        assert await device.run_snmp_get('.1.3.6.1.2.1.1.5.0') == None
+        await asyncio.sleep(0.15)
+
+        # The probe is cancelled while it waits for its answer
+        probe = asyncio.create_task(device.run_snmp_get('.1.3.6.1.2.1.1.5.0'))
+        await asyncio.sleep(0.05)
+        assert device.breaker.state == HALF_OPEN
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+        abandoned = device.breaker.state, device.breaker.blocked()
+
+        agent.loss = 0.0
+        value = await device.run_snmp_get('.1.3.6.1.2.1.1.5.0')
+        await device.close()
+        return abandoned, value, device.breaker.state
+
+    abandoned, value, state = simulate(host_walk, test)
+    assert abandoned == (OPEN, False)
+    assert value == 'testhost' and state == CLOSED
+
+
+def test_breaker_counts_timeouts_only(simulate, host_walk, monkeypatch):
+    # An error indication other than a timeout, the agent is reachable
+    async def refused(*args, **options):
+        return (errind.unsupportedSecurityModel, 0, 0, ())
+
+    monkeypatch.setitem(snmp.COMMAND_OPERATIONS, refused, 'get')
+
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=2, community='public', circuit_breaker=True, telemetry=snmpTelemetry())
+        device.breaker = circuitBreaker(failure_threshold=1)
+
+        await device.open()
+        answered = await device._send(refused)
+        await device.close()
+        return answered, device.breaker.state, device.breaker.failures
+
+    answered, state, failures = simulate(host_walk, test)
+    assert answered[0] == errind.unsupportedSecurityModel
+    assert state == CLOSED and failures == 0
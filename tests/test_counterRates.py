@@ -0,0 +1,58 @@
+"""
+counterRates: Counter32 wrap, Counter64 reset and agent restarts seen through sysUpTime
+"""
+
+import pytest
+
+from snmpDevices.counterRates import counterRates, COUNTER32_MODULUS, RESTART_SLACK
+
+
+@pytest.mark.parametrize('first, second, bits, expected', [
+    # (sysUpTime, value, monotonic time) of two samples 10 s apart on both clocks
+    ((1000, 100, 0.0), (2000, 1100, 10.0), 32, 100.0),
+    ((1000, 100, 0.0), (2000, 1100, 10.0), 64, 100.0),
+    # Counter32 wrapped once
+    ((1000, COUNTER32_MODULUS - 500, 0.0), (2000, 500, 10.0), 32, 100.0),
+    # Counter64 went backwards: reset, no rate
+    ((1000, 2 ** 40, 0.0), (2000, 500, 10.0), 64, None),
+    # The agent clock is the divisor, a late response does not skew the rate
+    ((1000, 100, 0.0), (2000, 1100, 12.0), 32, 100.0),
+    # sysUpTime went backwards: the agent restarted
+    ((5000, 100, 0.0), (1000, 1100, 10.0), 32, None),
+    # The same PDU timestamp twice
+    ((1000, 100, 0.0), (1000, 100, 10.0), 32, None),
+    # sysUpTime advanced 10 s while 100 s passed here: restarted and already up longer than before
+    ((1000, 100, 0.0), (2000, 1100, 100.0), 32, None),
+    # Within RESTART_SLACK of our clock, still the same run of the agent
+    ((1000, 100, 0.0), (2000, 1100, 10.0 + RESTART_SLACK - 1), 32, 100.0),
+])
+def test_rate(first, second, bits, expected):
+    rates = counterRates()
+    assert rates.rate('key', *first[:2], bits, now=first[2]) == None
+    assert rates.rate('key', *second[:2], bits, now=second[2]) == expected
+
+
+def test_restart_baseline():
+    rates = counterRates()
+    rates.rate('key', 5000, 100, now=0.0)
+    assert rates.rate('key', 1000, 50, now=10.0) == None
+    # The sample after a restart is the new baseline
+    assert rates.rate('key', 2000, 150, now=20.0) == 10.0
+
+
+def test_table_rates():
+    rates = counterRates()
+    counters = { 'InOctets': 32, 'HCInOctets': 64 }
+    first = { '1': { 'InOctets': (1000, '100'), 'HCInOctets': (1000, '100') }, '2': { 'InOctets': (1000, '5') } }
+    second = { '1': { 'InOctets': (2000, '1100'), 'HCInOctets': (2000, '2100') }, '2': { 'InOctets': (2000, '') } }
+
+    assert rates.table_rates('a', first, counters) == { '1': { 'InOctets': None, 'HCInOctets': None }, '2': { 'InOctets': None, 'HCInOctets': None } }
+    result = rates.table_rates('a', second, counters)
+    assert result['1'] == { 'InOctets': 100.0, 'HCInOctets': 200.0 }
+    # A missing value yields None
+    assert result['2'] == { 'InOctets': None, 'HCInOctets': None }
+
+    # Samples are kept per device
+    assert rates.table_rates('b', second, counters)['1']['InOctets'] == None
+    rates.forget('a')
+    assert all(key[0] == 'b' for key in rates.samples)
@@ -0,0 +1,118 @@
+"""
+inventoryCache entries, and warm starts through the async and the sync API
+"""
+
+import time
+
+from snmpDevices import FleetPoller, ifaceMetrics, host
+from snmpDevices.inventoryCache import inventoryCache, cacheEntry, BOOT_SLACK
+from snmpDevices.hostDefaults import STORAGE_INDEX_MAX_AGE
+from snmpDevices.oid import Oid
+
+IF_TABLE_LAST_CHANGE = Oid.parse('1.3.6.1.2.1.31.1.5.0')
+
+
+def test_entry_restarted():
+    entry = cacheEntry({}, 10000, saved=time.time() - 1000)
+    assert not entry.restarted(110000)
+    # sysUpTime went backwards
+    assert entry.restarted(9000)
+    # Up longer than before, but booted again while the poller was down
+    assert entry.restarted(110000 - int(BOOT_SLACK * 100) - 100)
+    assert not cacheEntry({}, None).valid(None)
+    assert entry.valid(110000) and not entry.valid(110000, '42')
+
+
+def test_save_load_drop(tmp_path):
+    cache = inventoryCache(str(tmp_path / 'inventory.sqlite'))
+    cache.save('a', 'ifIndex', cacheEntry({ 'table': { '1': ['lo'] } }, 100, '0'))
+    cache.save('a', 'storage', cacheEntry({ '31': 'root' }, 100))
+    cache.close()
+
+    cache = inventoryCache(str(tmp_path / 'inventory.sqlite'))
+    entry = cache.load('a', 'ifIndex')
+    assert entry.data == { 'table': { '1': ['lo'] } } and entry.uptime == 100 and entry.last_change == '0'
+
+    cache.drop('a', 'ifIndex')
+    assert cache.load('a', 'ifIndex') == None and cache.load('a', 'storage') != None
+    cache.drop('a')
+    assert cache.load('a', 'storage') == None
+    cache.close()
+
+
+def test_warm_start(simulate, host_walk, tmp_path):
+    path = str(tmp_path / 'inventory.sqlite')
+
+    async def poll(port, agent):
+        # Named, the cache key does not change with the port of each agent
+        inventory = [{ 'type': 'ifaceMetrics', 'name': 'switch', 'ip': '127.0.0.1', 'port': port, 'community': 'public', 'snmpv': 2, 'metrics': ['ifType', 'ifMtu'] }]
+        poller = FleetPoller(inventory, inventory_cache=path)
+        try:
+            results = await poller.collect()
+        finally:
+            await poller.close()
+        return results[0]['metrics'], agent.stats['getbulk']
+
+    cold, cold_bulks = simulate(host_walk, poll)
+    # The same agent, still up: a restarted poller reads the index from the file instead of walking it again
+    host_walk.uptime += 500
+    warm, warm_bulks = simulate(host_walk, poll)
+    assert warm == cold
+    assert warm_bulks < cold_bulks
+
+    # ifTableLastChange moved: the index is walked again
+    last_change = host_walk.values[IF_TABLE_LAST_CHANGE]
+    host_walk.values[IF_TABLE_LAST_CHANGE] = type(last_change)(int(last_change) + 100)
+    host_walk.uptime += 500
+    changed, changed_bulks = simulate(host_walk, poll)
+    assert changed == cold
+    assert changed_bulks == cold_bulks
+
+
+def test_sync_api(sync_agent, tmp_path):
+    port, agent = sync_agent
+    cache = inventoryCache(str(tmp_path / 'inventory.sqlite'))
+
+    # The sync properties run on the background loop thread, not the thread that opened the cache
+    interfaces = ifaceMetrics('127.0.0.1', port, snmpv=2, community='public', inventory_cache=cache)
+    devices = host('127.0.0.1', port, snmpv=2, community='public', inventory_cache=cache)
+    try:
+        types = interfaces.get_ifType
+        storage = devices.get_storage
+    finally:
+        interfaces.run_sync(interfaces.close())
+        devices.run_sync(devices.close())
+
+    assert types and storage
+    assert cache.load(f"127.0.0.1:{port}", 'ifIndex') != None
+    assert cache.load(f"127.0.0.1:{port}", 'storage') != None
+    cache.close()
+
+
+def test_storage_index(simulate, host_walk, tmp_path):
+    async def test(port, agent):
+        # Without an inventory cache every call walks hrStorageIndex, a new disk shows up at once
+        device = host('127.0.0.1', port, snmpv=2, community='public')
+        await device.aget_storage()
+        await device.aget_storage()
+        assert device.storage_index_cache == None
+        uncached = agent.stats['getbulk']
+
+        cache = inventoryCache(str(tmp_path / 'inventory.sqlite'))
+        device.inventory_cache = cache
+        storage = await device.aget_storage()
+        walked = agent.stats['getbulk']
+        assert await device.aget_storage() == storage
+        assert agent.stats['getbulk'] == walked
+
+        # Past STORAGE_INDEX_MAX_AGE the index is walked again
+        device.storage_index_cache.saved -= STORAGE_INDEX_MAX_AGE + 1
+        assert await device.aget_storage() == storage
+        rewalked = agent.stats['getbulk']
+
+        await device.close()
+        cache.close()
+        return uncached, walked, rewalked
+
+    uncached, walked, rewalked = simulate(host_walk, test)
+    assert uncached >= 2 and walked > uncached and rewalked > walked
@@ -0,0 +1,57 @@
+"""
+ifaceMetrics interface index cache against the agent simulator
+"""
+
+import asyncio
+
+from snmpDevices import ifaceMetrics
+from snmpDevices.oid import Oid
+
+IF_TABLE_LAST_CHANGE = Oid.parse('1.3.6.1.2.1.31.1.5.0')
+
+
+def test_if_index_single_flight(simulate, host_walk):
+    async def test(port, agent):
+        device = ifaceMetrics('127.0.0.1', port, snmpv=2, community='public')
+
+        # The index alone: one check, one walk
+        index = await device.aget_ifIndex()
+        alone = dict(agent.stats)
+        device.clear_ifIndex()
+
+        # Metrics polled together share the check and the walk of the index, cold and warm
+        metrics = (device.aget_ifType, device.aget_ifMtu, device.aget_ifPhysAddress, device.aget_ifAlias)
+        cold = await asyncio.gather(*(metric() for metric in metrics))
+        cold_stats = dict(agent.stats)
+        warm = await asyncio.gather(*(metric() for metric in metrics))
+        await device.close()
+        return index, alone, cold, cold_stats, warm, agent.stats
+
+    index, alone, cold, cold_stats, warm, warm_stats = simulate(host_walk, test)
+    assert index and alone['get'] == 1
+    assert warm == cold
+    assert cold_stats['get'] - alone['get'] == 1
+    assert cold_stats['getbulk'] - alone['getbulk'] == alone['getbulk']
+    assert warm_stats['get'] - cold_stats['get'] == 1
+    assert warm_stats['getbulk'] == cold_stats['getbulk']
+
+
+def test_if_index_invalidation(simulate, host_walk):
+    async def test(port, agent):
+        device = ifaceMetrics('127.0.0.1', port, snmpv=2, community='public')
+        await device.aget_ifIndex()
+        walked = agent.stats['getbulk']
+
+        await device.aget_ifIndex()
+        cached = agent.stats['getbulk']
+
+        # ifTableLastChange moved: the index is walked again
+        last_change = host_walk.values[IF_TABLE_LAST_CHANGE]
+        host_walk.values[IF_TABLE_LAST_CHANGE] = type(last_change)(int(last_change) + 100)
+        await device.aget_ifIndex()
+        await device.close()
+        return walked, cached, agent.stats['getbulk']
+
+    walked, cached, changed = simulate(host_walk, test)
+    assert cached == walked
+    assert changed == 2 * walked
@@ -0,0 +1,53 @@
+"""
+Oid parsing, ordering and subtree checks, and walks stopping at the subtree boundary
+"""
+
+import pytest
+
+from snmpDevices import host
+from snmpDevices.oid import Oid
+
+IF_INDEX = Oid.parse('1.3.6.1.2.1.2.2.1.1')
+
+
+def test_parse():
+    assert Oid.parse('.1.3.6.1') == Oid.parse('1.3.6.1') == Oid((1, 3, 6, 1))
+    assert Oid.parse(Oid.parse('1.3')) == (1, 3)
+    assert str(Oid.parse('.1.3.6.1.2.1.1.5.0')) == '1.3.6.1.2.1.1.5.0'
+
+
+@pytest.mark.parametrize('oid, prefix, expected', [
+    ('1.3.6.1.2.1.2.2.1.1.3', '1.3.6.1.2.1.2.2.1.1', True),
+    ('1.3.6.1.2.1.2.2.1.1', '1.3.6.1.2.1.2.2.1.1', True),
+    # The string prefix matches, the sub-identifiers do not
+    ('1.3.6.1.2.1.2.2.1.10.1', '1.3.6.1.2.1.2.2.1.1', False),
+    ('1.1', '1.10', False),
+    ('1.10', '1.1', False),
+    ('1.3.6', '1.3.6.1', False),
+])
+def test_startswith(oid, prefix, expected):
+    assert Oid.parse(oid).startswith(Oid.parse(prefix)) == expected
+
+
+def test_order():
+    # Lexicographic by sub-identifier, not by string: 1.2 < 1.10 and a parent sorts before its children
+    oids = [Oid.parse(oid) for oid in ('1.10', '1.2', '1.2.1', '1.3.6.1.2.1.2.2.1.10.1', '1.3.6.1.2.1.2.2.1.1.4')]
+    assert [str(oid) for oid in sorted(oids)] == ['1.2', '1.2.1', '1.3.6.1.2.1.2.2.1.1.4', '1.3.6.1.2.1.2.2.1.10.1', '1.10']
+    assert Oid.parse('1.3.6.1.2.1.2.2.1.10.1').suffix(Oid.parse('1.3.6.1.2.1.2.2.1.10')) == (1,)
+
+
+@pytest.mark.parametrize('snmpv', [1, 2])
+def test_walk_stops_at_subtree(simulate, host_walk, snmpv):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=snmpv, community='public')
+        rows = await device.run_snmp_walk(str(IF_INDEX))
+        table = await device.run_snmp_walk_table({ 'index': f".{IF_INDEX}" })
+        await device.close()
+        return rows, table
+
+    rows, table = simulate(host_walk, test)
+    expected = [str(oid) for oid in host_walk.oids if oid.startswith(IF_INDEX)]
+    # ifInOctets (column 10) follows ifIndex (column 1) in the walk and must not leak in
+    assert [oid for oid, value in rows] == expected
+    assert not any(oid.startswith('1.3.6.1.2.1.2.2.1.10.') for oid, value in rows)
+    assert sorted(table) == sorted(str(Oid.parse(oid).suffix(IF_INDEX)) for oid in expected)
@@ -0,0 +1,68 @@
+"""
+Request coalescing and the multi-rate pollScheduler against the agent simulator
+"""
+
+import asyncio
+
+from snmpDevices import ifaceMetrics, host, pollScheduler
+
+
+def test_coalesced_gets(simulate, host_walk):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=2, community='public', coalesce=True)
+        values = await asyncio.gather(
+            device.run_snmp_get('.1.3.6.1.2.1.1.5.0'),
+            device.run_snmp_get_many(['.1.3.6.1.2.1.1.6.0', '.1.3.6.1.2.1.1.5.0']),
+        )
+        gets = agent.stats['get']
+        metrics = await asyncio.gather(device.aget_hostName(), device.aget_contact(), device.aget_location())
+        await device.close()
+        return values, metrics, gets, agent.stats
+
+    values, metrics, gets, stats = simulate(host_walk, test)
+    assert values == ['testhost', ['lab', 'testhost']]
+    assert metrics == ['testhost', 'root', 'lab']
+    # Every GET started in the same loop iteration shares one PDU
+    assert gets == 1 and stats['get'] == 2
+
+
+def test_coalesced_walks(simulate, host_walk):
+    async def poll(device):
+        values = await asyncio.gather(device.aget_ifType(), device.aget_ifMtu(), device.aget_ifSpeed(), device.aget_ifOperStatus())
+        await device.close()
+        return values
+
+    async def coalesced(port, agent):
+        return await poll(ifaceMetrics('127.0.0.1', port, snmpv=2, community='public', coalesce=True)), agent.stats
+
+    async def separate(port, agent):
+        return await poll(ifaceMetrics('127.0.0.1', port, snmpv=2, community='public')), agent.stats
+
+    values, stats = simulate(host_walk, coalesced)
+    expected, separate_stats = simulate(host_walk, separate)
+
+    assert values == expected
+    assert stats['requests'] < separate_stats['requests']
+
+
+def test_scheduler(simulate, host_walk):
+    async def test(port, agent):
+        inventory = [{ 'type': 'host', 'ip': '127.0.0.1', 'port': port, 'community': 'public', 'snmpv': 2, 'metrics': ['upTime', 'hostName', 'location'] }]
+        scheduler = pollScheduler(inventory, groups={ 'fast': (0.2, ['upTime']), 'slow': (0.6, ['hostName', 'location']) }, seed=1)
+        try:
+            results = [result async for result in scheduler.run(1.0)]
+        finally:
+            await scheduler.close()
+        return results, agent.stats
+
+    results, stats = simulate(host_walk, test)
+    groups = [result['groups'] for result in results]
+
+    assert all(not result['errors'] for result in results)
+    assert 4 <= groups.count(['fast']) + groups.count(['fast', 'slow']) <= 5
+    # The slow group always falls due with a fast tick, both are polled together
+    assert 1 <= groups.count(['fast', 'slow']) <= 2
+    assert ['slow'] not in groups
+    # One GET PDU per poll, coalesced groups included
+    assert stats['get'] == len(results)
+    assert results[-1]['metrics'].get('hostName', 'testhost') == 'testhost'
@@ -0,0 +1,129 @@
+"""
+snmpRead GET, GETNEXT / GETBULK and column walks against the agent simulator
+"""
+
+import pytest
+
+from snmpDevices import host, ifaceMetrics
+from snmpDevices.oid import Oid
+from snmpDevices.simulator import walkData
+
+from conftest import HOST_WALK
+
+SYSTEM = Oid.parse('1.3.6.1.2.1.1')
+DISKIO_TABLE = Oid.parse('1.3.6.1.4.1.2021.13.15.1.1')
+
+
+def recorded(walk: walkData, root: Oid, snmpv: int = 2) -> list:
+    """
+    (oid, value) strings of the walk under root, as run_snmp_walk returns them
+    """
+    return [
+        (str(oid), str(walk.values[oid]))
+        for oid in walk.oids
+        if oid.startswith(root) and (snmpv != 1 or walk.values[oid].__class__.__name__ != 'Counter64')
+    ]
+
+
+def test_walk_file_loads():
+    walk = walkData.load(HOST_WALK)
+    assert len(walk) > 100
+    assert walk.uptime == 123456
+    assert walk.next(SYSTEM) == Oid.parse('1.3.6.1.2.1.1.1.0')
+
+
+@pytest.mark.parametrize('snmpv', [1, 2])
+def test_get_many(simulate, host_walk, snmpv):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=snmpv, community='public')
+        values = await device.run_snmp_get_many(['.1.3.6.1.2.1.1.1.0', '.1.3.6.1.2.1.1.5.0', '.1.3.6.1.2.1.1.99.0', '.1.3.6.1.2.1.1.6.0'])
+        await device.close()
+        return values, agent.stats
+
+    values, stats = simulate(host_walk, test)
+    # The missing object is None, the others keep their place
+    assert values == ['Linux test', 'testhost', None, 'lab']
+    # SNMPv1 fails the whole PDU on the missing object and asks again without it
+    assert stats['get'] == (2 if snmpv == 1 else 1)
+
+
+@pytest.mark.parametrize('snmpv', [1, 2])
+def test_walk(simulate, host_walk, snmpv):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=snmpv, community='public')
+        rows = await device.run_snmp_walk(str(DISKIO_TABLE))
+        await device.close()
+        return rows, agent.stats
+
+    rows, stats = simulate(host_walk, test)
+    assert rows == recorded(host_walk, DISKIO_TABLE, snmpv)
+    if snmpv == 1:
+        assert stats['getnext'] == len(rows) + 1 and stats['getbulk'] == 0
+    else:
+        assert stats['getbulk'] < len(rows) and stats['getnext'] == 0
+
+
+@pytest.mark.parametrize('snmpv', [1, 2])
+def test_walk_table(simulate, host_walk, snmpv):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=snmpv, community='public')
+        disks = await device.aget_diskIOTable()
+        await device.close()
+        return disks
+
+    disks = simulate(host_walk, test)
+    assert [disk['Device'] for disk in disks] == ['ram0', 'loop0', 'sda', 'sda1']
+    assert disks[2]['IONRead'] == int(host_walk.values[Oid.parse('1.3.6.1.4.1.2021.13.15.1.1.3.3')])
+    # SNMPv1 has no Counter64
+    if snmpv == 1:
+        assert disks[2]['IONReadX'] == None
+    else:
+        assert disks[2]['IONReadX'] == int(host_walk.values[Oid.parse('1.3.6.1.4.1.2021.13.15.1.1.12.3')])
+
+
+def test_get_too_big(simulate, host_walk):
+    oids = [f".1.3.6.1.4.1.2021.13.15.1.1.{column}.{index}" for column in range(2, 14) for index in range(1, 5)]
+
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=2, community='public', max_varbinds=len(oids))
+        values = await device.run_snmp_get_many(oids)
+        await device.close()
+        return values, device.max_varbinds, agent.stats
+
+    values, max_varbinds, stats = simulate(host_walk, test, max_size=400)
+    # The PDU is split until the responses fit, and the smaller size is kept
+    assert stats['tooBig'] > 0
+    assert max_varbinds < len(oids)
+    assert values == [str(host_walk.values[Oid.parse(oid)]) if Oid.parse(oid) in host_walk.values else None for oid in oids]
+
+
+@pytest.mark.parametrize('metric', ['aget_diskIOTable', 'aget_ifTable', 'aget_storage'])
+def test_truncated_bulk(simulate, host_walk, metric):
+    cls = ifaceMetrics if metric == 'aget_ifTable' else host
+
+    async def poll(port, agent):
+        device = cls('127.0.0.1', port, snmpv=2, community='public')
+        result = await getattr(device, metric)()
+        await device.close()
+        return result, agent.stats
+
+    full, full_stats = simulate(host_walk, poll)
+    truncated, stats = simulate(host_walk, poll, max_size=200)
+
+    # GETBULK responses cut to the packet size lose no column
+    assert full_stats['tooBig'] == 0 and stats['tooBig'] > 0
+    assert truncated == full
+
+
+def test_too_big_getnext(simulate, host_walk):
+    async def test(port, agent):
+        device = host('127.0.0.1', port, snmpv=1, community='public', max_repetitions=64)
+        rows, ok = await device._walk_columns([Oid(DISKIO_TABLE + (column,)) for column in (1, 2, 3, 4, 5, 6, 9, 10, 11)])
+        await device.close()
+        return rows, ok, device.max_repetitions, agent.stats
+
+    rows, ok, max_repetitions, stats = simulate(host_walk, test, max_size=200)
+    assert ok and all(rows)
+    # GETNEXT ignores max_repetitions: a tooBig narrows the columns at once instead of resending the same PDU
+    assert max_repetitions == 64
+    assert 0 < stats['tooBig'] <= 2
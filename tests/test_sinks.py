@@ -0,0 +1,96 @@
+"""
+Line protocol escaping and batchSink error handling
+"""
+
+import asyncio
+
+import pytest
+
+from snmpDevices.sinks import _escape_tag, _field_value, influx_lines, batchSink, influxSink
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('eth0', 'eth0'),
+    ('Intel(R) Ethernet, port 1', 'Intel(R)\\ Ethernet\\,\\ port\\ 1'),
+    ('a=b', 'a\\=b'),
+    ('C:\\disk', 'C:\\\\disk'),
+    # A line break would end the line
+    ('uplink\nto core', 'uplink\\ to\\ core'),
+    ('a\r\nb', 'a\\ b'),
+    (2, '2'),
+])
+def test_escape_tag(value, expected):
+    assert _escape_tag(value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [
+    (True, 'true'),
+    (42, '42i'),
+    (1.5, '1.5'),
+    (float('nan'), None),
+    ('say "hi"', '"say \\"hi\\""'),
+    ('back\\slash', '"back\\\\slash"'),
+    ('two\nlines\r\n', '"two lines "'),
+    ((2, 'up'), '2i'),
+    (None, None),
+])
+def test_field_value(value, expected):
+    assert _field_value(value) == expected
+
+
+def test_influx_lines():
+    result = {
+        'name': 'core\nswitch',
+        'type': 'ifaceMetrics',
+        'timestamp': 1700000000.0,
+        'metrics': {
+            'location': 'rack 1\nrow 2',
+            'ifAlias': [{ 'Index': 1, 'descr': 'eth0', 'Alias': 'to "core"\r\n' }],
+        },
+        'errors': {},
+    }
+    assert influx_lines(result) == [
+        'location,device=core\\ switch,type=ifaceMetrics value="rack 1 row 2" 1700000000000000000',
+        'ifAlias,device=core\\ switch,type=ifaceMetrics,index=1 descr="eth0",Alias="to \\"core\\" " 1700000000000000000',
+    ]
+    assert all('\n' not in line and '\r' not in line for line in influx_lines(result))
+
+
+def test_batch_sink_is_abstract():
+    with pytest.raises(TypeError):
+        batchSink(None)
+
+
+class flakyTransport:
+    """
+    Transport failing its first sends, by hanging or raising
+    """
+
+    def __init__(self, failures: list):
+        self.failures = failures
+        self.sent = []
+
+    async def send(self, data: bytes) -> None:
+        failure = self.failures.pop(0) if self.failures else None
+        if failure == 'hang':
+            await asyncio.sleep(10)
+        if failure == 'raise':
+            raise RuntimeError("transport broken")
+        self.sent.append(data)
+
+    async def close(self) -> None:
+        pass
+
+
+def test_sink_survives_transport_errors():
+    async def test():
+        transport = flakyTransport(['hang', 'raise'])
+        sink = influxSink(transport, batch_size=1, send_timeout=0.05)
+        for i in range(3):
+            await sink.write({ 'name': 'h1', 'type': 'host', 'timestamp': i, 'metrics': { 'upTime': i }, 'errors': {} })
+        await sink.close()
+        return transport.sent, sink.sent_batches, sink.failed_batches
+
+    sent, sent_batches, failed_batches = asyncio.run(test())
+    assert failed_batches == 2 and sent_batches == 1
+    assert sent == [b'upTime,device=h1,type=host value=2i 2000000000\n']
@@ -0,0 +1,74 @@
+"""
+ringBuffer wraparound and seriesStore retention and eviction
+"""
+
+import time
+
+from snmpDevices.timeSeries import ringBuffer, seriesStore
+
+
+def test_ring_wraparound():
+    ring = ringBuffer(3)
+    assert ring.last() == None and ring.slice() == []
+
+    for i in range(5):
+        assert ring.append(float(i), i * 10.0)
+
+    # The two oldest samples were overwritten, the ring keeps time order across the wrap
+    assert len(ring) == 3 and ring.start == 2
+    assert ring.slice() == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert ring.last() == (4.0, 40.0)
+    assert ring.slice(3.0) == [(3.0, 30.0), (4.0, 40.0)]
+    assert ring.slice(2.5, 3.5) == [(3.0, 30.0)]
+    assert ring.slice(end=2.0) == [(2.0, 20.0)]
+
+
+def test_ring_out_of_order():
+    ring = ringBuffer(3)
+    ring.append(2.0, 1.0)
+    assert not ring.append(1.0, 2.0)
+    # Equal timestamps are kept
+    assert ring.append(2.0, 3.0)
+    assert ring.slice() == [(2.0, 1.0), (2.0, 3.0)]
+
+
+def test_ring_expire():
+    ring = ringBuffer(4)
+    for i in range(6):
+        ring.append(float(i), float(i))
+
+    ring.expire(4.0)
+    assert ring.slice() == [(4.0, 4.0), (5.0, 5.0)]
+    ring.expire(10.0)
+    assert len(ring) == 0 and ring.last() == None
+
+    # Refilled after being emptied from the middle of the array
+    ring.append(11.0, 1.0)
+    assert ring.slice() == [(11.0, 1.0)]
+
+
+def test_store_eviction():
+    store = seriesStore(capacity=2, max_series=2)
+    store.append('a', 'upTime', None, 1.0, 1.0)
+    store.append('b', 'upTime', None, 1.0, 2.0)
+    # 'a' updated last, 'b' is the least recently updated series
+    store.append('a', 'upTime', None, 2.0, 3.0)
+    store.append('c', 'upTime', None, 2.0, 4.0)
+
+    assert store.keys() == [('a', 'upTime', None), ('c', 'upTime', None)]
+    assert store.slice('b', 'upTime') == []
+    assert store.slice('a', 'upTime') == [(1.0, 1.0), (2.0, 3.0)]
+
+
+def test_store_retention():
+    now = time.time()
+    store = seriesStore(capacity=10, retention=60)
+    store.append('a', 'ifRates.InOctets', 1, now - 120, 1.0)
+    store.append('a', 'ifRates.InOctets', 1, now - 90, 2.0)
+    # Still in the buffer, past the retention for readers
+    assert store.slice('a', 'ifRates.InOctets', 1) == []
+
+    store.append('a', 'ifRates.InOctets', 1, now, 3.0)
+    assert store.slice('a', 'ifRates.InOctets', 1) == [(now, 3.0)]
+    assert len(store.series[('a', 'ifRates.InOctets', 1)]) == 1
+    assert store.last('a', 'ifRates.InOctets', 1) == (now, 3.0)